@@ -1,7 +1,7 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2023-2024 Vypercore. All Rights Reserved
 
-from . import apb, axi4, axi4lite, axi4stream, handshake, mapped, stream
+from . import apb, axi4, axi4lite, axi4stream, bridge, common, handshake, mapped, stream
 
 # Guard
 assert all(
@@ -10,6 +10,8 @@ assert all(
         axi4,
         axi4lite,
         axi4stream,
+        bridge,
+        common,
         handshake,
         mapped,
         stream,
@@ -1,6 +1,15 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2023-2024 Vypercore. All Rights Reserved
 
+from .checker import AXI4ProtocolChecker, CheckedMonitor, ProtocolChecker
+from .correlator import AXI4Correlator
+from .crossbar import (
+    Arbitration,
+    AXI4Crossbar,
+    MemorySubordinate,
+    beat_addresses,
+    burst_span,
+)
 from .initiator import (
     AXI4ReadAddressInitiator,
     AXI4ReadResponseInitiator,
@@ -40,10 +49,13 @@ from .target import (
 from .transaction import (
     AXI4Backpressure,
     AXI4ReadAddress,
+    AXI4ReadBurstResponse,
     AXI4ReadResponse,
+    AXI4ReadTransaction,
     AXI4WriteAddress,
     AXI4WriteData,
     AXI4WriteResponse,
+    AXI4WriteTransaction,
 )
 
 # Guard
@@ -74,7 +86,19 @@ assert all(
         AXI4WriteResponse,
         AXI4ReadAddress,
         AXI4ReadResponse,
+        AXI4ReadBurstResponse,
         AXI4Backpressure,
+        AXI4WriteTransaction,
+        AXI4ReadTransaction,
+        AXI4Correlator,
+        AXI4Crossbar,
+        Arbitration,
+        MemorySubordinate,
+        beat_addresses,
+        burst_span,
+        AXI4ProtocolChecker,
+        CheckedMonitor,
+        ProtocolChecker,
         AXI4MemoryModel,
         axi4_aw_backpressure,
         axi4_w_backpressure,
@@ -0,0 +1,257 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+from collections import Counter, deque
+from typing import ClassVar
+
+from cocotb.utils import get_sim_time
+from forastero.bench import BaseBench
+from forastero.io import BaseIO
+from forastero.monitor import BaseMonitor, MonitorEvent
+
+from .common import Burst
+from .transaction import AXI4ReadAddress, AXI4WriteAddress, AXI4WriteData
+
+
+class ProtocolChecker:
+    """
+    Checks the VALID/READY signalling rules of one or more channels, using the
+    samples taken by monitors that have been constructed with this checker. The
+    payload of a channel is only compared against the previous cycle while the
+    channel is stalled (VALID high and READY low), so the cost of checking an
+    interface which is not backpressured is minimal. Violations are counted per
+    rule and the first few occurrences of each rule are logged.
+
+    Checking is performed from within 'if __debug__' blocks, which means that it
+    is compiled out entirely when Python is run with optimisations enabled (-O).
+
+    :param tb:          Handle to the testbench
+    :param name:        Name of the checker (used for logging)
+    :param max_reports: Maximum number of occurrences of each rule to log
+    :param fatal:       Whether violations should fail the test at teardown
+    """
+
+    # Mapping from channel name to VALID, READY, and the payload signals
+    CHANNELS: ClassVar[dict[str, tuple[str, str, tuple[str, ...]]]] = {}
+
+    def __init__(
+        self,
+        tb: BaseBench,
+        name: str = "checker",
+        max_reports: int = 10,
+        fatal: bool = True,
+    ) -> None:
+        self.name = name
+        self.max_reports = max_reports
+        self.fatal = fatal
+        self.log = tb.fork_log("checker", name)
+        # Violation counts, and the first occurrences of each rule
+        self.counts: Counter[str] = Counter()
+        self.occurrences: dict[str, list[str]] = {}
+        # Payload of each stalled channel, keyed by I/O and channel
+        self._stalled: dict[tuple[BaseIO, str], tuple] = {}
+        # Report once the test completes
+        tb.add_teardown(self._teardown())
+
+    def attach(self, monitor: BaseMonitor) -> None:
+        """
+        Subscribe to captures made by a monitor, called when a monitor is
+        constructed with this checker. Nothing is subscribed when optimisations
+        are enabled, so the transaction-level checks are compiled out along with
+        the handshake checks.
+
+        :param monitor: The monitor to subscribe to
+        """
+        if __debug__:
+            monitor.subscribe(MonitorEvent.CAPTURE, self._handle)
+
+    def _handle(self, component, event, obj) -> None:
+        """Placeholder for checks performed on captured transactions"""
+        del component, event, obj
+
+    def violation(self, rule: str, message: str) -> None:
+        """
+        Record a violation of a protocol rule.
+
+        :param rule:    Name of the rule that was violated
+        :param message: Description of the violation
+        """
+        self.counts[rule] += 1
+        if self.counts[rule] <= self.max_reports:
+            message = f"{message} at {get_sim_time(units='ns')} ns"
+            self.occurrences.setdefault(rule, []).append(message)
+            self.log.error(f"Violation of {rule}: {message}")
+
+    def handshake(self, io: BaseIO, channel: str, valid: int, ready: int) -> None:
+        """
+        Check the VALID/READY signalling of a channel, called by a monitor on
+        every sampled clock edge outside of reset with the VALID and READY values
+        it has already sampled. The payload is only read while the channel is
+        stalled.
+
+        :param io:      The I/O carrying the channel
+        :param channel: Name of the channel
+        :param valid:   Sampled value of VALID
+        :param ready:   Sampled value of READY
+        """
+        key = (io, channel)
+        held = self._stalled.pop(key, None)
+        # Payload is only sampled once the channel stalls
+        if held is None:
+            if valid and not ready:
+                self._stalled[key] = tuple(io.get(x) for x in self.CHANNELS[channel][2])
+            return
+        # While stalled, VALID must be held and the payload must be stable
+        s_valid, s_ready, signals = self.CHANNELS[channel]
+        if not valid:
+            self.violation(
+                f"{channel}_valid_stable",
+                f"{s_valid} dropped before {s_ready} was seen",
+            )
+            return
+        payload = tuple(io.get(x) for x in signals)
+        if held != payload:
+            changed = ", ".join(
+                x for x, a, b in zip(signals, held, payload, strict=True) if a != b
+            )
+            self.violation(
+                f"{channel}_payload_stable", f"{changed} changed while stalled"
+            )
+        if not ready:
+            self._stalled[key] = payload
+
+    def reset(self, io: BaseIO) -> None:
+        """
+        Forget any stalled channels of an I/O, called by a monitor on every
+        sampled clock edge during reset (as VALID may be dropped by reset).
+
+        :param io: The I/O being reset
+        """
+        if self._stalled:
+            for key in [x for x in self._stalled if x[0] is io]:
+                del self._stalled[key]
+
+    def report(self) -> bool:
+        """
+        Log a summary of all violations.
+
+        :returns: True if no violations were recorded, False otherwise
+        """
+        if not self.counts:
+            self.log.info("No protocol violations detected")
+            return True
+        for rule, count in self.counts.most_common():
+            self.log.error(f"{rule}: {count} violation(s)")
+            for message in self.occurrences[rule]:
+                self.log.error(f" - {message}")
+        return False
+
+    async def _teardown(self) -> None:
+        clean = self.report()
+        assert clean or not self.fatal, f"Protocol violations detected by {self.name}"
+
+
+class CheckedMonitor(BaseMonitor):
+    """
+    Base for monitors that can optionally pass their samples to a protocol
+    checker.
+
+    :param checker: Optional protocol checker
+    """
+
+    def __init__(self, *args, checker: ProtocolChecker | None = None, **kwds) -> None:
+        super().__init__(*args, **kwds)
+        self.checker = checker
+        if checker is not None:
+            checker.attach(self)
+
+
+class AXI4ProtocolChecker(ProtocolChecker):
+    """
+    Protocol checker for AXI4 interfaces, in addition to the VALID/READY rules
+    this checks that the number of write data beats matches AWLEN and that INCR
+    bursts do not cross a 4KB boundary.
+    """
+
+    CHANNELS: ClassVar[dict[str, tuple[str, str, tuple[str, ...]]]] = {
+        "aw": (
+            "awvalid",
+            "awready",
+            (
+                "awid",
+                "awaddr",
+                "awlen",
+                "awsize",
+                "awburst",
+                "awcache",
+                "awprot",
+                "awqos",
+                "awregion",
+                "awuser",
+            ),
+        ),
+        "w": ("wvalid", "wready", ("wdata", "wstrb", "wlast", "wuser")),
+        "b": ("bvalid", "bready", ("bid", "bresp", "buser")),
+        "ar": (
+            "arvalid",
+            "arready",
+            (
+                "arid",
+                "araddr",
+                "arlen",
+                "arsize",
+                "arburst",
+                "arcache",
+                "arprot",
+                "arqos",
+                "arregion",
+                "aruser",
+            ),
+        ),
+        "r": ("rvalid", "rready", ("rid", "rdata", "rresp", "rlast", "ruser")),
+    }
+
+    def __init__(self, *args, **kwds) -> None:
+        super().__init__(*args, **kwds)
+        # Expected beat counts of write addresses not yet matched to data
+        self._aw_beats: deque[int] = deque()
+        # Beat counts of complete write bursts not yet matched to an address
+        self._w_bursts: deque[int] = deque()
+        self._w_count = 0
+
+    def _check_boundary(
+        self, channel: str, obj: AXI4WriteAddress | AXI4ReadAddress
+    ) -> None:
+        if obj.burst != Burst.INCR:
+            return
+        span = (obj.length + 1) << int(obj.size)
+        if (obj.address & 0xFFF) + span > 0x1000:
+            self.violation(
+                f"{channel}_4kb_boundary",
+                f"Burst from 0x{obj.address:X} of {span} bytes crosses 4KB",
+            )
+
+    def _handle(self, component, event, obj) -> None:
+        match obj:
+            case AXI4WriteAddress():
+                self._check_boundary("aw", obj)
+                self._aw_beats.append(obj.length + 1)
+            case AXI4WriteData():
+                self._w_count += 1
+                if not obj.last:
+                    return
+                self._w_bursts.append(self._w_count)
+                self._w_count = 0
+            case AXI4ReadAddress():
+                self._check_boundary("ar", obj)
+                return
+            case _:
+                return
+        # Match complete write bursts against write addresses
+        while self._aw_beats and self._w_bursts:
+            expected, actual = self._aw_beats.popleft(), self._w_bursts.popleft()
+            if expected != actual:
+                self.violation(
+                    "w_last_length",
+                    f"WLAST after {actual} beats when AWLEN implies {expected}",
+                )
@@ -2,6 +2,9 @@
 # Copyright (c) 2023-2024 Vypercore. All Rights Reserved
 
 from enum import IntEnum
+from typing import TypeVar
+
+E = TypeVar("E", bound=IntEnum)
 
 
 class Prot(IntEnum):
@@ -67,3 +70,18 @@ class Awcache(IntEnum):
     WT_WR_ALLOC = 0b1110
     WB_NO_ALLOC = 0b0111
     WB_WR_ALLOC = 0b1111
+
+
+def cast(enum: type[E], value: int) -> E | int:
+    """
+    Cast a sampled value to a member of an enumeration, returning the raw value
+    where it does not match any member (e.g. a combination of protection flags).
+
+    :param enum:  The enumeration to cast to
+    :param value: The sampled value
+    :returns:     The enumeration member, or the raw value if there is no match
+    """
+    try:
+        return enum(value)
+    except ValueError:
+        return value
@@ -0,0 +1,161 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+from collections import deque
+
+from forastero.bench import BaseBench
+from forastero.event import EventEmitter
+from forastero.monitor import MonitorEvent
+
+from .monitor import (
+    AXI4ReadAddressMonitor,
+    AXI4ReadResponseMonitor,
+    AXI4WriteAddressMonitor,
+    AXI4WriteDataMonitor,
+    AXI4WriteResponseMonitor,
+)
+from .transaction import (
+    AXI4ReadAddress,
+    AXI4ReadResponse,
+    AXI4ReadTransaction,
+    AXI4WriteAddress,
+    AXI4WriteData,
+    AXI4WriteResponse,
+    AXI4WriteTransaction,
+)
+
+
+class AXI4Correlator(EventEmitter):
+    """
+    Joins the separate channels of an AXI4 interface back together, pairing AW
+    requests with their W beats and B response, and AR requests with their R
+    beats. Complete AXI4WriteTransaction and AXI4ReadTransaction objects are
+    published as MonitorEvent.CAPTURE, which means the correlator can be
+    attached to the scoreboard in the same way as a monitor.
+
+    Write data is paired with write addresses in the order they were presented
+    (as AXI4 write data carries no ID), while responses are matched against the
+    oldest outstanding request with the same ID. Requests with different IDs may
+    complete in any order.
+
+    :param tb:    Handle to the testbench
+    :param name:  Name of the correlator (used when attaching to a scoreboard)
+    :param awmon: Monitor for the write address channel
+    :param wmon:  Monitor for the write data channel
+    :param bmon:  Monitor for the write response channel
+    :param armon: Monitor for the read address channel
+    :param rmon:  Monitor for the read response channel
+    """
+
+    def __init__(
+        self,
+        tb: BaseBench,
+        name: str = "axi4correlator",
+        awmon: AXI4WriteAddressMonitor | None = None,
+        wmon: AXI4WriteDataMonitor | None = None,
+        bmon: AXI4WriteResponseMonitor | None = None,
+        armon: AXI4ReadAddressMonitor | None = None,
+        rmon: AXI4ReadResponseMonitor | None = None,
+    ) -> None:
+        super().__init__()
+        # Sanity checks
+        writes = (awmon, wmon, bmon)
+        reads = (armon, rmon)
+        assert all(writes) or not any(writes), "AW, W, and B monitors are required"
+        assert all(reads) or not any(reads), "AR and R monitors are required"
+        assert any(writes + reads), "At least one group of monitors is required"
+        # Hold references
+        self.name = name
+        self.clk = (awmon or armon).clk
+        self.log = tb.fork_log("axi4correlator", name)
+        # Write addresses that are still waiting for data
+        self._aw_nodata: deque[AXI4WriteAddress] = deque()
+        # Write data beats of the burst in progress, and complete bursts that
+        # are still waiting for an address
+        self._w_beats: list[AXI4WriteData] = []
+        self._w_bursts: deque[list[AXI4WriteData]] = deque()
+        # Writes with address and data, waiting for a response (keyed by ID)
+        self._b_pending: dict[int, deque[AXI4WriteTransaction]] = {}
+        # Reads waiting for (or receiving) response beats (keyed by ID)
+        self._r_pending: dict[int, deque[AXI4ReadTransaction]] = {}
+        # Subscribe to events
+        if awmon is not None:
+            awmon.subscribe(MonitorEvent.CAPTURE, self._handle)
+            wmon.subscribe(MonitorEvent.CAPTURE, self._handle)
+            bmon.subscribe(MonitorEvent.CAPTURE, self._handle)
+        if armon is not None:
+            armon.subscribe(MonitorEvent.CAPTURE, self._handle)
+            rmon.subscribe(MonitorEvent.CAPTURE, self._handle)
+
+    @property
+    def outstanding_writes(self) -> int:
+        """Number of write requests that have not yet completed"""
+        return len(self._aw_nodata) + sum(map(len, self._b_pending.values()))
+
+    @property
+    def outstanding_reads(self) -> int:
+        """Number of read requests that have not yet completed"""
+        return sum(map(len, self._r_pending.values()))
+
+    def _pair_writes(self) -> None:
+        while self._aw_nodata and self._w_bursts:
+            awreq = self._aw_nodata.popleft()
+            beats = self._w_bursts.popleft()
+            self._b_pending.setdefault(awreq.axid, deque()).append(
+                AXI4WriteTransaction(
+                    axid=awreq.axid,
+                    address=awreq.address,
+                    length=awreq.length,
+                    size=awreq.size,
+                    burst=awreq.burst,
+                    data=[x.data for x in beats],
+                    strobe=[x.strobe for x in beats],
+                    address_ns=awreq.timestamp,
+                )
+            )
+
+    def _handle(self, component, event, obj) -> None:
+        match obj:
+            case AXI4WriteAddress():
+                self._aw_nodata.append(obj)
+                self._pair_writes()
+            case AXI4WriteData():
+                self._w_beats.append(obj)
+                if obj.last:
+                    self._w_bursts.append(self._w_beats)
+                    self._w_beats = []
+                    self._pair_writes()
+            case AXI4WriteResponse():
+                queue = self._b_pending.get(obj.axid, None)
+                assert queue, f"Write response for ID 0x{obj.axid:X} with no request"
+                tran = queue.popleft()
+                if not queue:
+                    del self._b_pending[obj.axid]
+                tran.response = obj.response
+                tran.response_ns = obj.timestamp
+                tran.timestamp = obj.timestamp
+                self.publish(MonitorEvent.CAPTURE, tran)
+            case AXI4ReadAddress():
+                self._r_pending.setdefault(obj.axid, deque()).append(
+                    AXI4ReadTransaction(
+                        axid=obj.axid,
+                        address=obj.address,
+                        length=obj.length,
+                        size=obj.size,
+                        burst=obj.burst,
+                        address_ns=obj.timestamp,
+                    )
+                )
+            case AXI4ReadResponse():
+                queue = self._r_pending.get(obj.axid, None)
+                assert queue, f"Read response for ID 0x{obj.axid:X} with no request"
+                tran = queue[0]
+                tran.data.append(obj.data)
+                tran.response.append(obj.response)
+                if obj.last:
+                    queue.popleft()
+                    if not queue:
+                        del self._r_pending[obj.axid]
+                    tran.response_ns = obj.timestamp
+                    tran.timestamp = obj.timestamp
+                    self.publish(MonitorEvent.CAPTURE, tran)
@@ -0,0 +1,444 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+import bisect
+import heapq
+import itertools
+from collections import deque
+from collections.abc import Callable
+from enum import IntEnum, auto
+from random import Random
+
+import cocotb
+from cocotb.triggers import Event, RisingEdge
+from forastero.bench import BaseBench
+from forastero.monitor import MonitorEvent
+
+from ..common.memory import SharedMemory
+from .common import Burst, Resp
+from .initiator import AXI4ReadResponseInitiator, AXI4WriteResponseInitiator
+from .monitor import (
+    AXI4ReadAddressMonitor,
+    AXI4WriteAddressMonitor,
+    AXI4WriteDataMonitor,
+)
+from .transaction import (
+    AXI4ReadAddress,
+    AXI4ReadBurstResponse,
+    AXI4ReadTransaction,
+    AXI4WriteAddress,
+    AXI4WriteData,
+    AXI4WriteResponse,
+    AXI4WriteTransaction,
+)
+
+# Subordinates are called with a complete transaction, filling in the data and
+# response of reads and the response of writes
+Subordinate = Callable[[AXI4WriteTransaction | AXI4ReadTransaction], None]
+
+
+class Arbitration(IntEnum):
+    """Policy for choosing between managers contending for a subordinate"""
+
+    # Rotate priority, starting after the most recently granted manager
+    ROUND_ROBIN = auto()
+    # Always grant the manager with the lowest index
+    FIXED = auto()
+    # Grant a randomly chosen manager
+    RANDOM = auto()
+    # Grant the highest QoS value, using round robin between equal values
+    QOS = auto()
+
+
+def beat_addresses(address: int, length: int, size: int, burst: Burst) -> list[int]:
+    """
+    Calculate the address of every beat of a burst.
+
+    :param address: Start address of the burst
+    :param length:  Length of the burst (number of beats minus one)
+    :param size:    Size of each beat (as log2 of the number of bytes)
+    :param burst:   Burst type
+    :returns:       List of beat addresses
+    """
+    step = 1 << int(size)
+    if burst == Burst.FIXED:
+        return [address] * (length + 1)
+    aligned = address - (address % step)
+    if burst == Burst.INCR:
+        return [address] + [aligned + (x * step) for x in range(1, length + 1)]
+    if burst == Burst.WRAP:
+        total = step * (length + 1)
+        lower = address - (address % total)
+        offset = aligned - lower
+        return [lower + ((offset + (x * step)) % total) for x in range(length + 1)]
+    raise Exception(f"Unsupported burst type {burst}")
+
+
+def burst_span(address: int, length: int, size: int, burst: Burst) -> tuple[int, int]:
+    """
+    Calculate the lowest and highest byte addresses accessed by a burst.
+
+    :param address: Start address of the burst
+    :param length:  Length of the burst (number of beats minus one)
+    :param size:    Size of each beat (as log2 of the number of bytes)
+    :param burst:   Burst type
+    :returns:       Tuple of the lowest and highest byte address (inclusive)
+    """
+    step = 1 << int(size)
+    aligned = address - (address % step)
+    if burst == Burst.FIXED:
+        return address, aligned + step - 1
+    if burst == Burst.INCR:
+        return address, aligned + ((length + 1) * step) - 1
+    if burst == Burst.WRAP:
+        total = step * (length + 1)
+        lower = address - (address % total)
+        return lower, lower + total - 1
+    raise Exception(f"Unsupported burst type {burst}")
+
+
+class MemorySubordinate:
+    """
+    Subordinate performing accesses on a SharedMemory, which may be the store of
+    a memory model so that the crossbar and the model share memory contents.
+
+    :param store:      The shared store
+    :param byte_width: Width of the crossbar's data bus in bytes
+    """
+
+    def __init__(self, store: SharedMemory, byte_width: int) -> None:
+        self.port = store.port(byte_width)
+        self.byte_width = byte_width
+
+    def __call__(self, tran: AXI4WriteTransaction | AXI4ReadTransaction) -> None:
+        addresses = beat_addresses(tran.address, tran.length, tran.size, tran.burst)
+        # Data is carried on the lanes of the bus word holding each beat address
+        words = [x - (x % self.byte_width) for x in addresses]
+        if isinstance(tran, AXI4WriteTransaction):
+            for word, data, strobe in zip(words, tran.data, tran.strobe, strict=True):
+                self.port.write(word, data, strobe)
+            self.port.retire(self.port.commit())
+        else:
+            tran.data = [self.port.read(x) for x in words]
+            tran.response = [Resp.OKAY] * len(words)
+
+
+class AXI4Crossbar:
+    """
+    Behavioural model of an AXI4 interconnect, routing the requests of any
+    number of manager ports to subordinates according to an address map. Each
+    manager port is served by the monitors of its request channels and the
+    initiators of its response channels (in the same way as AXI4MemoryModel),
+    while subordinates are either memories (a SharedMemory or a memory model,
+    whose store is then shared) or functions called with complete
+    AXI4WriteTransaction and AXI4ReadTransaction objects.
+
+    Requests are decoded against a sorted index of the address map when their
+    address is captured, with unmapped addresses and bursts that cross the
+    boundary of a region receiving a DECERR response.
+    Every cycle each subordinate accepts at most one read and one write, with
+    contending managers chosen by the arbitration policy. IDs are extended with
+    the index of the issuing manager before being passed to a subordinate (as
+    an interconnect would), and responses to the same manager and ID are always
+    returned in request order.
+
+    :param tb:          Handle to the testbench
+    :param name:        Name of the crossbar (used for logging)
+    :param arbitration: Policy for choosing between contending managers
+    :param id_width:    Width of the IDs issued by managers, used to position
+                        the manager index when extending IDs (defaults to the
+                        widest ID of the manager ports)
+    """
+
+    def __init__(
+        self,
+        tb: BaseBench,
+        name: str = "axi4xbar",
+        arbitration: Arbitration = Arbitration.ROUND_ROBIN,
+        id_width: int | None = None,
+    ) -> None:
+        self.name = name
+        self.arbitration = arbitration
+        self.id_width = id_width
+        # Fork logging and random from testbench
+        self.log = tb.fork_log("axi4xbar", name)
+        self.random = Random(tb.random.random())
+        # Manager ports as (AW, W, AR, B, R), along with their request queues
+        self.managers: list[tuple] = []
+        self._aw_nodata: list[deque[tuple[AXI4WriteAddress, int]]] = []
+        self._w_beats: list[list[AXI4WriteData]] = []
+        self._w_bursts: list[deque[list[AXI4WriteData]]] = []
+        self._writes: list[deque[tuple[int, AXI4WriteTransaction, int]]] = []
+        self._reads: list[deque[tuple[int, AXI4ReadTransaction, int]]] = []
+        # Address map as sorted (base, end, subordinate) with an index of bases
+        self.subordinates: list[tuple[Subordinate, range]] = []
+        self._regions: list[tuple[int, int, int]] = []
+        self._bases: list[int] = []
+        # Most recently granted manager for each (subordinate, is_write)
+        self._last_grant: dict[tuple[int, bool], int] = {}
+        # Cycle counter maintained by the scheduler
+        self._cycle = 0
+        # Pending responses held as a heap of (due cycle, sequence, manager,
+        # response), with the latest due cycle per (manager, is_write, ID)
+        self._pending: list[tuple[int, int, int, object]] = []
+        self._sequence = itertools.count()
+        self._id_due: dict[tuple[int, bool, int], int] = {}
+        self._wakeup = Event()
+        self._started = False
+
+    @property
+    def byte_width(self) -> int:
+        """Width of the data bus in bytes, taken from the first manager port"""
+        return (self.managers[0][1].io.width("wdata") + 7) // 8
+
+    def add_manager(
+        self,
+        awreq: AXI4WriteAddressMonitor,
+        wreq: AXI4WriteDataMonitor,
+        arreq: AXI4ReadAddressMonitor,
+        brsp: AXI4WriteResponseInitiator,
+        rrsp: AXI4ReadResponseInitiator,
+    ) -> int:
+        """
+        Attach a manager port to the crossbar.
+
+        :param awreq: Monitor for the write address channel
+        :param wreq:  Monitor for the write data channel
+        :param arreq: Monitor for the read address channel
+        :param brsp:  Initiator for the write response channel
+        :param rrsp:  Initiator for the read response channel
+        :returns:     Index of the manager
+        """
+        index = len(self.managers)
+        self.managers.append((awreq, wreq, arreq, brsp, rrsp))
+        self._aw_nodata.append(deque())
+        self._w_beats.append([])
+        self._w_bursts.append(deque())
+        self._writes.append(deque())
+        self._reads.append(deque())
+        for monitor in (awreq, wreq, arreq):
+            monitor.subscribe(
+                MonitorEvent.CAPTURE,
+                lambda c, e, o, index=index: self._handle(index, c, o),
+            )
+        # Start the scheduler once the first manager is attached
+        if not self._started:
+            self._started = True
+            cocotb.start_soon(self._schedule())
+        return index
+
+    def add_subordinate(
+        self,
+        base: int,
+        size: int,
+        target: Subordinate | SharedMemory,
+        latency: tuple[int, int] = (1, 1),
+    ) -> int:
+        """
+        Map a subordinate into the address space. The target may be a
+        SharedMemory, a memory model (in which case its store is used), or a
+        function called with each complete transaction.
+
+        :param base:    Base address of the region
+        :param size:    Size of the region in bytes
+        :param target:  The subordinate
+        :param latency: Minimum and maximum number of cycles between a request
+                        being accepted and its response being presented
+        :returns:       Index of the subordinate
+        """
+        assert self.managers, "Managers must be attached before subordinates"
+        assert min(latency) >= 1, "Responses must be at least one cycle after requests"
+        end = base + size
+        position = bisect.bisect_right(self._bases, base)
+        assert (
+            position == 0 or self._regions[position - 1][1] <= base
+        ), f"Region 0x{base:X}-0x{end:X} overlaps an existing region"
+        assert (
+            position == len(self._regions) or end <= self._regions[position][0]
+        ), f"Region 0x{base:X}-0x{end:X} overlaps an existing region"
+        if isinstance(getattr(target, "store", None), SharedMemory):
+            target = target.store
+        if isinstance(target, SharedMemory):
+            target = MemorySubordinate(target, self.byte_width)
+        index = len(self.subordinates)
+        self.subordinates.append((target, range(min(latency), max(latency) + 1)))
+        self._regions.insert(position, (base, end, index))
+        self._bases.insert(position, base)
+        return index
+
+    def decode(self, address: int) -> int | None:
+        """
+        Find the subordinate mapped at an address.
+
+        :param address: The address to decode
+        :returns:       Index of the subordinate, or None if the address is not
+                        mapped
+        """
+        position = bisect.bisect_right(self._bases, address) - 1
+        if position < 0:
+            return None
+        _, end, index = self._regions[position]
+        return index if address < end else None
+
+    def decode_burst(
+        self, address: int, length: int, size: int, burst: Burst
+    ) -> int | None:
+        """
+        Find the subordinate accessed by a burst, which must lie entirely within
+        a single region.
+
+        :param address: Start address of the burst
+        :param length:  Length of the burst (number of beats minus one)
+        :param size:    Size of each beat (as log2 of the number of bytes)
+        :param burst:   Burst type
+        :returns:       Index of the subordinate, or None if the burst is not
+                        mapped or crosses the boundary of a region
+        """
+        low, high = burst_span(address, length, size, burst)
+        position = bisect.bisect_right(self._bases, low) - 1
+        if position < 0:
+            return None
+        _, end, index = self._regions[position]
+        return index if high < end else None
+
+    def _extend_id(self, manager: int, axid: int) -> int:
+        if self.id_width is None:
+            self.id_width = max(
+                max(x[0].io.width("awid"), x[2].io.width("arid")) for x in self.managers
+            )
+        return (manager << self.id_width) | axid
+
+    def _handle(self, manager: int, component, obj) -> None:
+        match obj:
+            case AXI4WriteAddress():
+                target = self.decode_burst(obj.address, obj.length, obj.size, obj.burst)
+                self._aw_nodata[manager].append((obj, target))
+            case AXI4WriteData():
+                self._w_beats[manager].append(obj)
+                if obj.last:
+                    self._w_bursts[manager].append(self._w_beats[manager])
+                    self._w_beats[manager] = []
+            case AXI4ReadAddress():
+                tran = AXI4ReadTransaction(
+                    axid=obj.axid,
+                    address=obj.address,
+                    length=obj.length,
+                    size=obj.size,
+                    burst=obj.burst,
+                    address_ns=obj.timestamp,
+                )
+                target = self.decode_burst(obj.address, obj.length, obj.size, obj.burst)
+                self._reads[manager].append((obj.qos, tran, target))
+                self._wakeup.set()
+        # Pair write addresses with complete bursts of write data
+        while self._aw_nodata[manager] and self._w_bursts[manager]:
+            awreq, target = self._aw_nodata[manager].popleft()
+            beats = self._w_bursts[manager].popleft()
+            tran = AXI4WriteTransaction(
+                axid=awreq.axid,
+                address=awreq.address,
+                length=awreq.length,
+                size=awreq.size,
+                burst=awreq.burst,
+                data=[x.data for x in beats],
+                strobe=[x.strobe for x in beats],
+                address_ns=awreq.timestamp,
+            )
+            self._writes[manager].append((awreq.qos, tran, target))
+            self._wakeup.set()
+
+    def _grant(self, key: tuple[int, bool], candidates: list[tuple[int, int]]) -> int:
+        # Candidates are provided as (manager, QoS) in manager order
+        if self.arbitration is Arbitration.FIXED:
+            return candidates[0][0]
+        if self.arbitration is Arbitration.RANDOM:
+            return self.random.choice(candidates)[0]
+        if self.arbitration is Arbitration.QOS:
+            highest = max(x[1] for x in candidates)
+            candidates = [x for x in candidates if x[1] == highest]
+        last = self._last_grant.get(key, -1)
+        return next((x for x, _ in candidates if x > last), candidates[0][0])
+
+    def _arbitrate(self, queues: list[deque], is_write: bool) -> None:
+        # Gather the request at the head of each manager's queue by subordinate
+        contending: dict[int | None, list[tuple[int, int]]] = {}
+        for manager, queue in enumerate(queues):
+            if queue:
+                qos, _, target = queue[0]
+                contending.setdefault(target, []).append((manager, qos))
+        for target, candidates in contending.items():
+            # Unmapped requests are answered without arbitration
+            if target is None:
+                for manager, _ in candidates:
+                    self._issue(manager, queues[manager].popleft()[1], None, is_write)
+                continue
+            manager = self._grant((target, is_write), candidates)
+            self._last_grant[(target, is_write)] = manager
+            self._issue(manager, queues[manager].popleft()[1], target, is_write)
+
+    def _issue(
+        self,
+        manager: int,
+        tran: AXI4WriteTransaction | AXI4ReadTransaction,
+        target: int | None,
+        is_write: bool,
+    ) -> None:
+        axid = tran.axid
+        if target is None:
+            if self.decode(tran.address) is None:
+                self.log.warning(
+                    f"No subordinate mapped at 0x{tran.address:X} for manager {manager}"
+                )
+            else:
+                self.log.warning(
+                    f"Burst at 0x{tran.address:X} from manager {manager} crosses "
+                    f"the boundary of its region"
+                )
+            if is_write:
+                tran.response = Resp.DECERR
+            else:
+                tran.data = [0] * (tran.length + 1)
+                tran.response = [Resp.DECERR] * (tran.length + 1)
+            latency = 1
+        else:
+            subordinate, latencies = self.subordinates[target]
+            tran.axid = self._extend_id(manager, axid)
+            subordinate(tran)
+            tran.axid = axid
+            latency = self.random.choice(latencies)
+        if is_write:
+            response = AXI4WriteResponse(axid=axid, response=tran.response)
+        else:
+            response = AXI4ReadBurstResponse(
+                axid=axid,
+                data=tran.data,
+                response=tran.response or Resp.OKAY,
+            )
+        # Never overtake an earlier response to the same manager and ID
+        key = (manager, is_write, axid)
+        due = max(self._cycle + latency, self._id_due.get(key, 0))
+        self._id_due[key] = due
+        heapq.heappush(self._pending, (due, next(self._sequence), manager, response))
+
+    def _step(self) -> None:
+        # Advance by one cycle, accepting requests and releasing due responses
+        self._cycle += 1
+        self._arbitrate(self._writes, True)
+        self._arbitrate(self._reads, False)
+        while self._pending and self._pending[0][0] <= self._cycle:
+            _, _, manager, response = heapq.heappop(self._pending)
+            _, _, _, brsp, rrsp = self.managers[manager]
+            if isinstance(response, AXI4WriteResponse):
+                brsp.enqueue(response)
+            else:
+                rrsp.enqueue(response)
+
+    async def _schedule(self) -> None:
+        clk = self.managers[0][0].clk
+        while True:
+            # Sleep until there is something to schedule
+            if not (self._pending or any(self._writes) or any(self._reads)):
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            await RisingEdge(clk)
+            self._step()
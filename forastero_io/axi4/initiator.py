@@ -1,12 +1,15 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2023-2024 Vypercore. All Rights Reserved
 
+from cocotb.queue import Queue
 from cocotb.triggers import ClockCycles, RisingEdge
 from cocotb.utils import get_sim_time
-from forastero.driver import BaseDriver
+from forastero.driver import BaseDriver, DriverEvent
+from forastero.transaction import BaseTransaction
 
 from .transaction import (
     AXI4ReadAddress,
+    AXI4ReadBurstResponse,
     AXI4ReadResponse,
     AXI4WriteAddress,
     AXI4WriteData,
@@ -93,13 +96,79 @@ class AXI4WriteResponseInitiator(BaseDriver):
             await RisingEdge(self.clk)
 
 
+class _BurstQueue(Queue):
+    """Driver queue that allows the next transaction to be inspected in place"""
+
+    def peek(self) -> BaseTransaction | None:
+        return self._queue[0] if self._queue else None
+
+
 class AXI4ReadResponseInitiator(BaseDriver):
-    async def drive(self, transaction: AXI4ReadResponse):
+    """
+    Drives read responses either as individual beats (AXI4ReadResponse) or as
+    complete bursts (AXI4ReadBurstResponse). Beats of a burst are presented
+    back-to-back, advancing whenever RREADY is observed high.
+
+    When interleaving, bursts with distinct IDs waiting at the head of the queue
+    join the burst being driven, while any other transaction is left queued
+    until the interleaved bursts complete. The POST_DRIVE event of each burst is
+    published as soon as its last beat has been accepted.
+
+    :param interleave:       Number of beats to present from one burst before
+                             switching to another burst with a different RID (0
+                             disables interleaving)
+    :param interleave_depth: Maximum number of bursts that may be interleaved
+    """
+
+    def __init__(
+        self, *args, interleave: int = 0, interleave_depth: int = 4, **kwds
+    ) -> None:
+        super().__init__(*args, **kwds)
+        self.interleave = interleave
+        self.interleave_depth = interleave_depth
+        # Interleaving looks ahead in the queue for bursts that may join in
+        assert self._queue.empty(), "Driver queue must be empty on construction"
+        self._queue = _BurstQueue()
+        # Burst whose POST_DRIVE was published before drive returned
+        self._posted = None
+
+    def publish(self, event: DriverEvent, obj: BaseTransaction) -> None:
+        # The driver loop publishes POST_DRIVE once drive returns, which for an
+        # interleaved burst already happened when its last beat was accepted
+        if event is DriverEvent.POST_DRIVE and obj is self._posted:
+            self._posted = None
+            return
+        super().publish(event, obj)
+
+    def _notify(self, event: DriverEvent, obj: BaseTransaction) -> None:
+        # Mirrors BaseDriver._driver_loop for bursts that are driven while the
+        # loop is still waiting on an earlier burst
+        if event is DriverEvent.PRE_DRIVE:
+            obj.timestamp = get_sim_time(units="ns")
+        self.publish(event, obj)
+        if obj._f_event is event:
+            obj._c_event.set()
+
+    def _joins(self, obj: BaseTransaction | None, active: list) -> bool:
+        return isinstance(obj, AXI4ReadBurstResponse) and all(
+            x[0].axid != obj.axid for x in active
+        )
+
+    async def drive(self, transaction: AXI4ReadResponse | AXI4ReadBurstResponse):
         if transaction.delay > 0:
             await ClockCycles(self.clk, transaction.delay)
         if transaction.deliver_at_ns is not None:
             while get_sim_time(units="ns") < transaction.deliver_at_ns:
                 await RisingEdge(self.clk)
+        if isinstance(transaction, AXI4ReadBurstResponse):
+            if self.interleave > 0:
+                await self._drive_interleaved(transaction)
+            else:
+                await self._drive_burst(transaction)
+        else:
+            await self._drive_beat(transaction)
+
+    async def _drive_beat(self, transaction: AXI4ReadResponse) -> None:
         self.io.set("rid", transaction.axid)
         self.io.set("rdata", transaction.data)
         self.io.set("rresp", int(transaction.response))
@@ -115,3 +184,88 @@ class AXI4ReadResponseInitiator(BaseDriver):
             self.io.set("rvalid", 0)
         else:
             await RisingEdge(self.clk)
+
+    def _beats(self, burst: AXI4ReadBurstResponse) -> list[int]:
+        # An empty burst cannot be presented, as RLAST would never be driven
+        if not (beats := burst.beats((self.io.width("rdata") + 7) // 8)):
+            raise Exception(f"Read burst response with ID {burst.axid} has no beats")
+        return beats
+
+    async def _drive_burst(self, transaction: AXI4ReadBurstResponse) -> None:
+        beats = self._beats(transaction)
+        responses = transaction.responses(len(beats))
+        final = len(beats) - 1
+        self.io.set("rid", transaction.axid)
+        self.io.set("ruser", transaction.user)
+        self.io.set("rvalid", 1)
+        for idx, (data, response) in enumerate(zip(beats, responses, strict=True)):
+            self.io.set("rdata", data)
+            self.io.set("rresp", int(response))
+            self.io.set("rlast", idx == final)
+            while True:
+                await RisingEdge(self.clk)
+                if self.io.get("rready"):
+                    break
+        self.io.set("rlast", 0)
+        self.io.set("rvalid", 0)
+
+    async def _drive_interleaved(self, transaction: AXI4ReadBurstResponse) -> None:
+        # Each active burst is tracked as [burst, beats, responses, next beat,
+        # remaining cycles of delay]
+        active = []
+
+        def _activate(burst: AXI4ReadBurstResponse, delay: int) -> None:
+            beats = self._beats(burst)
+            active.append([burst, beats, burst.responses(len(beats)), 0, delay])
+
+        def _is_due(entry: list) -> bool:
+            burst, *_, delay = entry
+            return delay <= 0 and (
+                burst.deliver_at_ns is None
+                or get_sim_time(units="ns") >= burst.deliver_at_ns
+            )
+
+        _activate(transaction, 0)
+        while active:
+            # Pull further bursts with distinct IDs from the head of the queue,
+            # stopping at the first transaction that cannot join the interleave
+            while len(active) < self.interleave_depth and self._joins(
+                self._queue.peek(), active
+            ):
+                obj = self._queue.get_nowait()
+                self._notify(DriverEvent.PRE_DRIVE, obj)
+                _activate(obj, obj.delay)
+            # Select the first burst that is due for delivery
+            entry = next(filter(_is_due, active), None)
+            if entry is None:
+                self.io.set("rvalid", 0)
+                await RisingEdge(self.clk)
+                for other in active:
+                    other[4] -= 1
+                continue
+            burst, beats, responses, first, _ = entry
+            self.io.set("rid", burst.axid)
+            self.io.set("ruser", burst.user)
+            self.io.set("rvalid", 1)
+            # Present up to the interleave granularity of beats
+            for index in range(first, min(first + self.interleave, len(beats))):
+                self.io.set("rdata", beats[index])
+                self.io.set("rresp", int(responses[index]))
+                self.io.set("rlast", index == len(beats) - 1)
+                while True:
+                    await RisingEdge(self.clk)
+                    for other in active:
+                        other[4] -= 1
+                    if self.io.get("rready"):
+                        break
+                entry[3] = index + 1
+            # Retire completed bursts, otherwise rotate to the back
+            active.remove(entry)
+            if entry[3] < len(beats):
+                active.append(entry)
+            else:
+                self._notify(DriverEvent.POST_DRIVE, burst)
+                if burst is transaction:
+                    self._posted = burst
+        self.io.set("rlast", 0)
+        self.io.set("rvalid", 0)
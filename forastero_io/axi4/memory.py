@@ -1,13 +1,15 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2023-2024 Vypercore. All Rights Reserved
 
-import functools
 from random import Random
 
 from cocotb.utils import get_sim_time
 from forastero.bench import BaseBench
+from forastero.driver import DriverEvent
 from forastero.monitor import MonitorEvent
 
+from ..common.memory import MemoryBackdoor, SharedMemory
+from ..common.profile import AccessProfile
 from .common import Burst
 from .initiator import (
     AXI4ReadResponseInitiator,
@@ -20,14 +22,14 @@ from .monitor import (
 )
 from .transaction import (
     AXI4ReadAddress,
-    AXI4ReadResponse,
+    AXI4ReadBurstResponse,
     AXI4WriteAddress,
     AXI4WriteData,
     AXI4WriteResponse,
 )
 
 
-class AXI4MemoryModel:
+class AXI4MemoryModel(MemoryBackdoor):
     def __init__(
         self,
         tb: BaseBench,
@@ -38,7 +40,11 @@ class AXI4MemoryModel:
         rrsp: AXI4ReadResponseInitiator,
         error_noninit: True,
         rand_noninit: True,
+        hash_noninit: bool = False,
         response_delay: tuple[int, int] = (0, 0),
+        page_size: int = 4096,
+        store: SharedMemory | None = None,
+        profile: AccessProfile | None = None,
     ) -> None:
         # Hold references
         self.awreq = awreq
@@ -48,7 +54,9 @@ class AXI4MemoryModel:
         self.rrsp = rrsp
         self.error_noninit = error_noninit
         self.rand_noninit = rand_noninit
+        self.hash_noninit = hash_noninit
         self.response_delay = response_delay
+        self.profile = profile
         # Fork logging and random from testbench
         self.log = tb.fork_log("axi4lmem")
         self.random = Random(tb.random.random())
@@ -56,8 +64,22 @@ class AXI4MemoryModel:
         self.bit_width = self.wreq.io.width("wdata")
         self.byte_width = (self.bit_width + 7) // 8
         self.mask = (1 << self.bit_width) - 1
-        # Create memory
-        self.memory = {}
+        # Create a private store unless a shared store has been provided
+        if store is None:
+            store = SharedMemory(
+                tb,
+                self.byte_width,
+                error_noninit=error_noninit,
+                rand_noninit=rand_noninit,
+                hash_noninit=hash_noninit,
+                page_size=page_size,
+            )
+        self.store = store
+        self.port = store.port(self.byte_width)
+        self.memory = store.memory
+        # Write responses issued by the model that have not yet been driven,
+        # keyed by ID of the response along with the batch of writes it retires
+        self._issued: dict[int, tuple[AXI4WriteResponse, list | None]] = {}
         # Queues
         self.q_awreq: list[AXI4WriteAddress] = []
         self.q_wreq: list[AXI4WriteData] = []
@@ -67,32 +89,28 @@ class AXI4MemoryModel:
         self.awreq.subscribe(MonitorEvent.CAPTURE, self._handle)
         self.wreq.subscribe(MonitorEvent.CAPTURE, self._handle)
         self.arreq.subscribe(MonitorEvent.CAPTURE, self._handle)
-
-    @functools.lru_cache  # noqa: B019
-    def _bit_strobe(self, byte_strobe: int) -> int:
-        return sum(
-            ((0xFF << (i * 8)) if ((byte_strobe >> i) & 0x1) else 0)
-            for i in range(int(self.byte_width))
-        )
+        self.brsp.subscribe(DriverEvent.POST_DRIVE, self._retire)
 
     def read(self, address: int, check: bool = True) -> int:
-        if address not in self.memory:
-            if check and self.error_noninit:
-                raise Exception(f"Read from uninitialised address: 0x{address:016X}")
-            elif self.rand_noninit:
-                self.memory[address] = self.random.getrandbits(self.bit_width)
-            else:
-                self.memory[address] = 0
-        return self.memory[address]
+        return self.port.read(address, check=check)
 
     def write(self, address: int, data: int, strobe: int) -> None:
-        current = self.read(address, check=False)
-        bit_strobe = self._bit_strobe(strobe)
-        if bit_strobe == self.mask:
-            self.memory[address] = data
-        else:
-            value = (data & bit_strobe) | (current & (self.mask ^ bit_strobe))
-            self.memory[address] = value
+        self.port.write(address, data, strobe)
+
+    def diff(self, other) -> list[tuple[int, int]]:
+        """
+        Compare the contents of this memory against another memory model or an
+        image mapping addresses to data words, see PagedMemory.diff.
+
+        :param other: Memory model, PagedMemory, or image to compare against
+        :returns:     List of differing address ranges as (start, end)
+        """
+        return self.memory.diff(getattr(other, "memory", other))
+
+    def _retire(self, component, event, obj) -> None:
+        # Writes become visible to other ports once their response is issued
+        if (issued := self._issued.pop(id(obj), None)) is not None:
+            self.port.retire(issued[1])
 
     def _handle(self, component, event, obj) -> None:
         # Queue AW/W requests, immediately respond to AR requests
@@ -107,16 +125,25 @@ class AXI4MemoryModel:
                 # TODO: Implement wrapping logic
                 if obj.burst != Burst.INCR:
                     raise NotImplementedError
-                for i in range(obj.length + 1):
-                    self.rrsp.enqueue(
-                        AXI4ReadResponse(
-                            axid=obj.axid,
-                            data=self.read(obj.address + i),
-                            last=True if (i == (obj.length - 1)) else False,
-                            deliver_at_ns=get_sim_time(units="ns")
-                            + self.random.randint(*self.response_delay),
-                        )
+                if self.profile is not None:
+                    self.profile.record(
+                        False,
+                        obj.address,
+                        obj.length + 1,
+                        self.byte_width,
+                        get_sim_time(units="ns"),
+                    )
+                self.rrsp.enqueue(
+                    AXI4ReadBurstResponse(
+                        axid=obj.axid,
+                        data=[
+                            self.read(obj.address + (i * self.byte_width))
+                            for i in range(obj.length + 1)
+                        ],
+                        deliver_at_ns=get_sim_time(units="ns")
+                        + self.random.randint(*self.response_delay),
                     )
+                )
         # Once a matching AW and W request are available, respond
         if self.q_awreq and (self.wlast_count > 0):
             awreq = self.q_awreq.pop(0)
@@ -128,7 +155,7 @@ class AXI4MemoryModel:
                 self.write(write_addr, wreq.data, wreq.strobe)
                 # Calculate next address in the burst
                 if awreq.burst == Burst.INCR:
-                    write_addr += 8
+                    write_addr += self.byte_width
                 elif awreq.burst == Burst.WRAP:
                     # TODO: Implement wrapping logic
                     raise Exception("Model does not support wrapping bursts")
@@ -141,9 +168,20 @@ class AXI4MemoryModel:
                     break
                 # Otherwise, pop the next request
                 wreq = self.q_wreq.pop(0)
-            self.brsp.enqueue(
-                AXI4WriteResponse(
-                    deliver_at_ns=get_sim_time(units="ns")
-                    + self.random.randint(*self.response_delay),
+            batch = self.port.commit()
+            if self.profile is not None:
+                self.profile.record(
+                    True,
+                    awreq.address,
+                    awreq.length + 1,
+                    self.byte_width,
+                    get_sim_time(units="ns"),
+                    fixed=awreq.burst == Burst.FIXED,
                 )
+            response = AXI4WriteResponse(
+                axid=awreq.axid,
+                deliver_at_ns=get_sim_time(units="ns")
+                + self.random.randint(*self.response_delay),
             )
+            self._issued[id(response)] = (response, batch)
+            self.brsp.enqueue(response)
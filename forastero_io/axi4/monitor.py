@@ -2,9 +2,10 @@
 # Copyright (c) 2023-2024 Vypercore. All Rights Reserved
 
 from cocotb.triggers import RisingEdge
-from forastero.monitor import BaseMonitor
 
-from .common import Arcache, Awcache, Burst, Prot, Resp, Size
+from ..common.digest import DigestMonitor
+from .checker import CheckedMonitor
+from .common import Arcache, Awcache, Burst, Prot, Resp, Size, cast
 from .transaction import (
     AXI4ReadAddress,
     AXI4ReadResponse,
@@ -14,22 +15,27 @@ from .transaction import (
 )
 
 
-class AXI4WriteAddressMonitor(BaseMonitor):
+class AXI4WriteAddressMonitor(CheckedMonitor):
     async def monitor(self, capture):
         while True:
             await RisingEdge(self.clk)
             if self.rst.value == 1:
+                if __debug__ and self.checker is not None:
+                    self.checker.reset(self.io)
                 continue
-            if self.io.get("awvalid") and self.io.get("awready"):
+            valid, ready = self.io.get("awvalid"), self.io.get("awready")
+            if __debug__ and self.checker is not None:
+                self.checker.handshake(self.io, "aw", valid, ready)
+            if valid and ready:
                 capture(
                     AXI4WriteAddress(
                         axid=self.io.get("awid", 0),
                         address=self.io.get("awaddr", 0),
                         length=self.io.get("awlen", 0),
-                        size=Size._pt_cast(self.io.get("awsize", 0)),
-                        burst=Burst._pt_cast(self.io.get("awburst", 0)),
-                        cache=Awcache._pt_cast(self.io.get("awcache", 0)),
-                        protection=Prot._pt_cast(self.io.get("awprot", 0)),
+                        size=cast(Size, self.io.get("awsize", 0)),
+                        burst=cast(Burst, self.io.get("awburst", 0)),
+                        cache=cast(Awcache, self.io.get("awcache", 0)),
+                        protection=cast(Prot, self.io.get("awprot", 0)),
                         qos=self.io.get("awqos", 0),
                         region=self.io.get("awregion", 0),
                         user=self.io.get("awuser", 0),
@@ -38,15 +44,20 @@ class AXI4WriteAddressMonitor(BaseMonitor):
                 )
 
 
-class AXI4WriteDataMonitor(BaseMonitor):
+class AXI4WriteDataMonitor(CheckedMonitor):
     async def monitor(self, capture):
         index = 0
         while True:
             await RisingEdge(self.clk)
             if self.rst.value == 1:
+                if __debug__ and self.checker is not None:
+                    self.checker.reset(self.io)
                 index = 0
                 continue
-            if self.io.get("wvalid") and self.io.get("wready"):
+            valid, ready = self.io.get("wvalid"), self.io.get("wready")
+            if __debug__ and self.checker is not None:
+                self.checker.handshake(self.io, "w", valid, ready)
+            if valid and ready:
                 capture(
                     AXI4WriteData(
                         index=index,
@@ -63,39 +74,49 @@ class AXI4WriteDataMonitor(BaseMonitor):
                     index += 1
 
 
-class AXI4WriteResponseMonitor(BaseMonitor):
+class AXI4WriteResponseMonitor(CheckedMonitor):
     async def monitor(self, capture):
         while True:
             await RisingEdge(self.clk)
             if self.rst.value == 1:
+                if __debug__ and self.checker is not None:
+                    self.checker.reset(self.io)
                 continue
-            if self.io.get("bvalid") and self.io.get("bready"):
+            valid, ready = self.io.get("bvalid"), self.io.get("bready")
+            if __debug__ and self.checker is not None:
+                self.checker.handshake(self.io, "b", valid, ready)
+            if valid and ready:
                 capture(
                     AXI4WriteResponse(
                         axid=self.io.get("bid", 0),
-                        response=Resp._pt_cast(self.io.get("bresp", 0)),
+                        response=cast(Resp, self.io.get("bresp", 0)),
                         user=self.io.get("buser", 0),
                         valid=1,
                     )
                 )
 
 
-class AXI4ReadAddressMonitor(BaseMonitor):
+class AXI4ReadAddressMonitor(CheckedMonitor):
     async def monitor(self, capture):
         while True:
             await RisingEdge(self.clk)
             if self.rst.value == 1:
+                if __debug__ and self.checker is not None:
+                    self.checker.reset(self.io)
                 continue
-            if self.io.get("arvalid") and self.io.get("arready"):
+            valid, ready = self.io.get("arvalid"), self.io.get("arready")
+            if __debug__ and self.checker is not None:
+                self.checker.handshake(self.io, "ar", valid, ready)
+            if valid and ready:
                 capture(
                     AXI4ReadAddress(
                         axid=self.io.get("arid", 0),
                         address=self.io.get("araddr", 0),
                         length=self.io.get("arlen", 0),
-                        size=Size._pt_cast(self.io.get("arsize", 0)),
-                        burst=Burst._pt_cast(self.io.get("arburst", 0)),
-                        cache=Arcache._pt_cast(self.io.get("arcache", 0)),
-                        protection=Prot._pt_cast(self.io.get("arprot", 0)),
+                        size=cast(Size, self.io.get("arsize", 0)),
+                        burst=cast(Burst, self.io.get("arburst", 0)),
+                        cache=cast(Arcache, self.io.get("arcache", 0)),
+                        protection=cast(Prot, self.io.get("arprot", 0)),
                         qos=self.io.get("arqos", 0),
                         region=self.io.get("arregion", 0),
                         user=self.io.get("aruser", 0),
@@ -104,26 +125,33 @@ class AXI4ReadAddressMonitor(BaseMonitor):
                 )
 
 
-class AXI4ReadResponseMonitor(BaseMonitor):
+class AXI4ReadResponseMonitor(CheckedMonitor, DigestMonitor):
     async def monitor(self, capture):
         index = 0
         while True:
             await RisingEdge(self.clk)
             if self.rst.value == 1:
+                if __debug__ and self.checker is not None:
+                    self.checker.reset(self.io)
                 index = 0
                 continue
-            if self.io.get("rvalid") and self.io.get("rready"):
-                capture(
-                    AXI4ReadResponse(
-                        index=index,
-                        axid=self.io.get("rid", 0),
-                        data=self.io.get("rdata", 0),
-                        response=Resp._pt_cast(self.io.get("rresp", 0)),
-                        last=self.io.get("rlast", 0),
-                        user=self.io.get("ruser", 0),
-                        valid=1,
-                    )
+            valid, ready = self.io.get("rvalid"), self.io.get("rready")
+            if __debug__ and self.checker is not None:
+                self.checker.handshake(self.io, "r", valid, ready)
+            if valid and ready:
+                tran = AXI4ReadResponse(
+                    index=index,
+                    axid=self.io.get("rid", 0),
+                    data=self.io.get("rdata", 0),
+                    response=cast(Resp, self.io.get("rresp", 0)),
+                    last=self.io.get("rlast", 0),
+                    user=self.io.get("ruser", 0),
+                    valid=1,
                 )
+                if self.digest is None:
+                    capture(tran)
+                elif (checkpoint := self.fold_digest(tran)) is not None:
+                    capture(checkpoint)
                 if self.io.get("rlast", 1):
                     index = 0
                 else:
@@ -1,7 +1,7 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2023-2024 Vypercore. All Rights Reserved
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from forastero import BaseTransaction
 
@@ -66,10 +66,85 @@ class AXI4ReadResponse(BaseTransaction):
     last: bool = False
     user: int = 0
     valid: int = 1
+    delay: int = 0
     deliver_at_ns: float | None = None
 
 
+@dataclass(kw_only=True)
+class AXI4ReadBurstResponse(BaseTransaction):
+    """
+    Complete read burst response, driven as back-to-back beats by the
+    AXI4ReadResponseInitiator. Data may either be provided as a list of beat
+    values, or as a bytes-like object that is sliced into bus width beats (in
+    little-endian order).
+    """
+
+    axid: int = 0
+    data: bytes | list[int] = field(default_factory=list)
+    response: Resp | list[Resp] = Resp.OKAY
+    user: int = 0
+    delay: int = 0
+    deliver_at_ns: float | None = None
+
+    def beats(self, byte_width: int) -> list[int]:
+        """
+        Return the data of each beat of the burst.
+
+        :param byte_width: Width of the data bus in bytes
+        :returns:          List of beat values
+        """
+        if isinstance(self.data, list):
+            return self.data
+        view = memoryview(self.data).cast("B")
+        return [
+            int.from_bytes(view[x : x + byte_width], "little")
+            for x in range(0, len(view), byte_width)
+        ]
+
+    def responses(self, count: int) -> list[Resp]:
+        """
+        Return the response of each beat of the burst.
+
+        :param count: Number of beats in the burst
+        :returns:     List of beat responses
+        """
+        if isinstance(self.response, list):
+            return self.response
+        return [self.response] * count
+
+
 @dataclass(kw_only=True)
 class AXI4Backpressure(BaseTransaction):
     ready: bool = True
     cycles: int = 1
+
+
+@dataclass(kw_only=True)
+class AXI4WriteTransaction(BaseTransaction):
+    """Complete write transaction assembled from AW, W, and B channels"""
+
+    axid: int = 0
+    address: int = 0
+    length: int = 0
+    size: Size = Size.B1
+    burst: Burst = Burst.FIXED
+    data: list[int] = field(default_factory=list)
+    strobe: list[int] = field(default_factory=list)
+    response: Resp = Resp.OKAY
+    address_ns: float = field(default=0, compare=False)
+    response_ns: float = field(default=0, compare=False)
+
+
+@dataclass(kw_only=True)
+class AXI4ReadTransaction(BaseTransaction):
+    """Complete read transaction assembled from AR and R channels"""
+
+    axid: int = 0
+    address: int = 0
+    length: int = 0
+    size: Size = Size.B1
+    burst: Burst = Burst.FIXED
+    data: list[int] = field(default_factory=list)
+    response: list[Resp] = field(default_factory=list)
+    address_ns: float = field(default=0, compare=False)
+    response_ns: float = field(default=0, compare=False)
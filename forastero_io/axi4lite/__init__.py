@@ -1,6 +1,7 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2023-2024 Vypercore. All Rights Reserved
 
+from .checker import AXI4LiteProtocolChecker
 from .initiator import (
     AXI4LiteReadAddressInitiator,
     AXI4LiteReadResponseInitiator,
@@ -53,6 +54,7 @@ assert all(
     (
         AXI4LiteBackpressure,
         AXI4LiteMemoryModel,
+        AXI4LiteProtocolChecker,
         AXI4LiteReadAddress,
         AXI4LiteReadAddressInitiator,
         AXI4LiteReadAddressIO,
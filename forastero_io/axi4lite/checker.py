@@ -0,0 +1,18 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+from typing import ClassVar
+
+from ..axi4.checker import ProtocolChecker
+
+
+class AXI4LiteProtocolChecker(ProtocolChecker):
+    """Protocol checker for the VALID/READY rules of AXI4-Lite interfaces"""
+
+    CHANNELS: ClassVar[dict[str, tuple[str, str, tuple[str, ...]]]] = {
+        "aw": ("awvalid", "awready", ("awaddr", "awprot")),
+        "w": ("wvalid", "wready", ("wdata", "wstrb")),
+        "b": ("bvalid", "bready", ("bresp",)),
+        "ar": ("arvalid", "arready", ("araddr", "arprot")),
+        "r": ("rvalid", "rready", ("rdata", "rresp")),
+    }
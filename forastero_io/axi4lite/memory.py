@@ -1,13 +1,14 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2023-2024 Vypercore. All Rights Reserved
 
-import functools
 from random import Random
 
 from cocotb.utils import get_sim_time
 from forastero.bench import BaseBench
+from forastero.driver import DriverEvent
 from forastero.monitor import MonitorEvent
 
+from ..common.memory import MemoryBackdoor, SharedMemory
 from .initiator import (
     AXI4LiteReadResponseInitiator,
     AXI4LiteWriteResponseInitiator,
@@ -26,7 +27,7 @@ from .transaction import (
 )
 
 
-class AXI4LiteMemoryModel:
+class AXI4LiteMemoryModel(MemoryBackdoor):
     def __init__(
         self,
         tb: BaseBench,
@@ -37,7 +38,10 @@ class AXI4LiteMemoryModel:
         rrsp: AXI4LiteReadResponseInitiator,
         error_noninit: True,
         rand_noninit: True,
+        hash_noninit: bool = False,
         response_delay: tuple[int, int] = (0, 0),
+        page_size: int = 4096,
+        store: SharedMemory | None = None,
     ) -> None:
         # Hold references
         self.awreq = awreq
@@ -47,6 +51,7 @@ class AXI4LiteMemoryModel:
         self.rrsp = rrsp
         self.error_noninit = error_noninit
         self.rand_noninit = rand_noninit
+        self.hash_noninit = hash_noninit
         self.response_delay = response_delay
         # Fork logging and random from testbench
         self.log = tb.fork_log("axi4lmem")
@@ -55,8 +60,22 @@ class AXI4LiteMemoryModel:
         self.bit_width = self.wreq.io.width("wdata")
         self.byte_width = (self.bit_width + 7) // 8
         self.mask = (1 << self.bit_width) - 1
-        # Create memory
-        self.memory = {}
+        # Create a private store unless a shared store has been provided
+        if store is None:
+            store = SharedMemory(
+                tb,
+                self.byte_width,
+                error_noninit=error_noninit,
+                rand_noninit=rand_noninit,
+                hash_noninit=hash_noninit,
+                page_size=page_size,
+            )
+        self.store = store
+        self.port = store.port(self.byte_width)
+        self.memory = store.memory
+        # Write responses issued by the model that have not yet been driven,
+        # keyed by ID of the response along with the batch of writes it retires
+        self._issued: dict[int, tuple[AXI4LiteWriteResponse, list | None]] = {}
         # Queues
         self.q_awreq: list[AXI4LiteWriteAddress] = []
         self.q_wreq: list[AXI4LiteWriteData] = []
@@ -64,32 +83,28 @@ class AXI4LiteMemoryModel:
         self.awreq.subscribe(MonitorEvent.CAPTURE, self._handle)
         self.wreq.subscribe(MonitorEvent.CAPTURE, self._handle)
         self.arreq.subscribe(MonitorEvent.CAPTURE, self._handle)
-
-    @functools.lru_cache  # noqa: B019
-    def _bit_strobe(self, byte_strobe: int) -> int:
-        return sum(
-            ((0xFF << (i * 8)) if ((byte_strobe >> i) & 0x1) else 0)
-            for i in range(int(self.byte_width))
-        )
+        self.brsp.subscribe(DriverEvent.POST_DRIVE, self._retire)
 
     def read(self, address: int, check: bool = True) -> int:
-        if address not in self.memory:
-            if check and self.error_noninit:
-                raise Exception(f"Read from uninitialised address: 0x{address:016X}")
-            elif self.rand_noninit:
-                self.memory[address] = self.random.getrandbits(self.bit_width)
-            else:
-                self.memory[address] = 0
-        return self.memory[address]
+        return self.port.read(address, check=check)
 
     def write(self, address: int, data: int, strobe: int) -> None:
-        current = self.read(address, check=False)
-        bit_strobe = self._bit_strobe(strobe)
-        if bit_strobe == self.mask:
-            self.memory[address] = data
-        else:
-            value = (data & bit_strobe) | (current & (self.mask ^ bit_strobe))
-            self.memory[address] = value
+        self.port.write(address, data, strobe)
+
+    def diff(self, other) -> list[tuple[int, int]]:
+        """
+        Compare the contents of this memory against another memory model or an
+        image mapping addresses to data words, see PagedMemory.diff.
+
+        :param other: Memory model, PagedMemory, or image to compare against
+        :returns:     List of differing address ranges as (start, end)
+        """
+        return self.memory.diff(getattr(other, "memory", other))
+
+    def _retire(self, component, event, obj) -> None:
+        # Writes become visible to other ports once their response is issued
+        if (issued := self._issued.pop(id(obj), None)) is not None:
+            self.port.retire(issued[1])
 
     def _handle(self, component, event, obj) -> None:
         # Queue AW/W requests, immediately respond to AR requests
@@ -111,9 +126,10 @@ class AXI4LiteMemoryModel:
             awreq = self.q_awreq.pop(0)
             wreq = self.q_wreq.pop(0)
             self.write(awreq.address, wreq.data, wreq.strobe)
-            self.brsp.enqueue(
-                AXI4LiteWriteResponse(
-                    deliver_at_ns=get_sim_time(units="ns")
-                    + self.random.randint(*self.response_delay),
-                )
+            batch = self.port.commit()
+            response = AXI4LiteWriteResponse(
+                deliver_at_ns=get_sim_time(units="ns")
+                + self.random.randint(*self.response_delay),
             )
+            self._issued[id(response)] = (response, batch)
+            self.brsp.enqueue(response)
@@ -2,8 +2,8 @@
 # Copyright (c) 2023-2024 Vypercore. All Rights Reserved
 
 from cocotb.triggers import RisingEdge
-from forastero.monitor import BaseMonitor
 
+from ..axi4.checker import CheckedMonitor
 from ..axi4.common import Prot, Resp
 from .transaction import (
     AXI4LiteReadAddress,
@@ -14,13 +14,18 @@ from .transaction import (
 )
 
 
-class AXI4LiteWriteAddressMonitor(BaseMonitor):
+class AXI4LiteWriteAddressMonitor(CheckedMonitor):
     async def monitor(self, capture):
         while True:
             await RisingEdge(self.clk)
             if self.rst.value == 1:
+                if __debug__ and self.checker is not None:
+                    self.checker.reset(self.io)
                 continue
-            if self.io.get("awvalid") and self.io.get("awready"):
+            valid, ready = self.io.get("awvalid"), self.io.get("awready")
+            if __debug__ and self.checker is not None:
+                self.checker.handshake(self.io, "aw", valid, ready)
+            if valid and ready:
                 capture(
                     AXI4LiteWriteAddress(
                         address=self.io.get("awaddr"),
@@ -30,13 +35,18 @@ class AXI4LiteWriteAddressMonitor(BaseMonitor):
                 )
 
 
-class AXI4LiteWriteDataMonitor(BaseMonitor):
+class AXI4LiteWriteDataMonitor(CheckedMonitor):
     async def monitor(self, capture):
         while True:
             await RisingEdge(self.clk)
             if self.rst.value == 1:
+                if __debug__ and self.checker is not None:
+                    self.checker.reset(self.io)
                 continue
-            if self.io.get("wvalid") and self.io.get("wready"):
+            valid, ready = self.io.get("wvalid"), self.io.get("wready")
+            if __debug__ and self.checker is not None:
+                self.checker.handshake(self.io, "w", valid, ready)
+            if valid and ready:
                 capture(
                     AXI4LiteWriteData(
                         data=self.io.get("wdata"), strobe=self.io.get("wstrb"), valid=1
@@ -44,13 +54,18 @@ class AXI4LiteWriteDataMonitor(BaseMonitor):
                 )
 
 
-class AXI4LiteWriteResponseMonitor(BaseMonitor):
+class AXI4LiteWriteResponseMonitor(CheckedMonitor):
     async def monitor(self, capture):
         while True:
             await RisingEdge(self.clk)
             if self.rst.value == 1:
+                if __debug__ and self.checker is not None:
+                    self.checker.reset(self.io)
                 continue
-            if self.io.get("bvalid") and self.io.get("bready"):
+            valid, ready = self.io.get("bvalid"), self.io.get("bready")
+            if __debug__ and self.checker is not None:
+                self.checker.handshake(self.io, "b", valid, ready)
+            if valid and ready:
                 capture(
                     AXI4LiteWriteResponse(
                         response=Resp(self.io.get("bresp", 0)),
@@ -59,13 +74,18 @@ class AXI4LiteWriteResponseMonitor(BaseMonitor):
                 )
 
 
-class AXI4LiteReadAddressMonitor(BaseMonitor):
+class AXI4LiteReadAddressMonitor(CheckedMonitor):
     async def monitor(self, capture):
         while True:
             await RisingEdge(self.clk)
             if self.rst.value == 1:
+                if __debug__ and self.checker is not None:
+                    self.checker.reset(self.io)
                 continue
-            if self.io.get("arvalid") and self.io.get("arready"):
+            valid, ready = self.io.get("arvalid"), self.io.get("arready")
+            if __debug__ and self.checker is not None:
+                self.checker.handshake(self.io, "ar", valid, ready)
+            if valid and ready:
                 capture(
                     AXI4LiteReadAddress(
                         address=self.io.get("araddr"),
@@ -75,13 +95,18 @@ class AXI4LiteReadAddressMonitor(BaseMonitor):
                 )
 
 
-class AXI4LiteReadResponseMonitor(BaseMonitor):
+class AXI4LiteReadResponseMonitor(CheckedMonitor):
     async def monitor(self, capture):
         while True:
             await RisingEdge(self.clk)
             if self.rst.value == 1:
+                if __debug__ and self.checker is not None:
+                    self.checker.reset(self.io)
                 continue
-            if self.io.get("rvalid") and self.io.get("rready"):
+            valid, ready = self.io.get("rvalid"), self.io.get("rready")
+            if __debug__ and self.checker is not None:
+                self.checker.handshake(self.io, "r", valid, ready)
+            if valid and ready:
                 capture(
                     AXI4LiteReadResponse(
                         data=self.io.get("rdata", 0),
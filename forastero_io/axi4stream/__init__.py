@@ -1,10 +1,22 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2023-2024 Vypercore. All Rights Reserved
 
+from .checker import AXI4StreamProtocolChecker
 from .initiator import AXI4StreamInitiator
 from .io import AXI4StreamIO
-from .monitor import AXI4StreamMonitor
-from .sequences import axi4stream_backpressure_seq
+from .monitor import AXI4StreamMonitor, RouteStatistics
+from .packet import (
+    LengthPrefixedSink,
+    LengthPrefixedSource,
+    PacketSink,
+    PcapSink,
+    PcapSource,
+    RawFrameSink,
+    RawFrameSource,
+    StreamPacket,
+    packet_transfers,
+)
+from .sequences import axi4stream_backpressure_seq, axi4stream_feed_seq
 from .target import AXI4StreamTarget
 from .transaction import AXI4StreamBackpressure, AXI4StreamTransfer
 
@@ -14,9 +26,21 @@ assert all(
         AXI4StreamInitiator,
         AXI4StreamIO,
         AXI4StreamMonitor,
+        AXI4StreamProtocolChecker,
         AXI4StreamTarget,
         AXI4StreamTransfer,
         AXI4StreamBackpressure,
+        LengthPrefixedSink,
+        LengthPrefixedSource,
+        PacketSink,
+        PcapSink,
+        PcapSource,
+        RawFrameSink,
+        RawFrameSource,
+        RouteStatistics,
+        StreamPacket,
+        packet_transfers,
         axi4stream_backpressure_seq,
+        axi4stream_feed_seq,
     )
 )
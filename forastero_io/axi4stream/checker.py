@@ -0,0 +1,18 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+from typing import ClassVar
+
+from ..axi4.checker import ProtocolChecker
+
+
+class AXI4StreamProtocolChecker(ProtocolChecker):
+    """Protocol checker for the VALID/READY rules of AXI4-Stream interfaces"""
+
+    CHANNELS: ClassVar[dict[str, tuple[str, str, tuple[str, ...]]]] = {
+        "t": (
+            "tvalid",
+            "tready",
+            ("tid", "tdata", "tstrb", "tkeep", "tlast", "tdest", "tuser"),
+        ),
+    }
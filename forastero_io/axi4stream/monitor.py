@@ -1,34 +1,104 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2023-2024 Vypercore. All Rights Reserved
 
+import asyncio
+import dataclasses
+from collections.abc import Callable
+
+import cocotb
 from cocotb.triggers import RisingEdge
-from forastero.monitor import BaseMonitor
+from forastero.monitor import MonitorEvent
 
+from ..axi4.checker import CheckedMonitor
+from ..common.digest import DigestMonitor
 from .transaction import AXI4StreamTransfer
 
 
-class AXI4StreamMonitor(BaseMonitor):
+@dataclasses.dataclass()
+class RouteStatistics:
+    transfers: int = 0
+    packets: int = 0
+
+
+class AXI4StreamMonitor(CheckedMonitor, DigestMonitor):
+    """
+    Captures transfers from an AXI4-Stream interface. In addition to the usual
+    subscriptions, which receive every transfer, subscribers may be keyed by
+    TDEST and/or TID so that each transfer is only delivered to the subscribers
+    of its route (found by dictionary lookup rather than by every subscriber
+    filtering every transfer). Counts of the transfers and packets delivered to
+    each route are kept in route_stats.
+    """
+
+    def __init__(self, *args, **kwds) -> None:
+        super().__init__(*args, **kwds)
+        # Routed subscribers, keyed by TDEST and TID (None matching any)
+        self._routes: dict[tuple[int | None, int | None], list[Callable]] = {}
+        self.route_stats: dict[tuple[int | None, int | None], RouteStatistics] = {}
+
+    def subscribe_route(
+        self, callback: Callable, dest: int | None = None, axid: int | None = None
+    ) -> None:
+        """
+        Subscribe to the transfers captured on a single route. Routed
+        subscribers always receive transfers, even when the monitor has been
+        constructed with a digest. As with other subscriptions, callbacks which
+        return a coroutine have it started as a separate task.
+
+        :param callback: Method to call for each transfer, accepting arguments
+                         of component, event type, and the transfer
+        :param dest:     TDEST of the route, or None to match any
+        :param axid:     TID of the route, or None to match any
+        """
+        assert dest is not None or axid is not None, "A TDEST or TID is required"
+        self._routes.setdefault((dest, axid), []).append(callback)
+        self.route_stats.setdefault((dest, axid), RouteStatistics())
+
+    def _route(self, tran: AXI4StreamTransfer) -> None:
+        routes = self._routes
+        for key in ((tran.dest, tran.axid), (tran.dest, None), (None, tran.axid)):
+            if (callbacks := routes.get(key, None)) is None:
+                continue
+            stats = self.route_stats[key]
+            stats.transfers += 1
+            if tran.last:
+                stats.packets += 1
+            # Dispatch in the same way as EventEmitter.publish
+            for callback in callbacks:
+                call = callback(self, MonitorEvent.CAPTURE, tran)
+                if asyncio.iscoroutine(call):
+                    cocotb.start_soon(call)
+
     async def monitor(self, capture):
         index = 0
         while True:
             await RisingEdge(self.clk)
             if self.rst.value == 1:
+                if __debug__ and self.checker is not None:
+                    self.checker.reset(self.io)
                 index = 0
                 continue
-            if self.io.get("tvalid") and self.io.get("tready"):
-                capture(
-                    AXI4StreamTransfer(
-                        index=index,
-                        axid=self.io.get("tid", 0),
-                        data=self.io.get("tdata", 0),
-                        strobe=self.io.get("tstrb", 0),
-                        keep=self.io.get("tkeep", 0),
-                        last=self.io.get("tlast", 0),
-                        dest=self.io.get("tdest", 0),
-                        user=self.io.get("tuser", 0),
-                        valid=True,
-                    )
+            valid, ready = self.io.get("tvalid"), self.io.get("tready")
+            if __debug__ and self.checker is not None:
+                self.checker.handshake(self.io, "t", valid, ready)
+            if valid and ready:
+                tran = AXI4StreamTransfer(
+                    index=index,
+                    axid=self.io.get("tid", 0),
+                    data=self.io.get("tdata", 0),
+                    strobe=self.io.get("tstrb", 0),
+                    keep=self.io.get("tkeep", 0),
+                    last=self.io.get("tlast", 0),
+                    dest=self.io.get("tdest", 0),
+                    user=self.io.get("tuser", 0),
+                    valid=True,
                 )
+                if self._routes:
+                    self._route(tran)
+                if self.digest is None:
+                    capture(tran)
+                elif (checkpoint := self.fold_digest(tran)) is not None:
+                    capture(checkpoint)
                 if self.io.get("tlast", 1):
                     index = 0
                 else:
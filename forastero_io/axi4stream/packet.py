@@ -0,0 +1,434 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+import abc
+import contextlib
+import mmap
+import struct
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from forastero.bench import BaseBench
+from forastero.monitor import MonitorEvent
+
+from ..common.strobe import ByteStrobe
+from .monitor import AXI4StreamMonitor
+from .transaction import AXI4StreamTransfer
+
+# Magic numbers of pcap captures with microsecond and nanosecond timestamps
+PCAP_MAGIC_US = 0xA1B2C3D4
+PCAP_MAGIC_NS = 0xA1B23C4D
+PCAP_HEADER = struct.Struct("<IHHiIII")
+PCAP_RECORD = struct.Struct("<IIII")
+
+# Block types and byte order magic of pcapng captures
+PCAPNG_SHB = 0x0A0D0D0A
+PCAPNG_IDB = 0x00000001
+PCAPNG_SPB = 0x00000003
+PCAPNG_EPB = 0x00000006
+PCAPNG_BOM = 0x1A2B3C4D
+
+# Link type of Ethernet frames
+LINKTYPE_ETHERNET = 1
+
+
+@dataclass(kw_only=True)
+class StreamPacket:
+    """
+    A packet carried by an AXI4-Stream interface.
+
+    :param data:      Payload of the packet
+    :param axid:      TID of every beat
+    :param dest:      TDEST of every beat
+    :param user:      TUSER of the first beat (e.g. start of frame)
+    :param timestamp: Time of the packet in nanoseconds
+    """
+
+    data: bytes = b""
+    axid: int = 0
+    dest: int = 0
+    user: int = 0
+    timestamp: int = 0
+
+
+def packet_transfers(
+    packets: Iterable[StreamPacket], byte_width: int
+) -> Iterator[AXI4StreamTransfer]:
+    """
+    Lazily split packets into beats, setting TKEEP and TSTRB for the tail of
+    each packet and TLAST on its final beat (an empty packet is a single null
+    beat).
+
+    :param packets:    Packets to split
+    :param byte_width: Width of TDATA in bytes
+    :returns:          Iterator of transfers
+    """
+    full = (1 << byte_width) - 1
+    for packet in packets:
+        data = packet.data
+        for index, offset in enumerate(range(0, max(len(data), 1), byte_width)):
+            chunk = data[offset : offset + byte_width]
+            keep = full if len(chunk) == byte_width else ((1 << len(chunk)) - 1)
+            yield AXI4StreamTransfer(
+                index=index,
+                axid=packet.axid,
+                data=int.from_bytes(chunk, "little"),
+                strobe=keep,
+                keep=keep,
+                last=(offset + byte_width) >= len(data),
+                dest=packet.dest,
+                user=packet.user if index == 0 else 0,
+            )
+
+
+@contextlib.contextmanager
+def _map(path: Path) -> Iterator[bytes | mmap.mmap]:
+    # Empty files cannot be mapped
+    if path.stat().st_size == 0:
+        yield b""
+        return
+    with (
+        path.open("rb") as fh,
+        mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+    ):
+        yield mm
+
+
+class PcapSource:
+    """
+    Lazily reads packets from a pcap or pcapng capture, which is mapped into
+    memory rather than read so only the packets being driven are resident. The
+    file is re-opened each time it is iterated.
+
+    :param path: Path to the capture
+    :param axid: TID to assign to every packet
+    :param dest: TDEST to assign to every packet
+    """
+
+    def __init__(self, path: Path | str, axid: int = 0, dest: int = 0) -> None:
+        self.path = Path(path)
+        self.axid = axid
+        self.dest = dest
+
+    def __iter__(self) -> Iterator[StreamPacket]:
+        with _map(self.path) as mm:
+            if len(mm) >= 4 and int.from_bytes(mm[:4], "little") == PCAPNG_SHB:
+                yield from self._pcapng(mm)
+            else:
+                yield from self._pcap(mm)
+
+    def _pcap(self, mm: bytes | mmap.mmap) -> Iterator[StreamPacket]:
+        # The magic number reveals the byte order and timestamp resolution
+        order, magic = "<", None
+        for order in "<>" if len(mm) >= PCAP_HEADER.size else ():
+            (magic,) = struct.unpack_from(order + "I", mm, 0)
+            if magic in (PCAP_MAGIC_US, PCAP_MAGIC_NS):
+                break
+        if magic not in (PCAP_MAGIC_US, PCAP_MAGIC_NS):
+            raise Exception(f"{self.path} is not a pcap or pcapng capture")
+        scale = 1 if magic == PCAP_MAGIC_NS else 1000
+        record = struct.Struct(order + "IIII")
+        offset = PCAP_HEADER.size
+        while offset + record.size <= len(mm):
+            seconds, fraction, length, _ = record.unpack_from(mm, offset)
+            offset += record.size
+            yield StreamPacket(
+                data=mm[offset : offset + length],
+                axid=self.axid,
+                dest=self.dest,
+                timestamp=(seconds * 1_000_000_000) + (fraction * scale),
+            )
+            offset += length
+
+    def _pcapng(self, mm: bytes | mmap.mmap) -> Iterator[StreamPacket]:
+        order = "<"
+        # Nanoseconds per timestamp tick of each interface in the section
+        ticks: list[float] = []
+        offset = 0
+        while offset + 12 <= len(mm):
+            if int.from_bytes(mm[offset : offset + 4], "little") == PCAPNG_SHB:
+                (bom,) = struct.unpack_from("<I", mm, offset + 8)
+                order = "<" if bom == PCAPNG_BOM else ">"
+                ticks = []
+            kind, total = struct.unpack_from(order + "II", mm, offset)
+            body = offset + 8
+            if kind == PCAPNG_IDB:
+                ticks.append(self._resolution(mm, order, body + 8, offset + total - 4))
+            elif kind == PCAPNG_EPB:
+                iface, high, low, length, _ = struct.unpack_from(
+                    order + "IIIII", mm, body
+                )
+                yield StreamPacket(
+                    data=mm[body + 20 : body + 20 + length],
+                    axid=self.axid,
+                    dest=self.dest,
+                    timestamp=int(((high << 32) | low) * ticks[iface]),
+                )
+            elif kind == PCAPNG_SPB:
+                (length,) = struct.unpack_from(order + "I", mm, body)
+                length = min(length, total - 16)
+                yield StreamPacket(
+                    data=mm[body + 4 : body + 4 + length],
+                    axid=self.axid,
+                    dest=self.dest,
+                )
+            offset += total
+
+    @staticmethod
+    def _resolution(mm: bytes | mmap.mmap, order: str, offset: int, end: int) -> float:
+        # Microseconds unless an if_tsresol option is present
+        while offset + 4 <= end:
+            code, length = struct.unpack_from(order + "HH", mm, offset)
+            if code == 0:
+                break
+            if code == 9:
+                value = mm[offset + 4]
+                if value & 0x80:
+                    return 1e9 / (1 << (value & 0x7F))
+                return 1e9 / (10**value)
+            offset += 4 + ((length + 3) & ~3)
+        return 1000.0
+
+
+class RawFrameSource:
+    """
+    Lazily reads raw video frames (e.g. YUV) from a file, producing one packet
+    per line so that TLAST marks the end of each line and TUSER marks the first
+    line of each frame (as per the AXI4-Stream video convention).
+
+    :param path:       Path to the frame file
+    :param line_bytes: Number of bytes in each line
+    :param lines:      Number of lines in each frame
+    :param axid:       TID to assign to every line
+    :param dest:       TDEST to assign to every line
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        line_bytes: int,
+        lines: int,
+        axid: int = 0,
+        dest: int = 0,
+    ) -> None:
+        self.path = Path(path)
+        self.line_bytes = line_bytes
+        self.lines = lines
+        self.axid = axid
+        self.dest = dest
+
+    def __iter__(self) -> Iterator[StreamPacket]:
+        with _map(self.path) as mm:
+            if len(mm) % (self.line_bytes * self.lines):
+                raise Exception(
+                    f"{self.path} does not contain a whole number of "
+                    f"{self.line_bytes}x{self.lines} byte frames"
+                )
+            for line, offset in enumerate(range(0, len(mm), self.line_bytes)):
+                yield StreamPacket(
+                    data=mm[offset : offset + self.line_bytes],
+                    axid=self.axid,
+                    dest=self.dest,
+                    user=int((line % self.lines) == 0),
+                )
+
+
+class LengthPrefixedSource:
+    """
+    Lazily reads packets from a binary file where each packet is preceded by
+    its length in bytes.
+
+    :param path:      Path to the file
+    :param prefix:    Size of the length prefix in bytes
+    :param byteorder: Byte order of the length prefix
+    :param axid:      TID to assign to every packet
+    :param dest:      TDEST to assign to every packet
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        prefix: int = 4,
+        byteorder: str = "little",
+        axid: int = 0,
+        dest: int = 0,
+    ) -> None:
+        self.path = Path(path)
+        self.prefix = prefix
+        self.byteorder = byteorder
+        self.axid = axid
+        self.dest = dest
+
+    def __iter__(self) -> Iterator[StreamPacket]:
+        with _map(self.path) as mm:
+            offset = 0
+            while offset < len(mm):
+                start = offset + self.prefix
+                end = start + int.from_bytes(mm[offset:start], self.byteorder)
+                if end > len(mm):
+                    raise Exception(f"{self.path} is truncated at offset {offset}")
+                yield StreamPacket(data=mm[start:end], axid=self.axid, dest=self.dest)
+                offset = end
+
+
+class PacketSink(abc.ABC):
+    """
+    Reassembles packets from the transfers captured by an AXI4StreamMonitor and
+    writes them to a file for offline comparison. Beats are gathered separately
+    for each combination of TID and TDEST until TLAST, with only the bytes
+    enabled by TKEEP retained (where the interface has TKEEP). The file is
+    closed once the test completes. Providing a TDEST and/or TID restricts the
+    sink to a single route of the monitor. Subclasses define the file format by
+    implementing ``write``, writing any header once the file has been opened.
+
+    :param tb:      Handle to the testbench
+    :param monitor: The monitor to capture from
+    :param path:    Path of the file to write
+    :param name:    Name of the sink (used for logging)
+    :param dest:    Optional TDEST of the route to capture
+    :param axid:    Optional TID of the route to capture
+    """
+
+    def __init__(
+        self,
+        tb: BaseBench,
+        monitor: AXI4StreamMonitor,
+        path: Path | str,
+        name: str = "sink",
+        dest: int | None = None,
+        axid: int | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.log = tb.fork_log("packetsink", name)
+        self.packets = 0
+        self.strobe = ByteStrobe(monitor.io.width("tdata") // 8)
+        self.has_keep = monitor.io.has("tkeep")
+        # Packets being assembled, keyed by TID and TDEST
+        self._partial: dict[tuple[int, int], tuple[StreamPacket, bytearray]] = {}
+        self._fh = self.path.open("wb")
+        if dest is None and axid is None:
+            monitor.subscribe(MonitorEvent.CAPTURE, self._handle)
+        else:
+            monitor.subscribe_route(self._handle, dest=dest, axid=axid)
+        tb.add_teardown(self._teardown())
+
+    @abc.abstractmethod
+    def write(self, packet: StreamPacket) -> None:
+        """
+        Write a complete packet to the file.
+
+        :param packet: The packet
+        """
+
+    def _handle(self, component, event, obj) -> None:
+        if not isinstance(obj, AXI4StreamTransfer) or self._fh is None:
+            return
+        key = (obj.axid, obj.dest)
+        if (partial := self._partial.get(key, None)) is None:
+            partial = self._partial[key] = (
+                StreamPacket(axid=obj.axid, dest=obj.dest, user=obj.user),
+                bytearray(),
+            )
+        packet, data = partial
+        if self.has_keep:
+            data += self.strobe.select(obj.data, obj.keep)
+        else:
+            data += obj.data.to_bytes(self.strobe.byte_width, "little")
+        if obj.last:
+            del self._partial[key]
+            packet.data = bytes(data)
+            packet.timestamp = obj.timestamp
+            self.write(packet)
+            self.packets += 1
+
+    def close(self) -> None:
+        """Close the file, discarding any incomplete packets"""
+        if self._fh is None:
+            return
+        if self._partial:
+            self.log.warning(f"Discarding {len(self._partial)} incomplete packet(s)")
+        self._fh.close()
+        self._fh = None
+
+    async def _teardown(self) -> None:
+        self.close()
+        self.log.info(f"Wrote {self.packets} packet(s) to {self.path}")
+
+
+class PcapSink(PacketSink):
+    """
+    Writes captured packets to a pcap capture with nanosecond timestamps taken
+    from the simulation time of the final beat of each packet.
+
+    :param tb:       Handle to the testbench
+    :param monitor:  The monitor to capture from
+    :param path:     Path of the capture to write
+    :param name:     Name of the sink (used for logging)
+    :param linktype: Link type recorded in the capture
+    :param kwds:     Route to capture (see PacketSink)
+    """
+
+    def __init__(
+        self,
+        tb: BaseBench,
+        monitor: AXI4StreamMonitor,
+        path: Path | str,
+        name: str = "pcapsink",
+        linktype: int = LINKTYPE_ETHERNET,
+        **kwds,
+    ) -> None:
+        super().__init__(tb, monitor, path, name, **kwds)
+        self.linktype = linktype
+        self._fh.write(
+            PCAP_HEADER.pack(PCAP_MAGIC_NS, 2, 4, 0, 0, 0xFFFF_FFFF, self.linktype)
+        )
+
+    def write(self, packet: StreamPacket) -> None:
+        seconds, nanoseconds = divmod(int(packet.timestamp), 1_000_000_000)
+        length = len(packet.data)
+        self._fh.write(PCAP_RECORD.pack(seconds, nanoseconds, length, length))
+        self._fh.write(packet.data)
+
+
+class RawFrameSink(PacketSink):
+    """
+    Writes the payload of captured packets back to back, reproducing the layout
+    read by RawFrameSource.
+    """
+
+    def write(self, packet: StreamPacket) -> None:
+        self._fh.write(packet.data)
+
+
+class LengthPrefixedSink(PacketSink):
+    """
+    Writes captured packets with each preceded by its length in bytes,
+    reproducing the layout read by LengthPrefixedSource.
+
+    :param tb:        Handle to the testbench
+    :param monitor:   The monitor to capture from
+    :param path:      Path of the file to write
+    :param name:      Name of the sink (used for logging)
+    :param prefix:    Size of the length prefix in bytes
+    :param byteorder: Byte order of the length prefix
+    :param kwds:      Route to capture (see PacketSink)
+    """
+
+    def __init__(
+        self,
+        tb: BaseBench,
+        monitor: AXI4StreamMonitor,
+        path: Path | str,
+        name: str = "lpsink",
+        prefix: int = 4,
+        byteorder: str = "little",
+        **kwds,
+    ) -> None:
+        self.prefix = prefix
+        self.byteorder = byteorder
+        super().__init__(tb, monitor, path, name, **kwds)
+
+    def write(self, packet: StreamPacket) -> None:
+        self._fh.write(len(packet.data).to_bytes(self.prefix, self.byteorder))
+        self._fh.write(packet.data)
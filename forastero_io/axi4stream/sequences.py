@@ -5,13 +5,15 @@ import forastero
 from forastero.driver import DriverEvent
 from forastero.sequence import SeqContext, SeqProxy
 
+from ..common.feed import Source, feed_driver
+from .initiator import AXI4StreamInitiator
 from .target import AXI4StreamTarget
 from .transaction import AXI4StreamBackpressure
 
 
 @forastero.sequence(auto_lock=True)
 @forastero.requires("driver", AXI4StreamTarget)
-async def axi4stream_backpressure(
+async def axi4stream_backpressure_seq(
     ctx: SeqContext,
     driver: SeqProxy[AXI4StreamTarget],
     min_interval: int = 1,
@@ -28,3 +30,23 @@ async def axi4stream_backpressure(
             )
         )
         await driver.wait_for(DriverEvent.PRE_DRIVE)
+
+
+@forastero.sequence(auto_lock=True)
+@forastero.requires("driver", AXI4StreamInitiator)
+async def axi4stream_feed_seq(
+    ctx: SeqContext,
+    driver: SeqProxy[AXI4StreamInitiator],
+    source: Source,
+    high: int = 16,
+    low: int | None = None,
+):
+    """
+    Drive transfers drawn lazily from an iterable or asynchronous iterable, with
+    no more than the high watermark queued ahead of the driver at any time.
+
+    :param source: AXI4StreamTransfer objects to drive
+    :param high:   Maximum number of transfers queued ahead of the driver
+    :param low:    Number of queued transfers at which drawing resumes
+    """
+    await feed_driver(driver, source, high=high, low=low)
@@ -0,0 +1,18 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+from .sim import MockBench, MockDUT, MockSignal, MockSimulator
+from .suite import BENCHMARKS, BenchmarkResult, benchmark, run_benchmark
+
+assert all(
+    (
+        MockBench,
+        MockDUT,
+        MockSignal,
+        MockSimulator,
+        BENCHMARKS,
+        BenchmarkResult,
+        benchmark,
+        run_benchmark,
+    )
+)
@@ -0,0 +1,63 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+import argparse
+import fnmatch
+import sys
+
+from tabulate import tabulate
+
+from .suite import BENCHMARKS, run_benchmark
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m forastero_io.benchmark",
+        description="Measure the Python cost of drivers, monitors, and models",
+    )
+    parser.add_argument(
+        "patterns", nargs="*", default=["*"], help="Glob patterns of benchmarks"
+    )
+    parser.add_argument("--beats", type=int, default=100_000, help="Beats to run")
+    parser.add_argument("--list", action="store_true", help="List the benchmarks")
+    args = parser.parse_args()
+    names = [x for x in BENCHMARKS if any(fnmatch.fnmatch(x, y) for y in args.patterns)]
+    if args.list:
+        print("\n".join(names))
+        return 0
+    if not names:
+        print(f"No benchmarks match {' '.join(args.patterns)}", file=sys.stderr)
+        return 1
+    rows = []
+    for name in names:
+        result = run_benchmark(name, beats=args.beats)
+        rows.append(
+            (
+                name,
+                result.beats,
+                f"{result.beats_per_second:,.0f}",
+                f"{result.wakeups_per_beat:.2f}",
+                f"{result.blocks_per_beat:.2f}",
+                f"{1000 * result.gc:.1f}",
+            )
+        )
+    print(
+        tabulate(
+            rows,
+            headers=[
+                "Benchmark",
+                "Beats",
+                "Beats/s",
+                "Wakeups/beat",
+                "Blocks/beat",
+                "GC (ms)",
+            ],
+            tablefmt="simple",
+            disable_numparse=True,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
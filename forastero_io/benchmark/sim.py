@@ -0,0 +1,249 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+import contextlib
+import logging
+import sys
+from collections.abc import Callable, Coroutine, Iterator
+from random import Random
+from types import ModuleType
+from typing import Any
+
+import cocotb
+from forastero.bench import BaseBench
+from forastero.component import Component
+
+
+class MockSignal:
+    """
+    Pure-Python stand-in for a cocotb signal handle, holding an integer value.
+
+    :param name:  Name of the signal
+    :param width: Width of the signal in bits
+    """
+
+    def __init__(self, name: str, width: int = 1) -> None:
+        self._name = name
+        self._width = width
+        self._range = None
+        self.value = 0
+
+    def __len__(self) -> int:
+        return self._width
+
+    def __repr__(self) -> str:
+        return f"<MockSignal {self._name}[{self._width}]>"
+
+
+class MockDUT:
+    """
+    Stand-in for the DUT boundary, creating a MockSignal for each signal that is
+    requested and listed in the provided widths. Signals are looked up using the
+    final part of their name (e.g. 'tdata' for 'i_stream_tdata'), any signal not
+    listed is reported as missing.
+
+    :param widths: Mapping from signal component name to width in bits
+    """
+
+    def __init__(self, widths: dict[str, int]) -> None:
+        self._widths = widths
+
+    def __getattr__(self, name: str) -> MockSignal:
+        component = name.rsplit("_", 1)[-1]
+        if name.startswith("_") or component not in self._widths:
+            raise AttributeError(name)
+        signal = MockSignal(name, self._widths[component])
+        setattr(self, name, signal)
+        return signal
+
+
+class MockBench(BaseBench):
+    """
+    Minimal stand-in for a testbench, providing the attributes used when
+    constructing components and models without a simulator.
+
+    :param seed: Seed for the random number generator
+    """
+
+    def __init__(self, seed: int = 0) -> None:
+        self.random = Random(seed)
+
+    def fork_log(self, *names: str) -> logging.Logger:
+        return logging.getLogger(".".join(("tb", *names)))
+
+    def add_teardown(self, coro: Coroutine) -> None:
+        coro.close()
+
+
+class MockTrigger:
+    """
+    Awaitable standing in for a cocotb trigger, resuming the awaiting coroutine
+    after a number of clock cycles.
+
+    :param cycles: Number of cycles to wait
+    """
+
+    __slots__ = ("cycles",)
+
+    def __init__(self, cycles: int) -> None:
+        self.cycles = cycles
+
+    def __await__(self):
+        if self.cycles > 0:
+            yield self
+
+
+class MockSimulator:
+    """
+    Lightweight pure-Python scheduler with a single clock, used to run the hot
+    loops of drivers, monitors, and models without an HDL simulator. Modules are
+    patched so that RisingEdge, FallingEdge, ClockCycles, and get_sim_time are
+    served by the mock scheduler - every coroutine waiting on an edge is resumed
+    once per cycle.
+
+    :param period_ns: Period of the clock in nanoseconds
+    """
+
+    TRIGGERS = ("RisingEdge", "FallingEdge", "ClockCycles", "get_sim_time")
+
+    def __init__(self, period_ns: int = 10) -> None:
+        self.period_ns = period_ns
+        self.cycle = 0
+        self.wakeups = 0
+        self.clk = MockSignal("clk")
+        self.rst = MockSignal("rst")
+        # Coroutines and the cycle they are next due to be resumed on
+        self._tasks: list[tuple[int, Coroutine]] = []
+        # Whether to sample allocated memory blocks around each resume
+        self.count_blocks = False
+        self.blocks = 0
+
+    # ==========================================================================
+    # Trigger stand-ins
+    # ==========================================================================
+
+    @staticmethod
+    def rising_edge(signal: Any = None) -> MockTrigger:
+        del signal
+        return MockTrigger(1)
+
+    falling_edge = rising_edge
+
+    @staticmethod
+    def clock_cycles(signal: Any, cycles: int, rising: bool = True) -> MockTrigger:
+        del signal, rising
+        return MockTrigger(cycles)
+
+    def get_sim_time(self, units: str = "ns") -> float:
+        del units
+        return self.cycle * self.period_ns
+
+    @contextlib.contextmanager
+    def patch(self, *modules: ModuleType | str) -> Iterator[None]:
+        """
+        Patch the triggers used by one or more modules so that they are served
+        by the mock scheduler, restoring the originals on exit.
+
+        :param modules: Modules (or module names) to patch
+        """
+        replacements = {
+            "RisingEdge": self.rising_edge,
+            "FallingEdge": self.falling_edge,
+            "ClockCycles": self.clock_cycles,
+            "get_sim_time": self.get_sim_time,
+        }
+        originals = []
+        for module in modules:
+            if isinstance(module, str):
+                module = sys.modules[module]
+            for name, replacement in replacements.items():
+                if hasattr(module, name):
+                    originals.append((module, name, getattr(module, name)))
+                    setattr(module, name, replacement)
+        try:
+            yield
+        finally:
+            for module, name, original in originals:
+                setattr(module, name, original)
+
+    @contextlib.contextmanager
+    def construct(self) -> Iterator[None]:
+        """
+        Allow components to be constructed without a simulator, discarding the
+        coroutines they attempt to start and deregistering them afterwards.
+        """
+        original = cocotb.start_soon
+        cocotb.start_soon = lambda coro: coro.close()
+        count = len(Component.COMPONENTS)
+        try:
+            yield
+        finally:
+            cocotb.start_soon = original
+            del Component.COMPONENTS[count:]
+
+    def component(self, cls: type[Component], io: Any, **kwds) -> Component:
+        """
+        Construct a driver or monitor attached to the mock clock and reset.
+
+        :param cls: The component class
+        :param io:  The I/O the component is attached to
+        :returns:   The constructed component
+        """
+        with self.construct():
+            return cls(MockBench(), io, self.clk, self.rst, **kwds)
+
+    # ==========================================================================
+    # Scheduling
+    # ==========================================================================
+
+    def start(self, coro: Coroutine) -> None:
+        """
+        Start a coroutine, running it until it first waits on a trigger.
+
+        :param coro: The coroutine to start
+        """
+        self._resume(coro)
+
+    def _resume(self, coro: Coroutine) -> None:
+        self.wakeups += 1
+        if self.count_blocks:
+            before = sys.getallocatedblocks()
+        try:
+            trigger = coro.send(None)
+        except StopIteration:
+            return
+        finally:
+            if self.count_blocks:
+                self.blocks += max(0, sys.getallocatedblocks() - before)
+        self._tasks.append((self.cycle + trigger.cycles, coro))
+
+    def run(
+        self,
+        until: Callable[[], bool],
+        on_cycle: Callable[[int], None] | None = None,
+        max_cycles: int = 1 << 32,
+    ) -> None:
+        """
+        Advance the clock until a condition is met or no coroutines remain.
+
+        :param until:      Condition checked at the end of every cycle
+        :param on_cycle:   Optional callback invoked at each rising edge before
+                           any coroutines are resumed (e.g. to model the DUT)
+        :param max_cycles: Maximum number of cycles to run for
+        """
+        for _ in range(max_cycles):
+            if until() or not self._tasks:
+                return
+            self.cycle += 1
+            if on_cycle is not None:
+                on_cycle(self.cycle)
+            due = [x for x in self._tasks if x[0] <= self.cycle]
+            self._tasks = [x for x in self._tasks if x[0] > self.cycle]
+            for _, coro in due:
+                self._resume(coro)
+
+    def close(self) -> None:
+        """Close all coroutines that are still waiting"""
+        for _, coro in self._tasks:
+            coro.close()
+        self._tasks.clear()
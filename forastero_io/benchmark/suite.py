@@ -0,0 +1,551 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+import functools
+import gc
+import itertools
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from forastero.io import IORole
+from forastero.monitor import MonitorEvent
+
+from ..axi4 import (
+    AXI4Crossbar,
+    AXI4MemoryModel,
+    AXI4ReadAddress,
+    AXI4ReadAddressIO,
+    AXI4ReadAddressMonitor,
+    AXI4ReadBurstResponse,
+    AXI4ReadResponseInitiator,
+    AXI4ReadResponseIO,
+    AXI4ReadResponseMonitor,
+    AXI4WriteAddress,
+    AXI4WriteAddressIO,
+    AXI4WriteAddressMonitor,
+    AXI4WriteData,
+    AXI4WriteDataIO,
+    AXI4WriteDataMonitor,
+    AXI4WriteResponseInitiator,
+    AXI4WriteResponseIO,
+)
+from ..axi4.common import Burst
+from ..axi4stream import AXI4StreamInitiator, AXI4StreamIO, AXI4StreamMonitor
+from ..axi4stream.transaction import AXI4StreamTransfer
+from ..common.memory import SharedMemory
+from ..mapped import MappedRequestIO, MappedRequestMonitor
+from ..stream import (
+    StreamDataValid,
+    StreamInitiatorDriver,
+    StreamIO,
+    StreamResponderMonitor,
+)
+from ..strobe import StrobeDriver, StrobeEvent, StrobeIO, StrobeMonitor, StrobeTrain
+from .sim import MockBench, MockDUT, MockSimulator
+
+# Widths of the signals of each interface
+AXI4_WIDTHS = {
+    **dict.fromkeys(("awid", "arid", "bid", "rid"), 4),
+    **dict.fromkeys(("awaddr", "araddr"), 32),
+    **dict.fromkeys(("awlen", "arlen", "wstrb"), 8),
+    **dict.fromkeys(("awsize", "arsize"), 3),
+    **dict.fromkeys(("awburst", "arburst", "bresp", "rresp"), 2),
+    **dict.fromkeys(("wdata", "rdata"), 64),
+    **dict.fromkeys(("wlast", "rlast"), 1),
+    **dict.fromkeys(("awvalid", "wvalid", "bvalid", "arvalid", "rvalid"), 1),
+    **dict.fromkeys(("awready", "wready", "bready", "arready", "rready"), 1),
+}
+AXI4STREAM_WIDTHS = {
+    "tid": 4,
+    "tdata": 64,
+    "tstrb": 8,
+    "tkeep": 8,
+    "tlast": 1,
+    "tdest": 4,
+    "tvalid": 1,
+    "tready": 1,
+}
+MAPPED_WIDTHS = {
+    "id": 4,
+    "addr": 32,
+    "data": 64,
+    "strobe": 8,
+    "write": 1,
+    "valid": 1,
+    "ready": 1,
+}
+STREAM_WIDTHS = {"data": 64, "valid": 1, "ready": 1}
+STROBE_WIDTHS = {"data": 32, "strobe": 1}
+
+# Modules that are patched for every benchmark (for transaction timestamps)
+COMMON_MODULES = ("forastero.transaction",)
+
+
+@dataclass
+class Benchmark:
+    """
+    A single benchmark, where the setup function constructs the components
+    under test on the mock simulator and returns a function reporting how many
+    beats have been completed (along with an optional per-cycle callback that
+    models the DUT).
+
+    :param name:    Name of the benchmark
+    :param setup:   Setup function taking the simulator and number of beats
+    :param modules: Names of the modules whose triggers must be patched
+    """
+
+    name: str
+    setup: Callable[
+        [MockSimulator, int],
+        tuple[Callable[[], int], Callable[[int], None] | None],
+    ]
+    modules: tuple[str, ...]
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Measurements from running a benchmark.
+
+    :param name:    Name of the benchmark
+    :param beats:   Number of beats completed
+    :param seconds: Wall-clock time taken to complete the beats
+    :param wakeups: Number of times a coroutine was resumed
+    :param blocks:  Number of memory blocks allocated (and still held) across
+                    each resume of a coroutine, summed over all resumes
+    :param gc:      Wall-clock time spent in garbage collection
+    """
+
+    name: str
+    beats: int
+    seconds: float
+    wakeups: int
+    blocks: int
+    gc: float = 0.0
+
+    @property
+    def beats_per_second(self) -> float:
+        return self.beats / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def wakeups_per_beat(self) -> float:
+        return self.wakeups / self.beats if self.beats else 0.0
+
+    @property
+    def blocks_per_beat(self) -> float:
+        return self.blocks / self.beats if self.beats else 0.0
+
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, *modules: str, **options) -> Callable:
+    """
+    Decorator registering a benchmark setup function, which may be applied more
+    than once to register variants of a benchmark with different options.
+
+    :param name:    Name of the benchmark
+    :param modules: Names of the modules whose triggers must be patched
+    :param options: Keyword arguments passed to the setup function
+    """
+
+    def _inner(setup: Callable) -> Callable:
+        BENCHMARKS[name] = Benchmark(
+            name,
+            functools.partial(setup, **options) if options else setup,
+            (*COMMON_MODULES, *modules),
+        )
+        return setup
+
+    return _inner
+
+
+def _measure(bench: Benchmark, beats: int, count_blocks: bool) -> BenchmarkResult:
+    sim = MockSimulator()
+    sim.count_blocks = count_blocks
+    # Accumulate time spent in garbage collection
+    collect = [0.0, 0.0]
+
+    def _on_gc(phase: str, info: dict) -> None:
+        if phase == "start":
+            collect[1] = time.perf_counter()
+        else:
+            collect[0] += time.perf_counter() - collect[1]
+
+    with sim.patch(*bench.modules):
+        progress, on_cycle = bench.setup(sim, beats)
+        gc.collect()
+        gc.callbacks.append(_on_gc)
+        try:
+            start = time.perf_counter()
+            sim.run(lambda: progress() >= beats, on_cycle)
+            seconds = time.perf_counter() - start
+        finally:
+            gc.callbacks.remove(_on_gc)
+        sim.close()
+    return BenchmarkResult(
+        bench.name, progress(), seconds, sim.wakeups, sim.blocks, collect[0]
+    )
+
+
+def run_benchmark(name: str, beats: int = 100_000) -> BenchmarkResult:
+    """
+    Run a single benchmark, timing a first pass and then counting allocated
+    memory blocks in a second pass (as sampling allocations slows execution).
+
+    :param name:  Name of the benchmark
+    :param beats: Number of beats to run for
+    :returns:     Measurements from the benchmark
+    """
+    bench = BENCHMARKS[name]
+    result = _measure(bench, beats, False)
+    result.blocks = _measure(bench, beats, True).blocks
+    return result
+
+
+# ==============================================================================
+# Drivers
+# ==============================================================================
+
+
+@benchmark("axi4stream.initiator", "forastero_io.axi4stream.initiator")
+def _axi4stream_initiator(sim: MockSimulator, beats: int):
+    dut = MockDUT(AXI4STREAM_WIDTHS)
+    drv = sim.component(
+        AXI4StreamInitiator, AXI4StreamIO(dut, "stream", IORole.INITIATOR)
+    )
+    drv.io.set("tready", 1)
+    done = [0]
+
+    async def _feed():
+        for idx in range(beats):
+            await drv.drive(AXI4StreamTransfer(data=idx, last=(idx % 16) == 15))
+            done[0] += 1
+
+    sim.start(_feed())
+    return (lambda: done[0]), None
+
+
+@benchmark("axi4.read_response_initiator", "forastero_io.axi4.initiator")
+def _axi4_read_response_initiator(sim: MockSimulator, beats: int):
+    dut = MockDUT(AXI4_WIDTHS)
+    drv = sim.component(
+        AXI4ReadResponseInitiator, AXI4ReadResponseIO(dut, "axi", IORole.RESPONDER)
+    )
+    drv.io.set("rready", 1)
+    done = [0]
+
+    async def _feed():
+        for idx in range(0, beats, 16):
+            await drv.drive(AXI4ReadBurstResponse(data=list(range(idx, idx + 16))))
+            done[0] += 16
+
+    sim.start(_feed())
+    return (lambda: done[0]), None
+
+
+@benchmark("stream.initiator", "forastero_io.stream.initiator")
+def _stream_initiator(sim: MockSimulator, beats: int):
+    dut = MockDUT(STREAM_WIDTHS)
+    drv = sim.component(
+        StreamInitiatorDriver, StreamIO(dut, "stream", IORole.INITIATOR)
+    )
+    drv.io.set("ready", 1)
+    done = [0]
+
+    async def _feed():
+        for idx in range(beats):
+            await drv.drive(StreamDataValid(data=idx))
+            done[0] += 1
+
+    sim.start(_feed())
+    return (lambda: done[0]), None
+
+
+@benchmark("strobe.driver", "forastero_io.strobe.requestor")
+def _strobe_driver(sim: MockSimulator, beats: int):
+    dut = MockDUT(STROBE_WIDTHS)
+    drv = sim.component(StrobeDriver, StrobeIO(dut, "event", IORole.INITIATOR))
+    done = [0]
+
+    async def _feed():
+        for idx in range(beats):
+            await drv.drive(StrobeEvent(data=idx))
+            done[0] += 1
+
+    sim.start(_feed())
+    return (lambda: done[0]), None
+
+
+@benchmark("strobe.driver_train", "forastero_io.strobe.requestor")
+def _strobe_driver_train(sim: MockSimulator, beats: int):
+    dut = MockDUT(STROBE_WIDTHS)
+    drv = sim.component(StrobeDriver, StrobeIO(dut, "event", IORole.INITIATOR))
+    done = [0]
+
+    async def _feed():
+        await drv.drive(StrobeTrain(data=range(beats)))
+        done[0] = beats
+
+    sim.start(_feed())
+    # Count beats as they are presented, as the train is a single transaction
+    return (lambda: max(done[0], sim.cycle)), None
+
+
+# ==============================================================================
+# Monitors
+# ==============================================================================
+
+
+def _monitor(sim: MockSimulator, cls: type, io, **kwds) -> Callable[[], int]:
+    mon = sim.component(cls, io, **kwds)
+    captured = [0]
+
+    def _capture(obj) -> None:
+        del obj
+        captured[0] += 1
+
+    sim.start(mon.monitor(_capture))
+    return lambda: captured[0]
+
+
+@benchmark("axi4stream.monitor", "forastero_io.axi4stream.monitor")
+def _axi4stream_monitor(sim: MockSimulator, beats: int):
+    io = AXI4StreamIO(MockDUT(AXI4STREAM_WIDTHS), "stream", IORole.RESPONDER)
+    io.set("tvalid", 1)
+    io.set("tready", 1)
+
+    def _on_cycle(cycle: int) -> None:
+        io.set("tdata", cycle)
+        io.set("tlast", (cycle % 16) == 0)
+
+    return _monitor(sim, AXI4StreamMonitor, io), _on_cycle
+
+
+@benchmark("axi4stream.monitor.filtered", "forastero_io.axi4stream.monitor")
+@benchmark("axi4stream.monitor.routed", "forastero_io.axi4stream.monitor", routed=True)
+def _axi4stream_monitor_routes(sim: MockSimulator, beats: int, routed: bool = False):
+    io = AXI4StreamIO(MockDUT(AXI4STREAM_WIDTHS), "stream", IORole.RESPONDER)
+    io.set("tvalid", 1)
+    io.set("tready", 1)
+    mon = sim.component(AXI4StreamMonitor, io)
+    routes = 1 << AXI4STREAM_WIDTHS["tdest"]
+    captured = [0]
+
+    # One subscriber per TDEST, each filtering on its own route
+    def _subscriber(dest: int) -> Callable:
+        def _capture(component, event, obj) -> None:
+            if obj.dest == dest:
+                captured[0] += 1
+
+        return _capture
+
+    for dest in range(routes):
+        if routed:
+            mon.subscribe_route(_subscriber(dest), dest=dest)
+        else:
+            mon.subscribe(MonitorEvent.CAPTURE, _subscriber(dest))
+
+    def _on_cycle(cycle: int) -> None:
+        io.set("tdata", cycle)
+        io.set("tdest", cycle % routes)
+        io.set("tlast", 1)
+
+    sim.start(mon.monitor(lambda obj: mon.publish(MonitorEvent.CAPTURE, obj)))
+    return (lambda: captured[0]), _on_cycle
+
+
+@benchmark("axi4.read_response_monitor", "forastero_io.axi4.monitor")
+def _axi4_read_response_monitor(sim: MockSimulator, beats: int):
+    io = AXI4ReadResponseIO(MockDUT(AXI4_WIDTHS), "axi", IORole.INITIATOR)
+    io.set("rvalid", 1)
+    io.set("rready", 1)
+
+    def _on_cycle(cycle: int) -> None:
+        io.set("rdata", cycle)
+        io.set("rlast", (cycle % 16) == 0)
+
+    return _monitor(sim, AXI4ReadResponseMonitor, io), _on_cycle
+
+
+@benchmark("axi4.write_data_monitor", "forastero_io.axi4.monitor")
+def _axi4_write_data_monitor(sim: MockSimulator, beats: int):
+    io = AXI4WriteDataIO(MockDUT(AXI4_WIDTHS), "axi", IORole.RESPONDER)
+    io.set("wvalid", 1)
+    io.set("wready", 1)
+    io.set("wstrb", 0xFF)
+
+    def _on_cycle(cycle: int) -> None:
+        io.set("wdata", cycle)
+        io.set("wlast", (cycle % 16) == 0)
+
+    return _monitor(sim, AXI4WriteDataMonitor, io), _on_cycle
+
+
+@benchmark("mapped.request_monitor", "forastero_io.mapped.request")
+def _mapped_request_monitor(sim: MockSimulator, beats: int):
+    io = MappedRequestIO(MockDUT(MAPPED_WIDTHS), "req", IORole.RESPONDER)
+    io.set("valid", 1)
+    io.set("ready", 1)
+
+    def _on_cycle(cycle: int) -> None:
+        io.set("addr", cycle << 3)
+        io.set("data", cycle)
+        io.set("write", cycle & 1)
+
+    return _monitor(sim, MappedRequestMonitor, io), _on_cycle
+
+
+@benchmark("stream.responder_monitor", "forastero_io.stream.responder")
+def _stream_responder_monitor(sim: MockSimulator, beats: int):
+    io = StreamIO(MockDUT(STREAM_WIDTHS), "stream", IORole.RESPONDER)
+    io.set("valid", 1)
+    io.set("ready", 1)
+
+    def _on_cycle(cycle: int) -> None:
+        io.set("data", cycle)
+
+    return _monitor(sim, StreamResponderMonitor, io), _on_cycle
+
+
+@benchmark("strobe.monitor", "forastero_io.strobe.requestor")
+def _strobe_monitor(sim: MockSimulator, beats: int):
+    io = StrobeIO(MockDUT(STROBE_WIDTHS), "event", IORole.RESPONDER)
+    io.set("strobe", 1)
+
+    def _on_cycle(cycle: int) -> None:
+        io.set("data", cycle)
+
+    return _monitor(sim, StrobeMonitor, io), _on_cycle
+
+
+# ==============================================================================
+# Models
+# ==============================================================================
+
+
+@benchmark("axi4.memory_model", "forastero_io.axi4.memory")
+def _axi4_memory_model(sim: MockSimulator, beats: int):
+    dut = MockDUT(AXI4_WIDTHS)
+    awmon = sim.component(
+        AXI4WriteAddressMonitor, AXI4WriteAddressIO(dut, "axi", IORole.RESPONDER)
+    )
+    wmon = sim.component(
+        AXI4WriteDataMonitor, AXI4WriteDataIO(dut, "axi", IORole.RESPONDER)
+    )
+    armon = sim.component(
+        AXI4ReadAddressMonitor, AXI4ReadAddressIO(dut, "axi", IORole.RESPONDER)
+    )
+    brsp = sim.component(
+        AXI4WriteResponseInitiator, AXI4WriteResponseIO(dut, "axi", IORole.RESPONDER)
+    )
+    rrsp = sim.component(
+        AXI4ReadResponseInitiator, AXI4ReadResponseIO(dut, "axi", IORole.RESPONDER)
+    )
+    # Discard responses rather than queueing them for the drivers
+    brsp.enqueue = rrsp.enqueue = lambda obj: None
+    with sim.construct():
+        model = AXI4MemoryModel(
+            MockBench(),
+            awmon,
+            wmon,
+            armon,
+            brsp,
+            rrsp,
+            error_noninit=False,
+            rand_noninit=False,
+        )
+    done = [0]
+
+    async def _feed():
+        # Alternate between 16 beat write and read bursts, one per cycle
+        for idx in range(0, beats, 32):
+            address = (idx * 8) & 0xFFFF_FFFF
+            model._handle(
+                awmon,
+                None,
+                AXI4WriteAddress(address=address, length=15, burst=Burst.INCR),
+            )
+            for beat in range(16):
+                model._handle(
+                    wmon,
+                    None,
+                    AXI4WriteData(data=idx + beat, strobe=0xFF, last=beat == 15),
+                )
+            model._handle(
+                armon,
+                None,
+                AXI4ReadAddress(address=address, length=15, burst=Burst.INCR),
+            )
+            done[0] += 32
+            await sim.rising_edge()
+
+    sim.start(_feed())
+    return (lambda: done[0]), None
+
+
+@benchmark("axi4.crossbar", "forastero_io.axi4.crossbar")
+def _axi4_crossbar(sim: MockSimulator, beats: int):
+    managers = []
+    for _ in range(2):
+        dut = MockDUT(AXI4_WIDTHS)
+        ports = [
+            sim.component(cls, io(dut, "axi", IORole.RESPONDER))
+            for cls, io in (
+                (AXI4WriteAddressMonitor, AXI4WriteAddressIO),
+                (AXI4WriteDataMonitor, AXI4WriteDataIO),
+                (AXI4ReadAddressMonitor, AXI4ReadAddressIO),
+                (AXI4WriteResponseInitiator, AXI4WriteResponseIO),
+                (AXI4ReadResponseInitiator, AXI4ReadResponseIO),
+            )
+        ]
+        # Discard responses rather than queueing them for the drivers
+        ports[3].enqueue = ports[4].enqueue = lambda obj: None
+        managers.append(ports)
+    with sim.construct():
+        xbar = AXI4Crossbar(MockBench())
+        for ports in managers:
+            xbar.add_manager(*ports)
+        for idx in range(4):
+            store = SharedMemory(
+                MockBench(), 8, error_noninit=False, rand_noninit=False
+            )
+            xbar.add_subordinate(idx << 16, 1 << 16, store)
+    done = [0]
+
+    async def _feed():
+        # Each manager issues a 16 beat write and read burst every 16 cycles,
+        # spread across the subordinates so that they sometimes contend
+        for cycle in itertools.count():
+            if (cycle % 16) == 0:
+                for index, (awmon, wmon, armon, *_) in enumerate(managers):
+                    address = ((cycle * (index + 3)) << 4) & 0x3_FFF8
+                    xbar._handle(
+                        index,
+                        awmon,
+                        AXI4WriteAddress(
+                            address=address, length=15, size=3, burst=Burst.INCR
+                        ),
+                    )
+                    for beat in range(16):
+                        xbar._handle(
+                            index,
+                            wmon,
+                            AXI4WriteData(
+                                data=cycle + beat, strobe=0xFF, last=beat == 15
+                            ),
+                        )
+                    xbar._handle(
+                        index,
+                        armon,
+                        AXI4ReadAddress(
+                            address=address, length=15, size=3, burst=Burst.INCR
+                        ),
+                    )
+                    done[0] += 32
+            xbar._step()
+            await sim.rising_edge()
+
+    sim.start(_feed())
+    return (lambda: done[0]), None
@@ -0,0 +1,17 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+from .axi4 import AXI4ToAXI4LiteBridge
+from .axi4lite import AXI4LiteToApbBridge
+from .common import BaseBridge
+from .mapped import MappedToAXI4LiteBridge
+
+# Guard
+assert all(
+    (
+        AXI4LiteToApbBridge,
+        AXI4ToAXI4LiteBridge,
+        BaseBridge,
+        MappedToAXI4LiteBridge,
+    )
+)
@@ -0,0 +1,177 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+from collections import deque
+
+from forastero.bench import BaseBench
+from forastero.monitor import MonitorEvent
+
+from ..axi4.crossbar import beat_addresses
+from ..axi4.initiator import AXI4ReadResponseInitiator, AXI4WriteResponseInitiator
+from ..axi4.monitor import (
+    AXI4ReadAddressMonitor,
+    AXI4WriteAddressMonitor,
+    AXI4WriteDataMonitor,
+)
+from ..axi4.transaction import (
+    AXI4ReadAddress,
+    AXI4ReadBurstResponse,
+    AXI4WriteAddress,
+    AXI4WriteData,
+    AXI4WriteResponse,
+)
+from ..axi4lite.initiator import (
+    AXI4LiteReadAddressInitiator,
+    AXI4LiteWriteAddressInitiator,
+    AXI4LiteWriteDataInitiator,
+)
+from ..axi4lite.monitor import AXI4LiteReadResponseMonitor, AXI4LiteWriteResponseMonitor
+from ..axi4lite.transaction import (
+    AXI4LiteReadAddress,
+    AXI4LiteReadResponse,
+    AXI4LiteWriteAddress,
+    AXI4LiteWriteData,
+    AXI4LiteWriteResponse,
+)
+from .common import BaseBridge
+
+
+class AXI4ToAXI4LiteBridge(BaseBridge):
+    """
+    Bridge from an AXI4 port to an AXI4-Lite port of the same data width, with
+    every beat of an AXI4 burst issued as a separate AXI4-Lite access. The write
+    response of a burst carries the worst response of its beats, while a read
+    burst is returned as an AXI4ReadBurstResponse once all of its beats have
+    been read.
+
+    :param tb:              Handle to the testbench
+    :param awreq:           Monitor for the AXI4 write address channel
+    :param wreq:            Monitor for the AXI4 write data channel
+    :param arreq:           Monitor for the AXI4 read address channel
+    :param brsp:            Initiator for the AXI4 write response channel
+    :param rrsp:            Initiator for the AXI4 read response channel
+    :param awdrv:           Initiator for the AXI4-Lite write address channel
+    :param wdrv:            Initiator for the AXI4-Lite write data channel
+    :param ardrv:           Initiator for the AXI4-Lite read address channel
+    :param bmon:            Monitor for the AXI4-Lite write response channel
+    :param rmon:            Monitor for the AXI4-Lite read response channel
+    :param name:            Name of the bridge (used for logging)
+    :param max_outstanding: Maximum number of AXI4-Lite accesses awaiting a
+                            response (0 disables the limit)
+    """
+
+    def __init__(
+        self,
+        tb: BaseBench,
+        awreq: AXI4WriteAddressMonitor,
+        wreq: AXI4WriteDataMonitor,
+        arreq: AXI4ReadAddressMonitor,
+        brsp: AXI4WriteResponseInitiator,
+        rrsp: AXI4ReadResponseInitiator,
+        awdrv: AXI4LiteWriteAddressInitiator,
+        wdrv: AXI4LiteWriteDataInitiator,
+        ardrv: AXI4LiteReadAddressInitiator,
+        bmon: AXI4LiteWriteResponseMonitor,
+        rmon: AXI4LiteReadResponseMonitor,
+        name: str = "axi4_to_axi4lite",
+        max_outstanding: int = 0,
+    ) -> None:
+        super().__init__(tb, name, max_outstanding)
+        # Sanity checks
+        assert wreq.io.width("wdata") == wdrv.io.width(
+            "wdata"
+        ), "AXI4 and AXI4-Lite data widths must match"
+        # Hold references
+        self.brsp = brsp
+        self.rrsp = rrsp
+        self.awdrv = awdrv
+        self.wdrv = wdrv
+        self.ardrv = ardrv
+        # Write bursts waiting for data, as the address, the response under
+        # construction, the address of each beat, and the index of the next beat
+        self._aw_nodata: deque[list] = deque()
+        # Write data beats waiting for an address
+        self._w_noaddr: deque[AXI4WriteData] = deque()
+        # Responses under construction for each AXI4-Lite access in flight,
+        # along with whether the access is the last beat of its burst
+        self._b_inflight: deque[tuple[AXI4WriteResponse, bool]] = deque()
+        self._r_inflight: deque[tuple[AXI4ReadBurstResponse, bool]] = deque()
+        # Subscribe to events
+        awreq.subscribe(MonitorEvent.CAPTURE, self._handle)
+        wreq.subscribe(MonitorEvent.CAPTURE, self._handle)
+        arreq.subscribe(MonitorEvent.CAPTURE, self._handle)
+        bmon.subscribe(MonitorEvent.CAPTURE, self._handle)
+        rmon.subscribe(MonitorEvent.CAPTURE, self._handle)
+
+    def _send(self, request: tuple) -> None:
+        response, last, address, data = request
+        if data is None:
+            self._r_inflight.append((response, last))
+            self.ardrv.enqueue(address)
+        else:
+            self._b_inflight.append((response, last))
+            self.awdrv.enqueue(address)
+            self.wdrv.enqueue(data)
+
+    def _handle(self, component, event, obj) -> None:
+        match obj:
+            case AXI4WriteAddress():
+                self._aw_nodata.append(
+                    [
+                        obj,
+                        AXI4WriteResponse(axid=obj.axid),
+                        beat_addresses(obj.address, obj.length, obj.size, obj.burst),
+                        0,
+                    ]
+                )
+                self._pair_writes()
+            case AXI4WriteData():
+                self._w_noaddr.append(obj)
+                self._pair_writes()
+            case AXI4ReadAddress():
+                response = AXI4ReadBurstResponse(axid=obj.axid, response=[])
+                addresses = beat_addresses(obj.address, obj.length, obj.size, obj.burst)
+                for index, address in enumerate(addresses):
+                    self._issue(
+                        (
+                            response,
+                            index == obj.length,
+                            AXI4LiteReadAddress(
+                                address=address, protection=obj.protection
+                            ),
+                            None,
+                        )
+                    )
+            case AXI4LiteWriteResponse():
+                response, last = self._b_inflight.popleft()
+                response.response = max(response.response, obj.response)
+                if last:
+                    self.brsp.enqueue(response)
+                self._complete()
+            case AXI4LiteReadResponse():
+                response, last = self._r_inflight.popleft()
+                response.data.append(obj.data)
+                response.response.append(obj.response)
+                if last:
+                    self.rrsp.enqueue(response)
+                self._complete()
+
+    def _pair_writes(self) -> None:
+        # Issue each data beat as soon as the address of its burst is known
+        while self._aw_nodata and self._w_noaddr:
+            entry = self._aw_nodata[0]
+            awreq, response, addresses, index = entry
+            wreq = self._w_noaddr.popleft()
+            entry[3] += 1
+            if index == awreq.length:
+                self._aw_nodata.popleft()
+            self._issue(
+                (
+                    response,
+                    index == awreq.length,
+                    AXI4LiteWriteAddress(
+                        address=addresses[index], protection=awreq.protection
+                    ),
+                    AXI4LiteWriteData(data=wreq.data, strobe=wreq.strobe),
+                )
+            )
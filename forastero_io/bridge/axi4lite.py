@@ -0,0 +1,129 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+from collections import deque
+
+from forastero.bench import BaseBench
+from forastero.monitor import MonitorEvent
+
+from ..apb.common import Pprot
+from ..apb.initiator import ApbInitiatorDriver, ApbInitiatorMonitor
+from ..apb.transaction import ApbAccess, ApbRequest, ApbResponse
+from ..axi4.common import Resp, cast
+from ..axi4lite.initiator import (
+    AXI4LiteReadResponseInitiator,
+    AXI4LiteWriteResponseInitiator,
+)
+from ..axi4lite.monitor import (
+    AXI4LiteReadAddressMonitor,
+    AXI4LiteWriteAddressMonitor,
+    AXI4LiteWriteDataMonitor,
+)
+from ..axi4lite.transaction import (
+    AXI4LiteReadAddress,
+    AXI4LiteReadResponse,
+    AXI4LiteWriteAddress,
+    AXI4LiteWriteData,
+    AXI4LiteWriteResponse,
+)
+from .common import BaseBridge
+
+
+class AXI4LiteToApbBridge(BaseBridge):
+    """
+    Bridge from an AXI4-Lite port to an APB port of the same data width. Reads
+    and writes are issued to APB in the order that they are captured (with
+    writes issued once both address and data have been seen), and PSLVERR is
+    returned as a SLVERR response.
+
+    :param tb:              Handle to the testbench
+    :param awreq:           Monitor for the AXI4-Lite write address channel
+    :param wreq:            Monitor for the AXI4-Lite write data channel
+    :param arreq:           Monitor for the AXI4-Lite read address channel
+    :param brsp:            Initiator for the AXI4-Lite write response channel
+    :param rrsp:            Initiator for the AXI4-Lite read response channel
+    :param apbdrv:          Driver for APB requests
+    :param apbmon:          Monitor for APB responses
+    :param name:            Name of the bridge (used for logging)
+    :param max_outstanding: Maximum number of APB requests awaiting a response
+                            (0 disables the limit)
+    """
+
+    def __init__(
+        self,
+        tb: BaseBench,
+        awreq: AXI4LiteWriteAddressMonitor,
+        wreq: AXI4LiteWriteDataMonitor,
+        arreq: AXI4LiteReadAddressMonitor,
+        brsp: AXI4LiteWriteResponseInitiator,
+        rrsp: AXI4LiteReadResponseInitiator,
+        apbdrv: ApbInitiatorDriver,
+        apbmon: ApbInitiatorMonitor,
+        name: str = "axi4lite_to_apb",
+        max_outstanding: int = 0,
+    ) -> None:
+        super().__init__(tb, name, max_outstanding)
+        # Sanity checks
+        assert wreq.io.width("wdata") == apbdrv.io.width(
+            "pwdata"
+        ), "AXI4-Lite and APB data widths must match"
+        # Hold references
+        self.brsp = brsp
+        self.rrsp = rrsp
+        self.apbdrv = apbdrv
+        # Write addresses waiting for data, and data waiting for an address
+        self._aw_nodata: deque[AXI4LiteWriteAddress] = deque()
+        self._w_noaddr: deque[AXI4LiteWriteData] = deque()
+        # Whether each APB request in flight is a write
+        self._inflight: deque[bool] = deque()
+        # Subscribe to events
+        awreq.subscribe(MonitorEvent.CAPTURE, self._handle)
+        wreq.subscribe(MonitorEvent.CAPTURE, self._handle)
+        arreq.subscribe(MonitorEvent.CAPTURE, self._handle)
+        apbmon.subscribe(MonitorEvent.CAPTURE, self._handle)
+
+    def _send(self, request: tuple) -> None:
+        (obj,) = request
+        self._inflight.append(obj.mode is ApbAccess.WRITE)
+        self.apbdrv.enqueue(obj)
+
+    def _handle(self, component, event, obj) -> None:
+        match obj:
+            case AXI4LiteWriteAddress():
+                self._aw_nodata.append(obj)
+            case AXI4LiteWriteData():
+                self._w_noaddr.append(obj)
+            case AXI4LiteReadAddress():
+                self._issue(
+                    (
+                        ApbRequest(
+                            address=obj.address,
+                            protection=cast(Pprot, int(obj.protection)),
+                            mode=ApbAccess.READ,
+                        ),
+                    )
+                )
+            case ApbResponse():
+                response = Resp.SLVERR if obj.slverr else Resp.OKAY
+                if self._inflight.popleft():
+                    self.brsp.enqueue(AXI4LiteWriteResponse(response=response))
+                else:
+                    self.rrsp.enqueue(
+                        AXI4LiteReadResponse(data=obj.data, response=response)
+                    )
+                self._complete()
+        # Issue writes once both address and data are available
+        while self._aw_nodata and self._w_noaddr:
+            awreq = self._aw_nodata.popleft()
+            wreq = self._w_noaddr.popleft()
+            self._issue(
+                (
+                    ApbRequest(
+                        address=awreq.address,
+                        protection=cast(Pprot, int(awreq.protection)),
+                        mode=ApbAccess.WRITE,
+                        data=wreq.data,
+                        strobe=wreq.strobe,
+                    ),
+                )
+            )
@@ -0,0 +1,60 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+import abc
+from collections import deque
+
+from forastero.bench import BaseBench
+
+
+class BaseBridge(abc.ABC):
+    """
+    Base for behavioural bridges between protocols, which capture requests using
+    the monitors of one protocol and issue them through the initiators of
+    another, returning the responses captured on the far side. Bridges are
+    entirely event driven (they do not run a coroutine per beat), with each
+    request being issued as soon as it is captured unless the number of
+    downstream requests awaiting a response has reached the outstanding limit,
+    in which case requests are held in order until earlier requests complete.
+
+    :param tb:              Handle to the testbench
+    :param name:            Name of the bridge (used for logging)
+    :param max_outstanding: Maximum number of downstream requests awaiting a
+                            response (0 disables the limit)
+    """
+
+    def __init__(self, tb: BaseBench, name: str, max_outstanding: int = 0) -> None:
+        self.name = name
+        self.max_outstanding = max_outstanding
+        self.log = tb.fork_log("bridge", name)
+        # Count of downstream requests awaiting a response, and the requests
+        # held back by the outstanding limit
+        self.outstanding = 0
+        self._held: deque[tuple] = deque()
+
+    @abc.abstractmethod
+    def _send(self, request: tuple) -> None:
+        """
+        Issue a request through the downstream initiators.
+
+        :param request: The request, in the form captured by the bridge
+        """
+
+    def _issue(self, request: tuple) -> None:
+        # Send a downstream request, or hold it if the limit has been reached
+        if self._held or (
+            self.max_outstanding and self.outstanding >= self.max_outstanding
+        ):
+            self._held.append(request)
+            return
+        self.outstanding += 1
+        self._send(request)
+
+    def _complete(self) -> None:
+        # Retire a downstream request, releasing the oldest held request
+        self.outstanding -= 1
+        if self._held and (
+            not self.max_outstanding or self.outstanding < self.max_outstanding
+        ):
+            self.outstanding += 1
+            self._send(self._held.popleft())
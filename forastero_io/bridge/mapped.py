@@ -0,0 +1,131 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+from collections import deque
+
+from forastero.bench import BaseBench
+from forastero.monitor import MonitorEvent
+
+from ..axi4.common import Resp
+from ..axi4lite.initiator import (
+    AXI4LiteReadAddressInitiator,
+    AXI4LiteWriteAddressInitiator,
+    AXI4LiteWriteDataInitiator,
+)
+from ..axi4lite.monitor import AXI4LiteReadResponseMonitor, AXI4LiteWriteResponseMonitor
+from ..axi4lite.transaction import (
+    AXI4LiteReadAddress,
+    AXI4LiteReadResponse,
+    AXI4LiteWriteAddress,
+    AXI4LiteWriteData,
+    AXI4LiteWriteResponse,
+)
+from ..mapped.request import MappedRequestMonitor
+from ..mapped.response import MappedResponseInitiator
+from ..mapped.transaction import MappedAccess, MappedRequest, MappedResponse
+from .common import BaseBridge
+
+
+class MappedToAXI4LiteBridge(BaseBridge):
+    """
+    Bridge from a mapped interface to an AXI4-Lite port of the same data width.
+    Responses carry the ident of their request, with any response other than
+    OKAY being returned as an error. As AXI4-Lite returns reads and writes on
+    separate channels, a read may complete before an earlier write. Mapped
+    addresses index elements of the data width, so element N is issued to
+    AXI4-Lite at byte address N * byte width (matching MappedMemoryModel).
+
+    :param tb:              Handle to the testbench
+    :param reqmon:          Monitor capturing mapped requests
+    :param rspdrv:          Initiator driving mapped responses
+    :param awdrv:           Initiator for the AXI4-Lite write address channel
+    :param wdrv:            Initiator for the AXI4-Lite write data channel
+    :param ardrv:           Initiator for the AXI4-Lite read address channel
+    :param bmon:            Monitor for the AXI4-Lite write response channel
+    :param rmon:            Monitor for the AXI4-Lite read response channel
+    :param name:            Name of the bridge (used for logging)
+    :param max_outstanding: Maximum number of AXI4-Lite accesses awaiting a
+                            response (0 disables the limit)
+    :param respond_writes:  Whether write requests should produce a response
+    """
+
+    def __init__(
+        self,
+        tb: BaseBench,
+        reqmon: MappedRequestMonitor,
+        rspdrv: MappedResponseInitiator,
+        awdrv: AXI4LiteWriteAddressInitiator,
+        wdrv: AXI4LiteWriteDataInitiator,
+        ardrv: AXI4LiteReadAddressInitiator,
+        bmon: AXI4LiteWriteResponseMonitor,
+        rmon: AXI4LiteReadResponseMonitor,
+        name: str = "mapped_to_axi4lite",
+        max_outstanding: int = 0,
+        respond_writes: bool = True,
+    ) -> None:
+        super().__init__(tb, name, max_outstanding)
+        # Sanity checks
+        assert reqmon.io.width("data") == wdrv.io.width(
+            "wdata"
+        ), "Mapped and AXI4-Lite data widths must match"
+        # Hold references
+        self.rspdrv = rspdrv
+        self.awdrv = awdrv
+        self.wdrv = wdrv
+        self.ardrv = ardrv
+        self.respond_writes = respond_writes
+        self.byte_width = (reqmon.io.width("data") + 7) // 8
+        # Idents of the reads and writes in flight
+        self._b_inflight: deque[int] = deque()
+        self._r_inflight: deque[int] = deque()
+        # Subscribe to events
+        reqmon.subscribe(MonitorEvent.CAPTURE, self._handle)
+        bmon.subscribe(MonitorEvent.CAPTURE, self._handle)
+        rmon.subscribe(MonitorEvent.CAPTURE, self._handle)
+
+    def _send(self, request: tuple) -> None:
+        ident, address, data = request
+        if data is None:
+            self._r_inflight.append(ident)
+            self.ardrv.enqueue(address)
+        else:
+            self._b_inflight.append(ident)
+            self.awdrv.enqueue(address)
+            self.wdrv.enqueue(data)
+
+    def _handle(self, component, event, obj) -> None:
+        match obj:
+            case MappedRequest(mode=MappedAccess.WRITE):
+                self._issue(
+                    (
+                        obj.ident,
+                        AXI4LiteWriteAddress(address=obj.address * self.byte_width),
+                        AXI4LiteWriteData(data=obj.data, strobe=obj.strobe),
+                    )
+                )
+            case MappedRequest():
+                self._issue(
+                    (
+                        obj.ident,
+                        AXI4LiteReadAddress(address=obj.address * self.byte_width),
+                        None,
+                    )
+                )
+            case AXI4LiteWriteResponse():
+                ident = self._b_inflight.popleft()
+                if self.respond_writes:
+                    self.rspdrv.enqueue(
+                        MappedResponse(
+                            ident=ident, error=int(obj.response != Resp.OKAY)
+                        )
+                    )
+                self._complete()
+            case AXI4LiteReadResponse():
+                self.rspdrv.enqueue(
+                    MappedResponse(
+                        ident=self._r_inflight.popleft(),
+                        data=obj.data,
+                        error=int(obj.response != Resp.OKAY),
+                    )
+                )
+                self._complete()
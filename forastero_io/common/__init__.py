@@ -0,0 +1,53 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+from .digest import DigestCheckpoint, DigestMonitor, PayloadDigest
+from .feed import Source, feed_driver
+from .memory import (
+    MemoryBackdoor,
+    MemoryOrdering,
+    MemoryPort,
+    PagedMemory,
+    SharedMemory,
+)
+from .profile import AccessProfile, ComponentProfiler, ComponentStats
+from .stimulus import (
+    ChoicePattern,
+    ConstantPattern,
+    HotspotPattern,
+    IncrementPattern,
+    PageSequentialPattern,
+    Pattern,
+    RandomPattern,
+    StridePattern,
+    random_words,
+)
+from .strobe import ByteStrobe
+
+assert all(
+    (
+        AccessProfile,
+        ByteStrobe,
+        ChoicePattern,
+        ConstantPattern,
+        HotspotPattern,
+        IncrementPattern,
+        PageSequentialPattern,
+        Pattern,
+        RandomPattern,
+        StridePattern,
+        random_words,
+        ComponentProfiler,
+        ComponentStats,
+        DigestCheckpoint,
+        Source,
+        feed_driver,
+        DigestMonitor,
+        PayloadDigest,
+        MemoryBackdoor,
+        MemoryOrdering,
+        MemoryPort,
+        PagedMemory,
+        SharedMemory,
+    )
+)
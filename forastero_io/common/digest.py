@@ -0,0 +1,219 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+import dataclasses
+import hashlib
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any
+
+from forastero import BaseTransaction
+from forastero.monitor import BaseMonitor, MonitorEvent
+
+
+@dataclass(kw_only=True)
+class DigestCheckpoint(BaseTransaction):
+    """
+    Snapshot of a running payload digest.
+
+    :param channel: Name of the channel the digest was computed over
+    :param key:     Value of the key field (i.e. ID or TDEST) if digests are keyed
+    :param count:   Number of transactions folded into the digest so far
+    :param digest:  Hexadecimal digest of all transactions folded so far
+    """
+
+    channel: str = ""
+    key: int | None = None
+    count: int = 0
+    digest: str = ""
+
+
+class PayloadDigest:
+    """
+    Folds transactions into running hashes so that a stream can be checked
+    without retaining every transaction, publishing a DigestCheckpoint every N
+    transactions and/or at the end of every packet. Digests may optionally be
+    kept separately for each value of a key field (such as an ID or TDEST), in
+    which case transactions are counted separately for each key.
+
+    The same digest configuration should be used to fold the expected
+    transactions within a testbench's model, with the resulting checkpoints
+    pushed to the scoreboard as references. Any mismatch then lies between the
+    first mismatching checkpoint and the one preceding it.
+
+    :param channel:   Name of the channel (defaults to the name of the monitor at
+                      the time each checkpoint is published)
+    :param fields:    Fields to fold into the digest (defaults to every compared
+                      field of the transaction)
+    :param key:       Optional field to key separate digests on
+    :param interval:  Publish a checkpoint every N transactions (0 disables)
+    :param on_last:   Publish a checkpoint whenever a transaction has 'last' set
+    :param algorithm: Either 'crc32', 'adler32', or the name of a hashlib algorithm
+    """
+
+    def __init__(
+        self,
+        channel: str = "",
+        fields: list[str] | None = None,
+        key: str | None = None,
+        interval: int = 0,
+        on_last: bool = False,
+        algorithm: str = "crc32",
+    ) -> None:
+        self.channel = channel
+        self.fields = fields
+        self.key = key
+        self.interval = interval
+        self.on_last = on_last
+        self.algorithm = algorithm
+        # Select a zlib checksum or check the hashlib algorithm is available
+        self._checksum: Callable[[bytes, int], int] | None = None
+        if algorithm in ("crc32", "adler32"):
+            self._checksum = getattr(zlib, algorithm)
+        else:
+            hashlib.new(algorithm)
+        # Payload formatting and field accessor (resolved on the first fold)
+        self._format: bytes | None = None
+        self._values: Callable[[Any], tuple] | None = None
+        # Running state and transaction count per key
+        self._state: dict[int | None, Any] = {}
+        self._count: dict[int | None, int] = {}
+        # Count at the most recent checkpoint of each key
+        self._checked: dict[int | None, int] = {}
+
+    def _bind(self, obj: BaseTransaction) -> None:
+        if self.fields is None:
+            self.fields = [
+                x.name
+                for x in dataclasses.fields(obj)
+                if x.compare and x.name != self.key
+            ]
+        getter = attrgetter(*self.fields)
+        if len(self.fields) == 1:
+            self._values = lambda x: (getter(x),)
+        else:
+            self._values = getter
+        self._format = b",".join(b"%x" for _ in self.fields) + b";"
+
+    @staticmethod
+    def _integer(value: Any) -> int:
+        # Represent fields that are not integers by a hash of their repr
+        if isinstance(value, int):
+            return value
+        if value is None:
+            return -1
+        digest = hashlib.blake2b(repr(value).encode("utf-8"), digest_size=8)
+        return int.from_bytes(digest.digest(), "little")
+
+    def _digest(self, state: Any) -> str:
+        if self._checksum is None:
+            return state.hexdigest()
+        return f"{state:08x}"
+
+    def fold(self, obj: BaseTransaction) -> DigestCheckpoint | None:
+        """
+        Fold a transaction into the running digest.
+
+        :param obj: The transaction to fold
+        :returns:   A checkpoint if one is due, otherwise None
+        """
+        if self._format is None:
+            self._bind(obj)
+        key = None if self.key is None else getattr(obj, self.key)
+        values = self._values(obj)
+        try:
+            payload = self._format % values
+        except TypeError:
+            payload = self._format % tuple(map(self._integer, values))
+        # Update the running state
+        if self._checksum is None:
+            if (state := self._state.get(key, None)) is None:
+                state = self._state[key] = hashlib.new(self.algorithm)
+            state.update(payload)
+        else:
+            init = 1 if self.algorithm == "adler32" else 0
+            self._state[key] = self._checksum(payload, self._state.get(key, init))
+        count = self._count[key] = self._count.get(key, 0) + 1
+        # Determine if a checkpoint is due
+        if (self.interval and (count % self.interval) == 0) or (
+            self.on_last and getattr(obj, "last", False)
+        ):
+            return self.checkpoint(key, timestamp=obj.timestamp)
+        return None
+
+    def checkpoint(self, key: int | None = None, **kwds) -> DigestCheckpoint:
+        """
+        Take a checkpoint of the current digest for a key.
+
+        :param key: The key to checkpoint
+        :returns:   The checkpoint
+        """
+        self._checked[key] = self._count.get(key, 0)
+        state = self._state.get(key, None)
+        digest = "" if state is None else self._digest(state)
+        return DigestCheckpoint(
+            channel=self.channel,
+            key=key,
+            count=self._count.get(key, 0),
+            digest=digest,
+            **kwds,
+        )
+
+    def flush(self) -> list[DigestCheckpoint]:
+        """
+        Take a checkpoint of every key with transactions folded since its last
+        checkpoint, so that the tail of a stream which does not fill a whole
+        interval is still checked once a test completes.
+
+        :returns: List of checkpoints (empty if there is nothing to flush)
+        """
+        return [
+            self.checkpoint(x)
+            for x, count in self._count.items()
+            if count != self._checked.get(x, 0)
+        ]
+
+    @property
+    def keys(self) -> list[int | None]:
+        """Keys for which at least one transaction has been folded"""
+        return list(self._count.keys())
+
+
+class DigestMonitor(BaseMonitor):
+    """
+    Base for monitors that can optionally fold captured transactions into a
+    payload digest, capturing DigestCheckpoint objects in place of the
+    transactions themselves. Once the test completes a final checkpoint is
+    captured for every key with transactions folded since its last checkpoint.
+
+    :param digest: Optional payload digest
+    """
+
+    def __init__(self, *args, digest: PayloadDigest | None = None, **kwds) -> None:
+        super().__init__(*args, **kwds)
+        self.digest = digest
+        if digest is not None:
+            self.tb.add_teardown(self._flush_digest())
+
+    def _stamp(self, checkpoint: DigestCheckpoint) -> DigestCheckpoint:
+        # Name the channel after the monitor as registered with the testbench
+        if not checkpoint.channel:
+            checkpoint.channel = self.name
+        return checkpoint
+
+    def fold_digest(self, obj: BaseTransaction) -> DigestCheckpoint | None:
+        """
+        Fold a captured transaction into the digest.
+
+        :param obj: The captured transaction
+        :returns:   A checkpoint if one is due, otherwise None
+        """
+        if (checkpoint := self.digest.fold(obj)) is not None:
+            self._stamp(checkpoint)
+        return checkpoint
+
+    async def _flush_digest(self) -> None:
+        for checkpoint in self.digest.flush():
+            self.publish(MonitorEvent.CAPTURE, self._stamp(checkpoint))
@@ -0,0 +1,96 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+from collections import deque
+from collections.abc import AsyncIterable, Callable, Iterable
+from typing import Any
+
+from cocotb.triggers import Event
+from forastero.driver import BaseDriver, DriverEvent
+from forastero.sequence import SeqProxy
+from forastero.transaction import BaseTransaction
+
+# A source of stimulus, drawn from lazily
+Source = Iterable[Any] | AsyncIterable[Any]
+
+
+async def feed_driver(
+    driver: SeqProxy[BaseDriver],
+    source: Source,
+    convert: Callable[[Any], BaseTransaction] | None = None,
+    high: int = 16,
+    low: int | None = None,
+    drain: bool = True,
+) -> int:
+    """
+    Enqueue transactions drawn lazily from an iterable or asynchronous iterable
+    (for example a generator or a file reader), keeping no more than the high
+    watermark queued ahead of the driver. Once the high watermark is reached no
+    more is drawn from the source until the driver has consumed enough for the
+    queue to fall to the low watermark, so memory use is bounded regardless of
+    the length of the source.
+
+    The queue depth is tracked by matching the transactions presented by the
+    driver against those enqueued here, which means the lock on the driver must
+    be held throughout (e.g. by using ``auto_lock=True`` on the sequence).
+
+    :param driver:  Proxy of the driver to enqueue into
+    :param source:  Iterable or asynchronous iterable of stimulus
+    :param convert: Optional conversion from each item to a transaction
+    :param high:    Maximum number of transactions queued ahead of the driver
+    :param low:     Number of queued transactions at which drawing resumes,
+                    defaults to half of the high watermark
+    :param drain:   Wait for the final transaction to be presented by the
+                    driver before returning
+    :returns:       Number of transactions enqueued
+    """
+    low = (high // 2) if low is None else low
+    assert 0 <= low < high, "Low watermark must be below the high watermark"
+    assert driver._holds_lock, "Feeding a driver requires its lock to be held"
+    pending: deque[BaseTransaction] = deque()
+    resume = Event()
+    limit = low
+    # EventEmitter offers no way to unsubscribe, so the handler is disarmed
+    # once feeding completes
+    done = False
+
+    def _presented(component: Any, event: DriverEvent, obj: Any) -> None:
+        # The driver is a FIFO, so our transactions are presented in order
+        if not done and pending and obj is pending[0]:
+            pending.popleft()
+            if len(pending) <= limit:
+                resume.set()
+
+    async def _wait(level: int) -> None:
+        nonlocal limit
+        limit = level
+        while len(pending) > level:
+            resume.clear()
+            await resume.wait()
+
+    count = 0
+
+    def _put(item: Any) -> None:
+        nonlocal count
+        tran = item if convert is None else convert(item)
+        pending.append(tran)
+        driver.enqueue(tran)
+        count += 1
+
+    driver.subscribe(DriverEvent.PRE_DRIVE, _presented)
+    try:
+        if isinstance(source, AsyncIterable):
+            async for item in source:
+                _put(item)
+                if len(pending) >= high:
+                    await _wait(low)
+        else:
+            for item in source:
+                _put(item)
+                if len(pending) >= high:
+                    await _wait(low)
+        if drain:
+            await _wait(0)
+    finally:
+        done = True
+    return count
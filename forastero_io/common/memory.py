@@ -0,0 +1,555 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+import hashlib
+from collections import deque
+from collections.abc import Callable, Iterable, Mapping
+from enum import IntEnum, auto
+from random import Random
+
+from cocotb.triggers import Event
+from forastero.bench import BaseBench
+
+from .strobe import ByteStrobe
+
+
+class PagedMemory(dict):
+    """
+    Sparse memory mapping addresses to data words, which keeps track of the
+    addresses held within each page so that a content hash can be calculated
+    per page. Hashes are only recalculated for pages that have been written
+    since they were last hashed, which allows two memories to be compared by
+    first comparing page hashes and only then inspecting the words of the pages
+    that differ.
+
+    :param page_size: Size of each page in address units (must be a power of 2)
+    :param stride:    Address increment between consecutive words, used when
+                      merging differing addresses into ranges
+    """
+
+    def __init__(self, page_size: int = 4096, stride: int = 1) -> None:
+        super().__init__()
+        assert (
+            page_size > 0 and (page_size & (page_size - 1)) == 0
+        ), f"Page size {page_size} is not a power of 2"
+        self.page_size = page_size
+        self.stride = stride
+        self._shift = page_size.bit_length() - 1
+        # Addresses held within each page
+        self._pages: dict[int, set[int]] = {}
+        # Cached hash of each page, and pages modified since they were hashed
+        self._hashes: dict[int, bytes] = {}
+        self._dirty: set[int] = set()
+
+    @classmethod
+    def from_image(
+        cls, image: Mapping[int, int], page_size: int = 4096, stride: int = 1
+    ) -> "PagedMemory":
+        """
+        Create a paged memory from an image mapping addresses to data words.
+
+        :param image:     The image to copy
+        :param page_size: Size of each page in address units
+        :param stride:    Address increment between consecutive words
+        :returns:         The populated paged memory
+        """
+        memory = cls(page_size=page_size, stride=stride)
+        memory.update(image)
+        return memory
+
+    def __setitem__(self, address: int, data: int) -> None:
+        page = address >> self._shift
+        self._dirty.add(page)
+        if address not in self:
+            self._pages.setdefault(page, set()).add(address)
+        super().__setitem__(address, data)
+
+    def __delitem__(self, address: int) -> None:
+        super().__delitem__(address)
+        page = address >> self._shift
+        self._dirty.add(page)
+        self._pages[page].discard(address)
+        if not self._pages[page]:
+            del self._pages[page]
+
+    def update(self, *args, **kwds) -> None:
+        for address, data in dict(*args, **kwds).items():
+            self[address] = data
+
+    def setdefault(self, address: int, default: int = 0) -> int:
+        if address not in self:
+            self[address] = default
+        return self[address]
+
+    def pop(self, address: int, *default) -> int:
+        if address not in self:
+            return super().pop(address, *default)
+        data = self[address]
+        del self[address]
+        return data
+
+    def popitem(self) -> tuple[int, int]:
+        address, data = next(reversed(self.items()))
+        del self[address]
+        return address, data
+
+    def clear(self) -> None:
+        super().clear()
+        self._pages.clear()
+        self._hashes.clear()
+        self._dirty.clear()
+
+    def page_hashes(self) -> dict[int, bytes]:
+        """
+        Return the hash of every populated page, recalculating only those that
+        have been modified since they were last hashed.
+
+        :returns: Dictionary of page number to hash
+        """
+        for page in self._dirty:
+            if (addresses := self._pages.get(page, None)) is None:
+                self._hashes.pop(page, None)
+                continue
+            digest = hashlib.blake2b(digest_size=16)
+            for address in sorted(addresses):
+                digest.update(b"%x:%x;" % (address, self[address]))
+            self._hashes[page] = digest.digest()
+        self._dirty.clear()
+        return self._hashes
+
+    def _ranges(self, addresses: Iterable[int]) -> list[tuple[int, int]]:
+        ranges = []
+        for address in addresses:
+            if ranges and ranges[-1][1] == address:
+                ranges[-1] = (ranges[-1][0], address + self.stride)
+            else:
+                ranges.append((address, address + self.stride))
+        return ranges
+
+    def diff(self, other: Mapping[int, int]) -> list[tuple[int, int]]:
+        """
+        Compare against another memory or an image mapping addresses to data
+        words, first comparing page hashes and then inspecting only the words of
+        pages with differing hashes. An address held in only one of the two is
+        considered to differ.
+
+        :param other: The memory or image to compare against
+        :returns:     List of differing address ranges as (start, end) where the
+                      end address is exclusive
+        """
+        if not isinstance(other, PagedMemory) or other.page_size != self.page_size:
+            other = PagedMemory.from_image(
+                other, page_size=self.page_size, stride=self.stride
+            )
+        mine, theirs = self.page_hashes(), other.page_hashes()
+        differing = []
+        for page in sorted(mine.keys() | theirs.keys()):
+            if mine.get(page, None) == theirs.get(page, None):
+                continue
+            addresses = self._pages.get(page, set()) | other._pages.get(page, set())
+            differing.extend(
+                x for x in sorted(addresses) if self.get(x, None) != other.get(x, None)
+            )
+        return self._ranges(differing)
+
+
+class MemoryOrdering(IntEnum):
+    """Ordering of writes made through one port with respect to other ports"""
+
+    # Writes are visible to all ports as soon as they are accepted
+    ACCEPT = auto()
+    # Writes are visible to the issuing port once accepted, but only become
+    # visible to other ports once their response has been issued
+    RESPONSE = auto()
+
+
+class SharedMemory:
+    """
+    Sparse backing store that can be shared between the memory models of several
+    ports (of the same or different protocols), removing the need to keep
+    separate copies of memory contents synchronised. Each memory model accesses
+    the store through a MemoryPort, and ports may differ in data width from the
+    store - accesses are split or merged into words of the store's width.
+
+    :param tb:            Handle to the testbench
+    :param byte_width:    Width of each word held by the store in bytes
+    :param error_noninit: Raise an error on reads from uninitialised addresses
+    :param rand_noninit:  Return random data from uninitialised addresses,
+                          otherwise uninitialised addresses read as zero
+    :param hash_noninit:  Derive the random data of uninitialised addresses from
+                          a keyed hash of the address rather than storing it, so
+                          reads never allocate and the data returned does not
+                          depend on the order of accesses (requires rand_noninit)
+    :param ordering:      Ordering of writes from one port with respect to others
+    :param page_size:     Size of the pages that memory contents are hashed in,
+                          used when comparing memories with diff
+    """
+
+    def __init__(
+        self,
+        tb: BaseBench,
+        byte_width: int,
+        error_noninit: bool = True,
+        rand_noninit: bool = True,
+        hash_noninit: bool = False,
+        ordering: MemoryOrdering = MemoryOrdering.ACCEPT,
+        page_size: int = 4096,
+    ) -> None:
+        self.byte_width = byte_width
+        self.bit_width = byte_width * 8
+        self.mask = (1 << self.bit_width) - 1
+        self.strobe = ByteStrobe(byte_width)
+        self.error_noninit = error_noninit
+        self.rand_noninit = rand_noninit
+        self.hash_noninit = hash_noninit
+        self.ordering = ordering
+        # Fork random from testbench
+        self.random = Random(tb.random.random())
+        # Key for hash-derived data, and the number of hash blocks per word
+        self._fill_key = self.random.getrandbits(256).to_bytes(32, "little")
+        self._fill_blocks = (byte_width + 63) // 64
+        # Create memory
+        self.memory = PagedMemory(page_size=page_size, stride=byte_width)
+        # Ports attached to the store
+        self.ports: list[MemoryPort] = []
+        # Watchers of word addresses as (mask, value, event)
+        self._watchers: dict[int, list[tuple[int, int, Event]]] = {}
+
+    def port(self, byte_width: int | None = None) -> "MemoryPort":
+        """
+        Attach a new port to the store.
+
+        :param byte_width: Width of the port in bytes (defaults to the store width)
+        :returns:          The memory port
+        """
+        port = MemoryPort(self, byte_width or self.byte_width)
+        self.ports.append(port)
+        return port
+
+    def _hash_fill(self, address: int) -> int:
+        # Derive data from the address, so no state is required
+        data = b"".join(
+            hashlib.blake2b(b"%x:%x" % (address, x), key=self._fill_key).digest()
+            for x in range(self._fill_blocks)
+        )
+        return int.from_bytes(data[: self.byte_width], "little")
+
+    def read(self, address: int, check: bool = True) -> int:
+        """
+        Read a word of the store's width from an aligned address.
+
+        :param address: Address to read
+        :param check:   Whether to check for reads of uninitialised addresses
+        :returns:       The data word
+        """
+        if address not in self.memory:
+            if check and self.error_noninit:
+                raise Exception(f"Read from uninitialised address: 0x{address:016X}")
+            elif self.rand_noninit and self.hash_noninit:
+                return self._hash_fill(address)
+            elif self.rand_noninit:
+                self.memory[address] = self.random.getrandbits(self.bit_width)
+            else:
+                self.memory[address] = 0
+        return self.memory[address]
+
+    def merge(self, current: int, data: int, strobe: int) -> int:
+        """
+        Merge data into a word according to a byte strobe.
+
+        :param current: Current value of the word
+        :param data:    Data to merge
+        :param strobe:  Byte strobe selecting the bytes of data to merge
+        :returns:       The merged word
+        """
+        return self.strobe.merge(current, data, strobe)
+
+    def write(self, address: int, data: int, strobe: int) -> None:
+        """
+        Write a word of the store's width to an aligned address.
+
+        :param address: Address to write
+        :param data:    Data to write
+        :param strobe:  Byte strobe selecting the bytes to write
+        """
+        self.memory[address] = self.merge(self.read(address, check=False), data, strobe)
+        if self._watchers and address in self._watchers:
+            self._notify(address)
+
+    def _notify(self, address: int) -> None:
+        # Release any watchers of an address whose condition is now met
+        current = self.memory[address]
+        waiting = []
+        for mask, value, event in self._watchers.pop(address):
+            if (current & mask) == value:
+                event.set()
+            else:
+                waiting.append((mask, value, event))
+        if waiting:
+            self._watchers[address] = waiting
+
+    def peek(self, address: int, length: int) -> bytes:
+        """
+        Read a range of bytes directly from the store, taking zero time. Reads of
+        uninitialised addresses follow the same rules as reads made through a
+        port, except that an error is never raised.
+
+        :param address: Address of the first byte
+        :param length:  Number of bytes to read
+        :returns:       The bytes read
+        """
+        width = self.byte_width
+        first = address - (address % width)
+        data = b"".join(
+            self.read(x, check=False).to_bytes(width, "little")
+            for x in range(first, address + length, width)
+        )
+        return data[address - first : address - first + length]
+
+    def poke(self, address: int, data: bytes) -> None:
+        """
+        Write a range of bytes directly into the store, taking zero time. The
+        write is immediately visible to every port.
+
+        :param address: Address of the first byte
+        :param data:    The bytes to write
+        """
+        width = self.byte_width
+        end = address + len(data)
+        for word in range(address - (address % width), end, width):
+            start, stop = max(word, address), min(word + width, end)
+            chunk = int.from_bytes(data[start - address : stop - address], "little")
+            self.write(
+                word,
+                chunk << ((start - word) * 8),
+                ((1 << (stop - start)) - 1) << (start - word),
+            )
+
+    def modify(self, address: int, update: Callable[[int], int]) -> int:
+        """
+        Atomically read, modify, and write a word of the store's width, taking
+        zero time.
+
+        :param address: Address of the word (aligned to the store's width)
+        :param update:  Function taking the current value and returning the new
+                        value of the word
+        :returns:       The value of the word before it was modified
+        """
+        current = self.read(address, check=False)
+        self.write(address, update(current) & self.mask, self.strobe.full)
+        return current
+
+    async def wait_for(self, address: int, value: int, mask: int | None = None) -> None:
+        """
+        Wait until a word of the store holds a value, returning immediately if
+        it already does. Rather than polling, the condition is only evaluated
+        when the word is written (by any port or through the backdoor), and
+        writes held by a port with response ordering are only seen once retired.
+
+        :param address: Address of the word (aligned to the store's width)
+        :param value:   Value to wait for
+        :param mask:    Optional mask selecting the bits of the word to compare
+        """
+        mask = self.mask if mask is None else mask
+        if (self.read(address, check=False) & mask) == (value & mask):
+            return
+        event = Event()
+        self._watchers.setdefault(address, []).append((mask, value & mask, event))
+        await event.wait()
+
+    def diff(self, other) -> list[tuple[int, int]]:
+        """
+        Compare the contents of this store against another store, memory model,
+        or an image mapping addresses to data words, see PagedMemory.diff.
+
+        :param other: Store, memory model, PagedMemory, or image to compare against
+        :returns:     List of differing address ranges as (start, end)
+        """
+        return self.memory.diff(getattr(other, "memory", other))
+
+
+class MemoryBackdoor:
+    """
+    Zero-time backdoor access for memory models holding a SharedMemory as their
+    store, see the methods of SharedMemory for details.
+    """
+
+    store: SharedMemory
+
+    def peek(self, address: int, length: int) -> bytes:
+        """
+        Read a range of bytes directly from memory.
+
+        :param address: Address of the first byte
+        :param length:  Number of bytes to read
+        :returns:       The bytes read
+        """
+        return self.store.peek(address, length)
+
+    def poke(self, address: int, data: bytes) -> None:
+        """
+        Write a range of bytes directly into memory.
+
+        :param address: Address of the first byte
+        :param data:    The bytes to write
+        """
+        self.store.poke(address, data)
+
+    def modify(self, address: int, update: Callable[[int], int]) -> int:
+        """
+        Atomically read, modify, and write a word of memory.
+
+        :param address: Address of the word (aligned to the store's width)
+        :param update:  Function taking the current value and returning the new
+                        value of the word
+        :returns:       The value of the word before it was modified
+        """
+        return self.store.modify(address, update)
+
+    async def wait_for(self, address: int, value: int, mask: int | None = None) -> None:
+        """
+        Wait until a word of memory holds a value.
+
+        :param address: Address of the word (aligned to the store's width)
+        :param value:   Value to wait for
+        :param mask:    Optional mask selecting the bits of the word to compare
+        """
+        await self.store.wait_for(address, value, mask)
+
+
+class MemoryPort:
+    """
+    View of a SharedMemory used by a single memory model, translating accesses
+    of the port's width into accesses of the store's width. Where the store uses
+    response ordering, writes are held by the port (and are only visible to it)
+    until they are retired.
+
+    :param store:      The shared store
+    :param byte_width: Width of the port in bytes
+    """
+
+    def __init__(self, store: SharedMemory, byte_width: int) -> None:
+        self.store = store
+        self.byte_width = byte_width
+        self.bit_width = byte_width * 8
+        self.mask = (1 << self.bit_width) - 1
+        # Whether accesses map directly onto words of the store
+        self._direct = byte_width == store.byte_width
+        # Writes not yet visible to other ports, held per word as a list of
+        # (address, data, strobe) in the order they were made, along with the
+        # open batch of writes and batches committed but not yet retired
+        self._held: dict[int, list[tuple[int, int, int]]] = {}
+        self._open: list[tuple[int, int, int]] = []
+        self._batches: deque[list[tuple[int, int, int]]] = deque()
+
+    @property
+    def memory(self) -> PagedMemory:
+        return self.store.memory
+
+    def _read_word(self, address: int, check: bool) -> int:
+        if self._held and address in self._held:
+            # Overlay held writes onto the word as seen by other ports
+            value = self.store.read(address, check=False)
+            for _, data, strobe in self._held[address]:
+                value = self.store.merge(value, data, strobe)
+            return value
+        return self.store.read(address, check=check)
+
+    def _write_word(self, address: int, data: int, strobe: int) -> None:
+        store = self.store
+        if store.ordering is MemoryOrdering.ACCEPT:
+            store.write(address, data, strobe)
+            return
+        held = (address, data, strobe)
+        self._held.setdefault(address, []).append(held)
+        self._open.append(held)
+
+    def _words(self, address: int) -> Iterable[tuple[int, int, int]]:
+        # Yield the address of each store word overlapping the access, along
+        # with the first and last+1 bytes of the overlap
+        width = self.store.byte_width
+        end = address + self.byte_width
+        for word in range(address - (address % width), end, width):
+            yield word, max(word, address), min(word + width, end)
+
+    def read(self, address: int, check: bool = True) -> int:
+        """
+        Read a word of the port's width.
+
+        :param address: Address to read
+        :param check:   Whether to check for reads of uninitialised addresses
+        :returns:       The data word
+        """
+        if self._direct and address % self.byte_width == 0:
+            return self._read_word(address, check)
+        value = 0
+        for word, start, end in self._words(address):
+            chunk = self._read_word(word, check) >> ((start - word) * 8)
+            chunk &= (1 << ((end - start) * 8)) - 1
+            value |= chunk << ((start - address) * 8)
+        return value
+
+    def write(self, address: int, data: int, strobe: int) -> None:
+        """
+        Write a word of the port's width.
+
+        :param address: Address to write
+        :param data:    Data to write
+        :param strobe:  Byte strobe selecting the bytes to write
+        """
+        if self._direct and address % self.byte_width == 0:
+            self._write_word(address, data, strobe)
+            return
+        for word, start, end in self._words(address):
+            span = end - start
+            word_strobe = (strobe >> (start - address)) & ((1 << span) - 1)
+            if not word_strobe:
+                continue
+            word_data = (data >> ((start - address) * 8)) & ((1 << (span * 8)) - 1)
+            self._write_word(
+                word,
+                word_data << ((start - word) * 8),
+                word_strobe << (start - word),
+            )
+
+    def commit(self) -> list[tuple[int, int, int]] | None:
+        """
+        Mark the end of a write transaction, all writes made since the previous
+        commit will become visible to other ports when the transaction is retired
+        (only relevant where the store uses response ordering).
+
+        :returns: The committed batch of writes, which may be passed to retire
+                  when transactions complete out of order (None unless the store
+                  uses response ordering)
+        """
+        if self.store.ordering is not MemoryOrdering.RESPONSE:
+            return None
+        batch, self._open = self._open, []
+        self._batches.append(batch)
+        return batch
+
+    def retire(self, batch: list[tuple[int, int, int]] | None = None) -> None:
+        """
+        Make a committed write transaction visible to other ports, called once
+        the response to the write has been issued. Each write is merged into the
+        current contents of the store according to its strobe, so bytes written
+        by other ports in the meantime are preserved.
+
+        :param batch: Batch returned by commit, defaults to the oldest batch
+        """
+        if not self._batches:
+            return
+        if batch is None:
+            batch = self._batches.popleft()
+        else:
+            # Match by identity, as different batches may hold equal writes
+            index = next(i for i, x in enumerate(self._batches) if x is batch)
+            del self._batches[index]
+        for held in batch:
+            address, data, strobe = held
+            self.store.write(address, data, strobe)
+            # Release this write (rather than any other with the same value)
+            writes = self._held[address]
+            del writes[next(i for i, x in enumerate(writes) if x is held)]
+            if not writes:
+                del self._held[address]
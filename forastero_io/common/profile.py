@@ -0,0 +1,398 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+import csv
+import time
+from array import array
+from collections import Counter
+from collections.abc import Coroutine
+from pathlib import Path
+from typing import Any
+
+from cocotb.utils import get_sim_time
+from forastero.bench import BaseBench
+from forastero.component import Component
+from forastero.driver import BaseDriver
+from forastero.monitor import BaseMonitor, MonitorEvent
+from tabulate import tabulate
+
+
+class AccessProfile:
+    """
+    Records the accesses made to a memory model as compact counters, rather
+    than retaining an object per access. For every page the number of accesses
+    and bytes read and written are counted, bytes transferred are also counted
+    per time window (giving a bandwidth profile), and the lengths of bursts are
+    recorded as a histogram.
+
+    :param page_size: Size of each page in bytes (must be a power of 2)
+    :param window_ns: Length of each bandwidth window in nanoseconds
+    """
+
+    def __init__(self, page_size: int = 4096, window_ns: int = 1000) -> None:
+        assert (
+            page_size > 0 and (page_size & (page_size - 1)) == 0
+        ), f"Page size {page_size} is not a power of 2"
+        self.page_size = page_size
+        self.window_ns = window_ns
+        self._shift = page_size.bit_length() - 1
+        # Slot allocated to each page, and per-slot counters
+        self._slots: dict[int, int] = {}
+        self.page_reads = array("Q")
+        self.page_writes = array("Q")
+        self.page_read_bytes = array("Q")
+        self.page_write_bytes = array("Q")
+        # Bytes transferred within each time window
+        self.window_read_bytes = array("Q")
+        self.window_write_bytes = array("Q")
+        # Histograms of burst lengths (in beats)
+        self.read_bursts: Counter[int] = Counter()
+        self.write_bursts: Counter[int] = Counter()
+
+    def _slot(self, page: int) -> int:
+        if (slot := self._slots.get(page, None)) is None:
+            slot = self._slots[page] = len(self._slots)
+            for counters in (
+                self.page_reads,
+                self.page_writes,
+                self.page_read_bytes,
+                self.page_write_bytes,
+            ):
+                counters.append(0)
+        return slot
+
+    def record(
+        self,
+        write: bool,
+        address: int,
+        beats: int,
+        beat_bytes: int,
+        timestamp: float,
+        fixed: bool = False,
+    ) -> None:
+        """
+        Record a single burst access.
+
+        :param write:      True for a write, False for a read
+        :param address:    Start address of the burst
+        :param beats:      Number of beats in the burst
+        :param beat_bytes: Number of bytes transferred per beat
+        :param timestamp:  Time of the access in nanoseconds
+        :param fixed:      Whether every beat accesses the same address
+        """
+        total = beats * beat_bytes
+        if write:
+            accesses, counts, windows = (
+                self.page_writes,
+                self.page_write_bytes,
+                self.window_write_bytes,
+            )
+            self.write_bursts[beats] += 1
+        else:
+            accesses, counts, windows = (
+                self.page_reads,
+                self.page_read_bytes,
+                self.window_read_bytes,
+            )
+            self.read_bursts[beats] += 1
+        # Count bytes against each page spanned by the burst
+        end = address + (beat_bytes if fixed else total)
+        for page in range(address >> self._shift, ((end - 1) >> self._shift) + 1):
+            slot = self._slot(page)
+            start = max(address, page << self._shift)
+            stop = min(end, (page + 1) << self._shift)
+            accesses[slot] += 1
+            counts[slot] += total if fixed else (stop - start)
+        # Count bytes against the time window
+        window = int(timestamp // self.window_ns)
+        if (grow := window + 1 - len(windows)) > 0:
+            self.window_read_bytes.extend([0] * grow)
+            self.window_write_bytes.extend([0] * grow)
+        windows[window] += total
+
+    @property
+    def pages(self) -> list[int]:
+        """Page numbers in the order that counters are held"""
+        return list(self._slots.keys())
+
+    def page_rows(self) -> list[tuple[int, int, int, int, int]]:
+        """
+        Return the counters of every accessed page, sorted by address.
+
+        :returns: List of (page address, reads, writes, bytes read, bytes written)
+        """
+        return [
+            (
+                page << self._shift,
+                self.page_reads[slot],
+                self.page_writes[slot],
+                self.page_read_bytes[slot],
+                self.page_write_bytes[slot],
+            )
+            for page, slot in sorted(self._slots.items())
+        ]
+
+    def window_rows(self) -> list[tuple[int, int, int]]:
+        """
+        Return the bytes transferred in every time window.
+
+        :returns: List of (window start in ns, bytes read, bytes written)
+        """
+        return [
+            (index * self.window_ns, read, write)
+            for index, (read, write) in enumerate(
+                zip(self.window_read_bytes, self.window_write_bytes, strict=True)
+            )
+        ]
+
+    def to_numpy(self) -> dict:
+        """
+        Export the profile as NumPy arrays, NumPy is only imported when this is
+        called and is not otherwise a requirement.
+
+        :returns: Dictionary of 'pages' (rows as for page_rows), 'windows' (rows
+                  as for window_rows), and the 'read_bursts' and 'write_bursts'
+                  histograms as (beats, count) rows
+        """
+        import numpy as np
+
+        return {
+            "pages": np.array(self.page_rows(), dtype=np.uint64).reshape(-1, 5),
+            "windows": np.array(self.window_rows(), dtype=np.uint64).reshape(-1, 3),
+            "read_bursts": np.array(
+                sorted(self.read_bursts.items()), dtype=np.uint64
+            ).reshape(-1, 2),
+            "write_bursts": np.array(
+                sorted(self.write_bursts.items()), dtype=np.uint64
+            ).reshape(-1, 2),
+        }
+
+    def to_csv(self, path: Path | str) -> tuple[Path, Path]:
+        """
+        Export the page counters and bandwidth profile as CSV files, named by
+        suffixing the provided path with '_pages' and '_windows'.
+
+        :param path: Base path of the CSV files
+        :returns:    Paths of the page and window CSV files
+        """
+        path = Path(path)
+        pages = path.with_name(f"{path.stem}_pages.csv")
+        windows = path.with_name(f"{path.stem}_windows.csv")
+        with pages.open("w", encoding="utf-8", newline="") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(("address", "reads", "writes", "read_bytes", "write_bytes"))
+            writer.writerows(self.page_rows())
+        with windows.open("w", encoding="utf-8", newline="") as fh:
+            writer = csv.writer(fh)
+            writer.writerow(("time_ns", "read_bytes", "write_bytes"))
+            writer.writerows(self.window_rows())
+        return pages, windows
+
+
+class ComponentStats:
+    """
+    Counters accumulated for a single profiled component or coroutine.
+
+    :param name: Name of the component
+    :param kind: Kind of the component (e.g. driver or monitor)
+    """
+
+    __slots__ = ("name", "kind", "wakeups", "transactions", "seconds")
+
+    def __init__(self, name: str, kind: str) -> None:
+        self.name = name
+        self.kind = kind
+        self.wakeups = 0
+        self.transactions = 0
+        self.seconds = 0.0
+
+
+class _Timed:
+    """
+    Awaitable that passes through the triggers yielded by a coroutine to the
+    scheduler, counting each resume of the coroutine and the time spent within.
+    """
+
+    __slots__ = ("coro", "stats")
+
+    def __init__(self, coro: Coroutine, stats: ComponentStats) -> None:
+        self.coro = coro
+        self.stats = stats
+
+    def __await__(self):
+        coro, stats = self.coro, self.stats
+        send, error = None, None
+        while True:
+            start = time.perf_counter()
+            try:
+                if error is None:
+                    trigger = coro.send(send)
+                else:
+                    trigger = coro.throw(error)
+            except StopIteration as e:
+                return e.value
+            finally:
+                stats.seconds += time.perf_counter() - start
+                stats.wakeups += 1
+            try:
+                send, error = (yield trigger), None
+            except BaseException as e:
+                send, error = None, e
+
+
+class ComponentProfiler:
+    """
+    Opt-in profiling of drivers and monitors, wrapping their drive and monitor
+    coroutines to count the number of times each is woken, the number of
+    transactions handled, and the Python time spent within each component
+    instance. A ranked summary is logged when the test completes, along with
+    the rate of simulation relative to wall-clock time.
+
+    Time spent in a monitor includes the time spent in handlers subscribed to
+    its captures (for example a memory model or the scoreboard), as these are
+    called synchronously.
+
+    :param tb:              Handle to the testbench
+    :param clock_period_ns: Optional clock period, used to report simulated
+                            cycles per wall-clock second
+    :param top:             Number of components to include in the summary (0
+                            includes all components)
+    """
+
+    def __init__(
+        self, tb: BaseBench, clock_period_ns: float | None = None, top: int = 0
+    ) -> None:
+        self.tb = tb
+        self.clock_period_ns = clock_period_ns
+        self.top = top
+        self.log = tb.fork_log("profiler")
+        self.stats: list[ComponentStats] = []
+        self._attached: set[int] = set()
+        # Reference points for simulation rate
+        self._wall_start = time.perf_counter()
+        self._sim_start = get_sim_time(units="ns")
+        # Report once the test completes
+        tb.add_teardown(self._teardown())
+
+    def attach(self, *components: Component) -> None:
+        """
+        Profile one or more drivers or monitors, this must be called before the
+        testbench starts so that the monitor loops are wrapped.
+
+        :param components: The components to profile
+        """
+        for component in components:
+            if id(component) in self._attached:
+                continue
+            self._attached.add(id(component))
+            if isinstance(component, BaseDriver):
+                stats = ComponentStats(component.name, "driver")
+                component.drive = self._wrap_drive(component.drive, stats)
+            elif isinstance(component, BaseMonitor):
+                stats = ComponentStats(component.name, "monitor")
+                component.monitor = self._wrap_monitor(component.monitor, stats)
+                component.subscribe(MonitorEvent.CAPTURE, self._count(stats))
+            else:
+                raise Exception(f"Cannot profile {component}")
+            self.stats.append(stats)
+
+    def attach_all(self) -> None:
+        """
+        Profile every forastero_io driver and monitor registered with the
+        testbench, this must be called after the components are registered.
+        Other components (such as free-running responders) are skipped, as they
+        do not have drive or monitor coroutines to wrap.
+        """
+        self.attach(
+            *(
+                x
+                for x in self.tb._components.values()
+                if isinstance(x, BaseDriver | BaseMonitor)
+                and type(x).__module__.startswith("forastero_io.")
+            )
+        )
+
+    def wrap(self, name: str, coro: Coroutine, kind: str = "coroutine") -> Coroutine:
+        """
+        Profile an arbitrary coroutine (such as a sequence), returning a wrapped
+        coroutine that can be scheduled in its place.
+
+        :param name: Name to report the coroutine under
+        :param coro: The coroutine to profile
+        :param kind: Kind to report the coroutine as
+        :returns:    The wrapped coroutine
+        """
+        stats = ComponentStats(name, kind)
+        self.stats.append(stats)
+
+        async def _wrapped() -> Any:
+            return await _Timed(coro, stats)
+
+        return _wrapped()
+
+    @staticmethod
+    def _wrap_drive(drive, stats: ComponentStats):
+        async def _drive(obj) -> None:
+            stats.transactions += 1
+            await _Timed(drive(obj), stats)
+
+        return _drive
+
+    @staticmethod
+    def _wrap_monitor(monitor, stats: ComponentStats):
+        async def _monitor(capture) -> None:
+            await _Timed(monitor(capture), stats)
+
+        return _monitor
+
+    @staticmethod
+    def _count(stats: ComponentStats):
+        def _handler(component, event, obj) -> None:
+            stats.transactions += 1
+
+        return _handler
+
+    def summary(self) -> str:
+        """
+        Summarise the profile, ranking components by the Python time spent.
+
+        :returns: The summary as a string
+        """
+        wall = time.perf_counter() - self._wall_start
+        sim_ns = get_sim_time(units="ns") - self._sim_start
+        ranked = sorted(self.stats, key=lambda x: x.seconds, reverse=True)
+        if self.top:
+            ranked = ranked[: self.top]
+        total = sum(x.seconds for x in self.stats) or 1.0
+        rows = [
+            (
+                x.name,
+                x.kind,
+                x.wakeups,
+                x.transactions,
+                f"{x.seconds:.3f}",
+                f"{100 * x.seconds / total:.1f}",
+                f"{1e6 * x.seconds / x.wakeups:.2f}" if x.wakeups else "-",
+            )
+            for x in ranked
+        ]
+        table = tabulate(
+            rows,
+            headers=[
+                "Component",
+                "Kind",
+                "Wakeups",
+                "Transactions",
+                "Time (s)",
+                "Share (%)",
+                "us/Wakeup",
+            ],
+            tablefmt="grid",
+        )
+        rate = f"{sim_ns / wall:,.0f} ns" if wall > 0 else "-"
+        if self.clock_period_ns and wall > 0:
+            rate += f" ({sim_ns / self.clock_period_ns / wall:,.0f} cycles)"
+        return f"{table}\nSimulated {rate} per wall-clock second"
+
+    async def _teardown(self) -> None:
+        self.log.info(f"Component profile:\n{self.summary()}")
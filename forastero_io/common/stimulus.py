@@ -0,0 +1,220 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+import abc
+import itertools
+from collections.abc import Sequence
+from random import Random
+
+# Native formats used to unpack random bytes into words of up to 64 bits
+NATIVE_FORMATS = ((8, "B"), (16, "H"), (32, "I"), (64, "Q"))
+
+# Tables reducing random bytes to fewer bits, indexed by the number of bits
+NARROW_TABLES = [bytes(x >> (8 - bits) for x in range(256)) for bits in range(9)]
+
+
+def random_words(random: Random, width: int, count: int) -> list[int]:
+    """
+    Generate a batch of random words. Words of up to 64 bits are unpacked from a
+    single block of random bytes, which is considerably cheaper than drawing
+    each word separately.
+
+    :param random: Random instance to draw from
+    :param width:  Width of each word in bits
+    :param count:  Number of words to generate
+    :returns:      List of random words
+    """
+    if width <= 0:
+        return [0] * count
+    if width < 8:
+        return list(random.randbytes(count).translate(NARROW_TABLES[width]))
+    for native, fmt in NATIVE_FORMATS:
+        if width <= native:
+            words = memoryview(random.randbytes(count * native // 8)).cast(fmt)
+            if width == native:
+                return words.tolist()
+            return [x >> (native - width) for x in words]
+    return [random.getrandbits(width) for _ in range(count)]
+
+
+class Pattern(abc.ABC):
+    """
+    Base for patterns generating batches of addresses or data, some patterns
+    hold state so that consecutive batches continue from where the last ended.
+    """
+
+    @abc.abstractmethod
+    def generate(self, random: Random, count: int, width: int) -> list[int]:
+        """
+        Generate a batch of values.
+
+        :param random: Random instance to draw from
+        :param count:  Number of values to generate
+        :param width:  Width of the field the values are for in bits
+        :returns:      List of values
+        """
+
+
+class RandomPattern(Pattern):
+    """
+    Uniformly random values within a range, aligned to a boundary. Without a
+    range the values span the full width of the field.
+
+    :param low:   Lowest value (inclusive)
+    :param high:  Highest value (exclusive), defaults to the top of the field
+    :param align: Alignment of each value
+    """
+
+    def __init__(self, low: int = 0, high: int | None = None, align: int = 1) -> None:
+        self.low = low
+        self.high = high
+        self.align = align
+
+    def generate(self, random: Random, count: int, width: int) -> list[int]:
+        high = (1 << width) if self.high is None else self.high
+        slots = (high - self.low) // self.align
+        # Draw whole words where the number of slots is a power of 2
+        if (slots & (slots - 1)) == 0:
+            offsets = random_words(random, slots.bit_length() - 1, count)
+        else:
+            offsets = random.choices(range(slots), k=count)
+        if self.low == 0 and self.align == 1:
+            return offsets
+        return [self.low + (x * self.align) for x in offsets]
+
+
+class ChoicePattern(Pattern):
+    """
+    Values chosen uniformly from a list.
+
+    :param values: Values to choose between
+    """
+
+    def __init__(self, values: Sequence[int]) -> None:
+        self.values = list(values)
+
+    def generate(self, random: Random, count: int, width: int) -> list[int]:
+        return random.choices(self.values, k=count)
+
+
+class HotspotPattern(Pattern):
+    """
+    Values chosen from a list with a Zipf distribution, so that the first value
+    is the hottest, the second is chosen half as often (with an exponent of 1),
+    the third a third as often, and so on.
+
+    :param values:   Values to choose between, from hottest to coldest
+    :param exponent: Exponent of the Zipf distribution
+    """
+
+    def __init__(self, values: Sequence[int], exponent: float = 1.0) -> None:
+        self.values = list(values)
+        self.exponent = exponent
+        self._cum_weights = list(
+            itertools.accumulate(
+                1 / (x**exponent) for x in range(1, len(self.values) + 1)
+            )
+        )
+
+    def generate(self, random: Random, count: int, width: int) -> list[int]:
+        return random.choices(self.values, cum_weights=self._cum_weights, k=count)
+
+
+class StridePattern(Pattern):
+    """
+    Values advancing by a fixed stride, returning to the base after a number of
+    steps (for example to sweep a buffer repeatedly).
+
+    :param base:   First value
+    :param stride: Increment between values
+    :param steps:  Number of values before returning to the base (0 never
+                   returns)
+    """
+
+    def __init__(self, base: int = 0, stride: int = 1, steps: int = 0) -> None:
+        self.base = base
+        self.stride = stride
+        self.steps = steps
+        self._index = 0
+
+    def generate(self, random: Random, count: int, width: int) -> list[int]:
+        first = self._index
+        self._index += count
+        if self.steps:
+            self._index %= self.steps
+            return [
+                self.base + ((x % self.steps) * self.stride)
+                for x in range(first, first + count)
+            ]
+        return [self.base + (x * self.stride) for x in range(first, first + count)]
+
+
+class PageSequentialPattern(Pattern):
+    """
+    Values walking sequentially through a randomly chosen page, then moving on
+    to another randomly chosen page (in the style of a DMA or cache line fill).
+
+    :param low:       Lowest address of the region (aligned to the page size)
+    :param high:      Highest address of the region (exclusive)
+    :param page_size: Size of each page
+    :param stride:    Increment between values within a page
+    """
+
+    def __init__(
+        self, low: int, high: int, page_size: int = 4096, stride: int = 4
+    ) -> None:
+        assert 0 < stride <= page_size, "Stride must be within the page size"
+        self.low = low
+        self.pages = (high - low) // page_size
+        self.page_size = page_size
+        self.stride = stride
+        self._page = None
+        self._offset = 0
+
+    def generate(self, random: Random, count: int, width: int) -> list[int]:
+        values = []
+        while len(values) < count:
+            if self._page is None or self._offset + self.stride > self.page_size:
+                self._page = self.low + (random.randrange(self.pages) * self.page_size)
+                self._offset = 0
+            take = min(
+                count - len(values), (self.page_size - self._offset) // self.stride
+            )
+            start = self._page + self._offset
+            values.extend(range(start, start + (take * self.stride), self.stride))
+            self._offset += take * self.stride
+        return values
+
+
+class IncrementPattern(Pattern):
+    """
+    Values incrementing by a fixed step, wrapping at the width of the field
+    (useful for data that is easy to identify in waveforms).
+
+    :param start: First value
+    :param step:  Increment between values
+    """
+
+    def __init__(self, start: int = 0, step: int = 1) -> None:
+        self.next = start
+        self.step = step
+
+    def generate(self, random: Random, count: int, width: int) -> list[int]:
+        mask = (1 << width) - 1
+        first = self.next
+        self.next = (first + (count * self.step)) & mask
+        return [(first + (x * self.step)) & mask for x in range(count)]
+
+
+class ConstantPattern(Pattern):
+    """
+    The same value every time.
+
+    :param value: The value
+    """
+
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+    def generate(self, random: Random, count: int, width: int) -> list[int]:
+        return [self.value] * count
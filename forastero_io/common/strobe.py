@@ -0,0 +1,92 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+import itertools
+
+# Byte mask for every combination of 8 byte lanes, both as little-endian bytes
+# (used to assemble masks for wider strobes) and as an integer
+LANE_BYTES = tuple(
+    bytes(0xFF if (strobe >> lane) & 1 else 0 for lane in range(8))
+    for strobe in range(256)
+)
+LANE_MASKS = tuple(int.from_bytes(x, "little") for x in LANE_BYTES)
+
+
+class ByteStrobe:
+    """
+    Converts between byte strobes and bit masks for a bus of a given width,
+    expanding strobes 8 lanes at a time through a lookup table rather than
+    testing every lane. Masks of full strobes are returned without any expansion
+    and strobes of up to 8 lanes are a single table lookup, so the cost of a
+    partial write grows with the number of strobe bytes rather than lanes.
+
+    :param byte_width: Width of the bus in bytes
+    """
+
+    def __init__(self, byte_width: int) -> None:
+        self.byte_width = byte_width
+        self.bit_width = byte_width * 8
+        self.mask = (1 << self.bit_width) - 1
+        self.full = (1 << byte_width) - 1
+        self._strobe_bytes = (byte_width + 7) // 8
+
+    def lanes(self, strobe: int) -> bytes:
+        """
+        Expand a byte strobe into one byte per lane (0xFF where the lane is
+        enabled and 0x00 otherwise), in lane order.
+
+        :param strobe: The byte strobe
+        :returns:      Expanded lanes
+        """
+        strobe &= self.full
+        expanded = b"".join(
+            map(LANE_BYTES.__getitem__, strobe.to_bytes(self._strobe_bytes, "little"))
+        )
+        return expanded[: self.byte_width]
+
+    def expand(self, strobe: int) -> int:
+        """
+        Expand a byte strobe into a bit mask.
+
+        :param strobe: The byte strobe
+        :returns:      Mask with all bits of each enabled lane set
+        """
+        strobe &= self.full
+        if strobe == self.full:
+            return self.mask
+        if strobe < 256:
+            return LANE_MASKS[strobe]
+        return int.from_bytes(self.lanes(strobe), "little")
+
+    def merge(self, current: int, data: int, strobe: int) -> int:
+        """
+        Merge data into a word according to a byte strobe.
+
+        :param current: Current value of the word
+        :param data:    Data to merge
+        :param strobe:  Byte strobe selecting the bytes of data to merge
+        :returns:       The merged word
+        """
+        strobe &= self.full
+        if strobe == self.full:
+            return data
+        if not strobe:
+            return current
+        bits = self.expand(strobe)
+        return (data & bits) | (current & (self.mask ^ bits))
+
+    def select(self, data: int, strobe: int) -> bytes:
+        """
+        Extract the bytes of the enabled lanes of a data word, in lane order (for
+        example to extract the payload of a beat of a packet using TKEEP).
+
+        :param data:   The data word
+        :param strobe: The byte strobe
+        :returns:      Bytes of the enabled lanes
+        """
+        strobe &= self.full
+        raw = (data & self.mask).to_bytes(self.byte_width, "little")
+        # Contiguous strobes from lane 0 (i.e. the tail of a packet) are a slice
+        if (strobe & (strobe + 1)) == 0:
+            return raw[: strobe.bit_length()]
+        return bytes(itertools.compress(raw, self.lanes(strobe)))
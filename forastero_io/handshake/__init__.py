@@ -3,7 +3,7 @@
 
 from .io import HandshakeIO
 from .requestor import HandshakeRequestDriver, HandshakeRequestMonitor
-from .responder import HandshakeResponderDriver
+from .responder import HandshakeAutoResponder, HandshakeResponderDriver
 from .transaction import HandshakeAck, HandshakeReq
 
 assert all(
@@ -12,6 +12,7 @@ assert all(
         HandshakeRequestMonitor,
         HandshakeIO,
         HandshakeResponderDriver,
+        HandshakeAutoResponder,
         HandshakeReq,
         HandshakeAck,
     )
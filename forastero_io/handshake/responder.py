@@ -1,7 +1,9 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2023-2024 Vypercore. All Rights Reserved
 
+import cocotb
 from cocotb.triggers import ClockCycles, RisingEdge
+from forastero.component import Component
 from forastero.driver import BaseDriver
 
 from .transaction import HandshakeAck
@@ -21,3 +23,66 @@ class HandshakeResponderDriver(BaseDriver):
         await RisingEdge(self.clk)
         # Clear the ack
         self.io.set("ack", 0)
+
+
+class HandshakeAutoResponder(Component):
+    """
+    Free-running responder that acknowledges every request without needing a
+    transaction to be queued per request. The delay before each acknowledgement
+    is drawn from a buffer that is filled once at the start of the test, and
+    while no request is pending the responder sleeps on an edge of REQ rather
+    than waking on every clock cycle.
+
+    :param delay_range: Minimum and maximum number of cycles to delay each
+                        acknowledgement by
+    :param weights:     Optional weighting for each delay in the range
+    :param buffer_size: Number of delays to precompute, these are used cyclically
+    """
+
+    def __init__(
+        self,
+        *args,
+        delay_range: tuple[int, int] = (1, 1),
+        weights: list[float] | None = None,
+        buffer_size: int = 1024,
+        **kwds,
+    ) -> None:
+        super().__init__(*args, **kwds)
+        self.delay_range = delay_range
+        self.weights = weights
+        self.buffer_size = buffer_size
+        cocotb.start_soon(self._respond())
+
+    async def _respond(self) -> None:
+        await self.tb.ready()
+        await RisingEdge(self.clk)
+        self._ready.set()
+        # Precompute delays (after the testbench has seeded this component)
+        delays = self.random.choices(
+            range(min(self.delay_range), max(self.delay_range) + 1),
+            weights=self.weights,
+            k=self.buffer_size,
+        )
+        # NOTE: Edge triggers require the simulator handle, not the wrapper
+        req = self.io.req._hier
+        index = 0
+        while True:
+            # Sleep until a request is raised, then align to the clock edge
+            # where it is first sampled
+            if not self.io.get("req"):
+                await RisingEdge(req)
+                await RisingEdge(self.clk)
+            if self.rst.value == 1:
+                await RisingEdge(self.clk)
+                continue
+            # Delay, then acknowledge for a single cycle
+            await self.lock()
+            if delay := delays[index]:
+                await ClockCycles(self.clk, delay)
+            index = (index + 1) % self.buffer_size
+            self.io.set("ack", 1)
+            await RisingEdge(self.clk)
+            self.io.set("ack", 0)
+            self.release()
+            # The next request cannot be sampled until the following edge
+            await RisingEdge(self.clk)
@@ -2,6 +2,7 @@
 # Copyright (c) 2023-2024 Vypercore. All Rights Reserved
 
 from .io import MappedRequestIO, MappedResponseIO
+from .memory import MappedMemoryModel
 from .request import (
     MappedRequestInitiator,
     MappedRequestMonitor,
@@ -14,6 +15,7 @@ from .response import (
 )
 from .sequences import (
     mapped_delayed_response_seq,
+    mapped_feed_seq,
     mapped_random_reads_seq,
     mapped_random_writes_seq,
     mapped_req_backpressure_seq,
@@ -29,6 +31,7 @@ assert all(
         # Classes
         MappedAccess,
         MappedBackpressure,
+        MappedMemoryModel,
         MappedRequest,
         MappedRequestInitiator,
         MappedRequestIO,
@@ -41,6 +44,7 @@ assert all(
         MappedResponseResponder,
         # Sequences
         mapped_delayed_response_seq,
+        mapped_feed_seq,
         mapped_random_reads_seq,
         mapped_random_writes_seq,
         mapped_req_backpressure_seq,
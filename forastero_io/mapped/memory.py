@@ -0,0 +1,204 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+import heapq
+import itertools
+from random import Random
+
+import cocotb
+from cocotb.triggers import Event, RisingEdge
+from forastero.bench import BaseBench
+from forastero.driver import DriverEvent
+from forastero.monitor import MonitorEvent
+
+from ..common.memory import MemoryBackdoor, SharedMemory
+from .request import MappedRequestMonitor, MappedRequestResponder
+from .response import MappedResponseInitiator
+from .transaction import MappedAccess, MappedRequest, MappedResponse
+
+
+class MappedMemoryModel(MemoryBackdoor):
+    """
+    Sparse memory model serving a mapped interface, accepting requests from a
+    MappedRequestMonitor and returning responses through a
+    MappedResponseInitiator. Responses to the same ident are always returned in
+    request order, while responses to different idents may be reordered as the
+    latency of each request is drawn independently.
+
+    Mapped addresses index elements of the data width (as opposed to bytes), so
+    element N occupies bytes N * byte_width onwards of the backing store - this
+    matters when sharing a store with models of other protocols, or when using
+    backdoor access (which always uses byte addresses).
+
+    :param tb:              Handle to the testbench
+    :param reqmon:          Monitor capturing requests
+    :param rspdrv:          Initiator driving responses
+    :param reqrsp:          Optional responder for the request interface, this is
+                            required when max_outstanding is set as the model
+                            takes ownership of the request READY signal
+    :param error_noninit:   Raise an error on reads from uninitialised addresses
+    :param rand_noninit:    Return random data from uninitialised addresses,
+                            otherwise uninitialised addresses read as zero
+    :param hash_noninit:    Derive random data for uninitialised addresses from
+                            a hash of the address, rather than storing it
+    :param respond_writes:  Whether write requests should produce a response
+    :param max_outstanding: Maximum number of requests awaiting a response before
+                            the request interface is backpressured (0 disables
+                            the limit)
+    :param latency:         Minimum and maximum number of cycles between a request
+                            being accepted and its response being presented
+    :param latency_weights: Optional weighting for each latency in the range
+    :param page_size:       Size of the pages that memory contents are hashed in,
+                            used when comparing memories with diff
+    :param store:           Optional SharedMemory to use as the backing store, for
+                            example to share memory contents with other ports
+                            (error_noninit, rand_noninit, hash_noninit, and
+                            page_size are then taken from the store)
+    """
+
+    def __init__(
+        self,
+        tb: BaseBench,
+        reqmon: MappedRequestMonitor,
+        rspdrv: MappedResponseInitiator,
+        reqrsp: MappedRequestResponder | None = None,
+        error_noninit: bool = True,
+        rand_noninit: bool = True,
+        hash_noninit: bool = False,
+        respond_writes: bool = True,
+        max_outstanding: int = 0,
+        latency: tuple[int, int] = (1, 1),
+        latency_weights: list[float] | None = None,
+        page_size: int = 4096,
+        store: SharedMemory | None = None,
+    ) -> None:
+        # Sanity checks
+        assert min(latency) >= 1, "Responses must be at least one cycle after requests"
+        assert (
+            max_outstanding == 0 or reqrsp is not None
+        ), "A request responder is required to limit outstanding requests"
+        # Hold references
+        self.reqmon = reqmon
+        self.rspdrv = rspdrv
+        self.reqrsp = reqrsp
+        self.error_noninit = error_noninit
+        self.rand_noninit = rand_noninit
+        self.hash_noninit = hash_noninit
+        self.respond_writes = respond_writes
+        self.max_outstanding = max_outstanding
+        self.latencies = range(min(latency), max(latency) + 1)
+        self.latency_weights = latency_weights
+        # Fork logging and random from testbench
+        self.log = tb.fork_log("mappedmem")
+        self.random = Random(tb.random.random())
+        # Calculate widths and masks
+        self.bit_width = max(self.reqmon.io.width("data"), self.rspdrv.io.width("data"))
+        self.byte_width = (self.bit_width + 7) // 8
+        self.mask = (1 << self.bit_width) - 1
+        # Create a private store unless a shared store has been provided
+        if store is None:
+            store = SharedMemory(
+                tb,
+                self.byte_width,
+                error_noninit=error_noninit,
+                rand_noninit=rand_noninit,
+                hash_noninit=hash_noninit,
+                page_size=page_size,
+            )
+        self.store = store
+        self.port = store.port(self.byte_width)
+        self.memory = store.memory
+        # Cycle counter maintained by the scheduler (only advances while there
+        # are responses pending, as all latencies are relative)
+        self._cycle = 0
+        # Pending responses held as a heap of (due cycle, sequence, response)
+        self._pending: list[tuple[int, int, MappedResponse]] = []
+        self._sequence = itertools.count()
+        self._wakeup = Event()
+        # Latest due cycle per ident (used to preserve per-ident ordering)
+        self._ident_due: dict[int, int] = {}
+        # Responses issued by the model that have not yet been driven, keyed by
+        # ID of the response (which is held, so the ID cannot be reused) along
+        # with the batch of writes each one retires
+        self._issued: dict[int, tuple[MappedResponse, list | None]] = {}
+        # Count of requests accepted but not yet responded to
+        self.outstanding = 0
+        # Subscribe to events
+        self.reqmon.subscribe(MonitorEvent.CAPTURE, self._handle)
+        self.rspdrv.subscribe(DriverEvent.POST_DRIVE, self._retire)
+        # Start the response scheduler
+        cocotb.start_soon(self._schedule())
+
+    def read(self, address: int, check: bool = True) -> int:
+        return self.port.read(address * self.byte_width, check=check)
+
+    def write(self, address: int, data: int, strobe: int) -> None:
+        self.port.write(address * self.byte_width, data, strobe)
+
+    def diff(self, other) -> list[tuple[int, int]]:
+        """
+        Compare the contents of this memory against another memory model or an
+        image mapping addresses to data words, see PagedMemory.diff. The backing
+        store is byte addressed, so an image must be keyed by byte address (i.e.
+        element N of the mapped interface at N * byte_width) and the differing
+        ranges are returned as byte addresses.
+
+        :param other: Memory model, PagedMemory, or image to compare against
+        :returns:     List of differing byte address ranges as (start, end)
+        """
+        return self.memory.diff(getattr(other, "memory", other))
+
+    def _handle(self, component, event, obj: MappedRequest) -> None:
+        # Perform the access immediately, so later requests observe the result
+        if obj.mode is MappedAccess.WRITE:
+            self.write(obj.address, obj.data, obj.strobe)
+            batch = self.port.commit()
+            if not self.respond_writes:
+                self.port.retire(batch)
+                return
+            response = MappedResponse(ident=obj.ident)
+        else:
+            batch = None
+            response = MappedResponse(ident=obj.ident, data=self.read(obj.address))
+        self._issued[id(response)] = (response, batch)
+        # Draw a latency, never overtaking an earlier response to the same ident
+        latency = self.random.choices(
+            self.latencies, weights=self.latency_weights, k=1
+        )[0]
+        due = max(self._cycle + latency, self._ident_due.get(obj.ident, 0))
+        self._ident_due[obj.ident] = due
+        heapq.heappush(self._pending, (due, next(self._sequence), response))
+        self._wakeup.set()
+        # Apply backpressure once the outstanding limit is reached
+        self.outstanding += 1
+        if self.max_outstanding and self.outstanding >= self.max_outstanding:
+            self.reqrsp.io.set("ready", 0)
+
+    def _retire(self, component, event, obj: MappedResponse) -> None:
+        # Ignore responses that were not issued by the model
+        if (issued := self._issued.pop(id(obj), None)) is None:
+            return
+        # Writes become visible to other ports once their response is issued,
+        # retiring the batch of this response (as responses may be reordered)
+        if issued[1] is not None:
+            self.port.retire(issued[1])
+        self.outstanding -= 1
+        if self.max_outstanding and self.outstanding < self.max_outstanding:
+            self.reqrsp.io.set("ready", 1)
+
+    async def _schedule(self) -> None:
+        clk = self.rspdrv.clk
+        # Take ownership of the request READY signal if limiting outstanding
+        await self.rspdrv.ready()
+        if self.max_outstanding:
+            self.reqrsp.io.set("ready", int(self.outstanding < self.max_outstanding))
+        while True:
+            # Sleep until there is something to schedule
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            await RisingEdge(clk)
+            self._cycle += 1
+            # Release all responses that have fallen due, in due order
+            while self._pending and self._pending[0][0] <= self._cycle:
+                self.rspdrv.enqueue(heapq.heappop(self._pending)[2])
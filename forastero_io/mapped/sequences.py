@@ -3,11 +3,15 @@
 
 # Common sequences used by testcases in mapped
 
+from random import Random
+
 import forastero
 from cocotb.triggers import ClockCycles
 from forastero.driver import DriverEvent
 from forastero.sequence import SeqContext, SeqProxy
 
+from ..common.feed import Source, feed_driver
+from ..common.stimulus import ChoicePattern, Pattern, RandomPattern, random_words
 from .request import MappedRequestInitiator, MappedRequestResponder
 from .response import MappedResponseInitiator, MappedResponseResponder
 from .transaction import MappedAccess, MappedBackpressure, MappedRequest, MappedResponse
@@ -61,6 +65,14 @@ async def mapped_rsp_no_backpressure_seq(
     driver.enqueue(MappedBackpressure(ready=True, cycles=1))
 
 
+def _address_pattern(addresses: list[int] | None, pattern: Pattern | None) -> Pattern:
+    if pattern is not None:
+        return pattern
+    if addresses:
+        return ChoicePattern(addresses)
+    return RandomPattern()
+
+
 @forastero.sequence()
 @forastero.requires("driver", MappedRequestInitiator)
 async def mapped_random_reads_seq(
@@ -68,20 +80,34 @@ async def mapped_random_reads_seq(
     driver: SeqProxy[MappedRequestInitiator],
     length: int = 1000,
     addresses: list[int] | None = None,
+    pattern: Pattern | None = None,
+    batch: int = 256,
 ) -> None:
-    for _ in range(length):
-        async with ctx.lock(driver):
-            if addresses:
-                address = ctx.random.choice(addresses)
-            else:
-                address = ctx.random.getrandbits(driver.io.width("addr"))
-            driver.enqueue(
-                MappedRequest(
-                    ident=ctx.random.getrandbits(driver.io.width("id")),
-                    address=address,
-                    mode=MappedAccess.READ,
-                )
+    """
+    Generate read requests, with requests being generated and enqueued in
+    batches (under a single lock acquisition) to minimise the cost of stimulus.
+
+    :param length:    Number of requests to generate
+    :param addresses: Optional list of addresses to choose from at random
+    :param pattern:   Optional address pattern, overriding addresses
+    :param batch:     Number of requests to generate and enqueue at once
+    """
+    random = Random(ctx.random.random())
+    pattern = _address_pattern(addresses, pattern)
+    id_width, addr_width = driver.io.width("id"), driver.io.width("addr")
+    for offset in range(0, length, batch):
+        count = min(batch, length - offset)
+        requests = [
+            MappedRequest(ident=ident, address=address, mode=MappedAccess.READ)
+            for ident, address in zip(
+                random_words(random, id_width, count),
+                pattern.generate(random, count, addr_width),
+                strict=True,
             )
+        ]
+        async with ctx.lock(driver):
+            for request in requests:
+                driver.enqueue(request)
 
 
 @forastero.sequence()
@@ -91,22 +117,67 @@ async def mapped_random_writes_seq(
     driver: SeqProxy[MappedRequestInitiator],
     length: int = 1000,
     addresses: list[int] | None = None,
+    pattern: Pattern | None = None,
+    data: Pattern | None = None,
+    batch: int = 256,
 ) -> None:
-    for _ in range(length):
-        async with ctx.lock(driver):
-            if addresses:
-                address = ctx.random.choice(addresses)
-            else:
-                address = ctx.random.getrandbits(driver.io.width("addr"))
-            driver.enqueue(
-                MappedRequest(
-                    ident=ctx.random.getrandbits(driver.io.width("id")),
-                    address=address,
-                    mode=MappedAccess.WRITE,
-                    data=ctx.random.getrandbits(driver.io.width("data")),
-                    strobe=ctx.random.getrandbits(driver.io.width("strobe")),
-                )
+    """
+    Generate write requests with random strobes, with requests being generated
+    and enqueued in batches (under a single lock acquisition) to minimise the
+    cost of stimulus.
+
+    :param length:    Number of requests to generate
+    :param addresses: Optional list of addresses to choose from at random
+    :param pattern:   Optional address pattern, overriding addresses
+    :param data:      Optional data pattern (defaults to random data)
+    :param batch:     Number of requests to generate and enqueue at once
+    """
+    random = Random(ctx.random.random())
+    pattern = _address_pattern(addresses, pattern)
+    data = RandomPattern() if data is None else data
+    id_width, addr_width = driver.io.width("id"), driver.io.width("addr")
+    data_width, strb_width = driver.io.width("data"), driver.io.width("strobe")
+    for offset in range(0, length, batch):
+        count = min(batch, length - offset)
+        requests = [
+            MappedRequest(
+                ident=ident,
+                address=address,
+                mode=MappedAccess.WRITE,
+                data=value,
+                strobe=strobe,
             )
+            for ident, address, value, strobe in zip(
+                random_words(random, id_width, count),
+                pattern.generate(random, count, addr_width),
+                data.generate(random, count, data_width),
+                random_words(random, strb_width, count),
+                strict=True,
+            )
+        ]
+        async with ctx.lock(driver):
+            for request in requests:
+                driver.enqueue(request)
+
+
+@forastero.sequence(auto_lock=True)
+@forastero.requires("driver", MappedRequestInitiator)
+async def mapped_feed_seq(
+    ctx: SeqContext,
+    driver: SeqProxy[MappedRequestInitiator],
+    source: Source,
+    high: int = 16,
+    low: int | None = None,
+) -> None:
+    """
+    Drive requests drawn lazily from an iterable or asynchronous iterable, with
+    no more than the high watermark queued ahead of the driver at any time.
+
+    :param source: MappedRequest objects to drive
+    :param high:   Maximum number of requests queued ahead of the driver
+    :param low:    Number of queued requests at which drawing resumes
+    """
+    await feed_driver(driver, source, high=high, low=low)
 
 
 @forastero.sequence(auto_lock=True)
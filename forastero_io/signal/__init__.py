@@ -1,18 +1,26 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2023-2024 Vypercore. All Rights Reserved
 
-from .driver import SignalDriver
-from .io import SignalIO
-from .monitor import SignalMonitor
+from .driver import SignalBankDriver, SignalDriver
+from .io import SignalBankIO, SignalIO
+from .monitor import SignalBankMonitor, SignalMonitor
 from .sequences import random_signal_seq
-from .transaction import SignalState
+from .transaction import SignalBankChange, SignalHold, SignalState, SignalWaveform
+from .waveform import WaveformFile
 
 assert all(
     (
+        SignalBankChange,
+        SignalBankDriver,
+        SignalBankIO,
+        SignalBankMonitor,
         SignalDriver,
+        SignalHold,
         SignalIO,
         SignalMonitor,
         SignalState,
+        SignalWaveform,
+        WaveformFile,
         random_signal_seq,
     )
 )
@@ -4,10 +4,35 @@
 from cocotb.triggers import ClockCycles
 from forastero.driver import BaseDriver
 
-from .transaction import SignalState
+from .transaction import SignalState, SignalWaveform
 
 
 class SignalDriver(BaseDriver):
-    async def drive(self, transaction: SignalState):
-        self.io.signal.value = transaction.value
-        await ClockCycles(self.clk, transaction.cycles)
+    async def drive(self, transaction: SignalState | SignalWaveform):
+        if isinstance(transaction, SignalWaveform):
+            signal = self.io.signal
+            for steps in transaction.passes():
+                for value, cycles in steps:
+                    signal.value = int(value)
+                    if cycles > 0:
+                        await ClockCycles(self.clk, int(cycles))
+        else:
+            self.io.signal.value = transaction.value
+            await ClockCycles(self.clk, transaction.cycles)
+
+
+class SignalBankDriver(BaseDriver):
+    """
+    Plays back a SignalWaveform onto a bank of signals (wrapped by SignalBankIO),
+    where each step provides one value per signal (in the order the signals were
+    provided to the SignalBankIO) followed by the number of cycles to hold them.
+    """
+
+    async def drive(self, transaction: SignalWaveform):
+        signals = list(self.io.signals.values())
+        for steps in transaction.passes():
+            for *values, cycles in steps:
+                for signal, value in zip(signals, values, strict=True):
+                    signal.value = int(value)
+                if cycles > 0:
+                    await ClockCycles(self.clk, int(cycles))
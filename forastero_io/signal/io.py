@@ -13,3 +13,22 @@ class SignalIO(BaseIO):
     def initialise(self, _role: IORole):
         if self._role == IORole.INITIATOR:
             self.signal.value = 0
+
+
+class SignalBankIO(BaseIO):
+    """
+    Wraps a named collection of independent signals, for example a set of
+    interrupt lines, so that they can be handled by a single component.
+
+    :param signals: Mapping from a name to each signal
+    :param role:    Role of the signals on the DUT boundary
+    """
+
+    def __init__(self, signals: dict[str, HierarchyObject], role: IORole):
+        self.signals = dict(signals)
+        self._role = role
+
+    def initialise(self, _role: IORole):
+        if self._role == IORole.INITIATOR:
+            for signal in self.signals.values():
+                signal.value = 0
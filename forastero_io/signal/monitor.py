@@ -1,10 +1,10 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2023-2024 Vypercore. All Rights Reserved
 
-from cocotb.triggers import RisingEdge
+from cocotb.triggers import Edge, First, RisingEdge
 from forastero.monitor import BaseMonitor
 
-from .transaction import SignalState
+from .transaction import SignalBankChange, SignalHold, SignalState
 
 
 class SignalMonitor(BaseMonitor):
@@ -15,22 +15,127 @@ class SignalMonitor(BaseMonitor):
                          for every rising edge of the clock where the signal is
                          not zero. When cap_non_zero = False, the monitor will
                          capture whenever the signal changes.
+    :param run_length:   When run_length = True, the monitor will instead capture
+                         a SignalHold each time the signal changes, recording the
+                         previous value along with the cycle it started on and
+                         how many cycles it was held for (if cap_non_zero is also
+                         set, periods where the signal was zero are not captured).
+                         A hold that is cut short by reset, or still open when
+                         the test ends, is captured up to that point.
     """
 
-    def __init__(self, *args, cap_non_zero=False, **kwds):
+    def __init__(self, *args, cap_non_zero=False, run_length=False, **kwds):
         super().__init__(*args, **kwds)
         self.cap_non_zero = cap_non_zero
+        self.run_length = run_length
+        # Value, start cycle, and current cycle of the open hold (if any)
+        self._held: int | None = None
+        self._start = self._cycle = 0
+        # Capture callback of the running monitor, which also flushes the open
+        # hold at the end of the test so that it is counted like any other
+        self._capture = None
+        if run_length:
+            self.tb.add_teardown(self._teardown())
+
+    def _close(self, capture) -> None:
+        # Capture the open hold (if any) up to the current cycle
+        if self._held is None:
+            return
+        if (self._cycle > self._start) and (not self.cap_non_zero or self._held != 0):
+            capture(
+                SignalHold(
+                    value=self._held,
+                    start=self._start,
+                    cycles=self._cycle - self._start,
+                )
+            )
+        self._held = None
+
+    async def _teardown(self) -> None:
+        if self._held is not None:
+            self.log.debug(
+                f"Capturing hold of 0x{self._held:X} still open at the end of the test"
+            )
+            self._close(self._capture)
 
     async def monitor(self, capture):
+        self._capture = capture
         last_state = int(self.io.signal.value)
+        self._held = None
+        self._start = self._cycle = 0
         while True:
             await RisingEdge(self.clk)
+            self._cycle += 1
             if self.rst.value == 1:
+                self._close(capture)
                 await RisingEdge(self.clk)
+                self._cycle += 1
                 last_state = int(self.io.signal.value)
+                self._start = self._cycle
                 continue
             curr_state = int(self.io.signal.value)
-            if (self.cap_non_zero and curr_state != 0) or (
+            if self.run_length:
+                # Holds are only opened once out of reset
+                if self._held is None:
+                    self._held = last_state
+                if curr_state != last_state:
+                    self._close(capture)
+                    self._held = curr_state
+                    self._start = self._cycle
+            elif (self.cap_non_zero and curr_state != 0) or (
                 not self.cap_non_zero and curr_state != last_state
             ):
                 capture(SignalState(value=curr_state))
+            last_state = curr_state
+
+
+class SignalBankMonitor(BaseMonitor):
+    """
+    Monitors a bank of signals (wrapped by SignalBankIO) from a single coroutine,
+    capturing a SignalBankChange for each signal whose value differs from the
+    previous sample. The values of all signals are packed into a single integer
+    so that cycles where nothing changes can be skipped with one comparison.
+
+    :param on_edge: When on_edge = True, the monitor sleeps until any signal in
+                    the bank changes and then samples on the next rising edge of
+                    the clock. When on_edge = False, the monitor samples on every
+                    rising edge of the clock.
+    """
+
+    def __init__(self, *args, on_edge: bool = False, **kwds):
+        super().__init__(*args, **kwds)
+        self.on_edge = on_edge
+
+    async def monitor(self, capture):
+        # Determine where each signal sits within the packed value
+        members = []
+        offset = 0
+        for name, signal in self.io.signals.items():
+            members.append((name, signal, offset, (1 << len(signal)) - 1))
+            offset += len(signal)
+        edges = [Edge(x) for _, x, _, _ in members]
+
+        def _sample() -> int:
+            packed = 0
+            for _, signal, offset, _ in members:
+                packed |= int(signal.value) << offset
+            return packed
+
+        last_state = _sample()
+        while True:
+            if self.on_edge:
+                await First(*edges)
+            await RisingEdge(self.clk)
+            curr_state = _sample()
+            if self.rst.value == 1:
+                last_state = curr_state
+                continue
+            if changed := curr_state ^ last_state:
+                for name, _, offset, mask in members:
+                    if (changed >> offset) & mask:
+                        capture(
+                            SignalBankChange(
+                                name=name, value=(curr_state >> offset) & mask
+                            )
+                        )
+            last_state = curr_state
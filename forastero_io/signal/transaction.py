@@ -1,7 +1,9 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2023-2024 Vypercore. All Rights Reserved
 
-from dataclasses import dataclass
+import itertools
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
 
 from forastero import BaseTransaction
 
@@ -10,3 +12,55 @@ from forastero import BaseTransaction
 class SignalState(BaseTransaction):
     value: int = 0
     cycles: int = 1
+
+
+@dataclass(kw_only=True)
+class SignalHold(SignalState):
+    """
+    Run-length record of a signal holding a stable value, starting on the given
+    cycle and lasting for a number of cycles.
+    """
+
+    start: int = 0
+
+    def expand(self) -> Iterator[SignalState]:
+        """
+        Lazily expand the record into one state per cycle.
+
+        :returns: Iterator of single cycle states
+        """
+        for _ in range(self.cycles):
+            yield SignalState(value=self.value, cycles=1)
+
+
+@dataclass(kw_only=True)
+class SignalBankChange(BaseTransaction):
+    name: str = ""
+    value: int = 0
+
+
+@dataclass(kw_only=True)
+class SignalWaveform(BaseTransaction):
+    """
+    Compact waveform to be played back by a driver, where each step is a
+    sequence of one or more values followed by the number of cycles to hold
+    them for - i.e. (value, cycles) for a SignalDriver or (value_a, value_b, ...,
+    cycles) for a SignalBankDriver. Steps may be provided as a list, an array
+    (e.g. a two dimensional NumPy array), or an iterator. To loop the waveform
+    the steps must be re-iterable, for example a list or a WaveformFile.
+
+    :param steps: The steps of the waveform
+    :param loops: Number of times to play the waveform (0 loops forever)
+    """
+
+    steps: Iterable = field(default_factory=list, compare=False)
+    loops: int = 1
+
+    def passes(self) -> Iterator[Iterable]:
+        """
+        Yield the steps of the waveform once for each loop.
+
+        :returns: Iterator of the steps for each pass through the waveform
+        """
+        for _ in itertools.count() if self.loops == 0 else range(self.loops):
+            yield self.steps
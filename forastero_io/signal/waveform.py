@@ -0,0 +1,27 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+from collections.abc import Iterator
+from pathlib import Path
+
+
+class WaveformFile:
+    """
+    Lazily reads waveform steps from a text file, where each line holds one or
+    more values followed by the number of cycles to hold them for, separated by
+    whitespace. Values may use any prefix understood by Python (e.g. 0x or 0b),
+    blank lines are ignored, and '#' starts a comment. The file is re-opened
+    each time it is iterated, so it may be used to loop a SignalWaveform.
+
+    :param path: Path to the waveform file
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+
+    def __iter__(self) -> Iterator[tuple[int, ...]]:
+        with self.path.open("r", encoding="utf-8") as fh:
+            for line in fh:
+                line = line.partition("#")[0].strip()
+                if line:
+                    yield tuple(int(x, 0) for x in line.split())
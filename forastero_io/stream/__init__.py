@@ -4,7 +4,7 @@
 from .initiator import StreamInitiatorDriver
 from .io import StreamIO
 from .responder import StreamResponderDriver, StreamResponderMonitor
-from .sequences import stream_backpressure_seq
+from .sequences import stream_backpressure_seq, stream_data_seq, stream_feed_seq
 from .transaction import StreamBackpressure, StreamDataValid
 
 assert all(
@@ -16,5 +16,7 @@ assert all(
         StreamBackpressure,
         StreamDataValid,
         stream_backpressure_seq,
+        stream_data_seq,
+        stream_feed_seq,
     )
 )
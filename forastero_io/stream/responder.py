@@ -3,8 +3,8 @@
 
 from cocotb.triggers import ClockCycles, RisingEdge
 from forastero.driver import BaseDriver
-from forastero.monitor import BaseMonitor
 
+from ..common.digest import DigestMonitor
 from .transaction import StreamBackpressure, StreamDataValid
 
 
@@ -16,17 +16,19 @@ class StreamResponderDriver(BaseDriver):
         await ClockCycles(self.clk, transaction.cycles)
 
 
-class StreamResponderMonitor(BaseMonitor):
+class StreamResponderMonitor(DigestMonitor):
     async def monitor(self, capture):
         while True:
             await RisingEdge(self.clk)
             if self.rst.value == 1:
                 continue
             if self.io.get("valid") and self.io.get("ready"):
-                capture(
-                    StreamDataValid(
-                        id=self.io.get("id", None),
-                        data=self.io.get("data"),
-                        valid=1,
-                    )
+                tran = StreamDataValid(
+                    id=self.io.get("id", None),
+                    data=self.io.get("data"),
+                    valid=1,
                 )
+                if self.digest is None:
+                    capture(tran)
+                elif (checkpoint := self.fold_digest(tran)) is not None:
+                    capture(checkpoint)
@@ -1,11 +1,14 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2023-2024 Vypercore. All Rights Reserved
 
+from collections.abc import Iterable
+
 import forastero
 from cocotb.triggers import ClockCycles
 from forastero.driver import DriverEvent
 from forastero.sequence import SeqContext, SeqProxy
 
+from ..common.feed import Source, feed_driver
 from .initiator import StreamInitiatorDriver
 from .responder import StreamResponderDriver
 from .transaction import StreamBackpressure, StreamDataValid
@@ -16,7 +19,7 @@ from .transaction import StreamBackpressure, StreamDataValid
 async def stream_data_seq(
     ctx: SeqContext,
     driver: SeqProxy[StreamInitiatorDriver],
-    data: list[int],
+    data: Iterable[int],
     min_delay: int = 1,
     max_delay: int = 10,
     delay_chance: float = 0.5,
@@ -32,6 +35,32 @@ async def stream_data_seq(
             ).wait()
 
 
+@forastero.sequence(auto_lock=True)
+@forastero.requires("driver", StreamInitiatorDriver)
+async def stream_feed_seq(
+    ctx: SeqContext,
+    driver: SeqProxy[StreamInitiatorDriver],
+    source: Source,
+    high: int = 16,
+    low: int | None = None,
+):
+    """
+    Drive data drawn lazily from an iterable or asynchronous iterable, with no
+    more than the high watermark queued ahead of the driver at any time.
+
+    :param source: Data words or StreamDataValid transactions to drive
+    :param high:   Maximum number of transactions queued ahead of the driver
+    :param low:    Number of queued transactions at which drawing resumes
+    """
+    await feed_driver(
+        driver,
+        source,
+        lambda x: x if isinstance(x, StreamDataValid) else StreamDataValid(data=x),
+        high=high,
+        low=low,
+    )
+
+
 @forastero.sequence()
 @forastero.requires("driver", StreamResponderDriver)
 async def stream_backpressure_seq(
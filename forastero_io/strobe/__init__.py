@@ -3,6 +3,6 @@
 
 from .io import StrobeIO
 from .requestor import StrobeDriver, StrobeMonitor
-from .transaction import StrobeEvent
+from .transaction import StrobeEvent, StrobeTrain
 
-assert all((StrobeIO, StrobeDriver, StrobeMonitor, StrobeEvent))
+assert all((StrobeIO, StrobeDriver, StrobeMonitor, StrobeEvent, StrobeTrain))
@@ -1,15 +1,20 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2023-2024 Vypercore. All Rights Reserved
 
-from cocotb.triggers import RisingEdge
+import itertools
+
+from cocotb.triggers import ClockCycles, RisingEdge
 from forastero.driver import BaseDriver
 from forastero.monitor import BaseMonitor
 
-from .transaction import StrobeEvent
+from .transaction import StrobeEvent, StrobeTrain
 
 
 class StrobeDriver(BaseDriver):
-    async def drive(self, transaction: StrobeEvent):
+    async def drive(self, transaction: StrobeEvent | StrobeTrain):
+        if isinstance(transaction, StrobeTrain):
+            await self._drive_train(transaction)
+            return
         # Setup the transaction
         self.io.set("data", transaction.data)
         self.io.set("strobe", transaction.strobe)
@@ -18,12 +23,64 @@ class StrobeDriver(BaseDriver):
         # Clear the request
         self.io.set("strobe", 0)
 
+    async def _drive_train(self, transaction: StrobeTrain) -> None:
+        data, strobe = self.io.data, self.io.strobe
+        edge = RisingEdge(self.clk)
+        if transaction.gaps:
+            gaps = itertools.cycle(transaction.gaps)
+        else:
+            gaps = itertools.repeat(0)
+        # Hold strobe high across consecutive values, only dropping it for gaps
+        for value, gap in zip(transaction.data, gaps, strict=False):
+            data.value = int(value)
+            strobe.value = 1
+            await edge
+            if gap > 0:
+                strobe.value = 0
+                await ClockCycles(self.clk, gap)
+        # Clear the request
+        strobe.value = 0
+
 
 class StrobeMonitor(BaseMonitor):
+    """
+    Captures strobed data values, either as one StrobeEvent per strobe or (when
+    batching is enabled) as StrobeTrain objects. A batch is captured once it
+    reaches the batch size or when the strobe drops, so each StrobeTrain holds
+    a run of values seen on consecutive cycles.
+
+    :param batch: Maximum number of values to capture per StrobeTrain (0 captures
+                  a StrobeEvent for every strobe)
+    """
+
+    def __init__(self, *args, batch: int = 0, **kwds) -> None:
+        super().__init__(*args, **kwds)
+        self.batch = batch
+
     async def monitor(self, capture):
+        if self.batch:
+            await self._monitor_batch(capture)
+            return
         while True:
             await RisingEdge(self.clk)
             if self.rst.value == 1:
                 continue
             if self.io.get("strobe"):
                 capture(StrobeEvent(data=self.io.get("data"), strobe=True))
+
+    async def _monitor_batch(self, capture) -> None:
+        data, strobe = self.io.data, self.io.strobe
+        edge = RisingEdge(self.clk)
+        values = []
+        while True:
+            await edge
+            if self.rst.value == 1:
+                values = []
+                continue
+            if strobe.value:
+                values.append(int(data.value))
+                if len(values) < self.batch:
+                    continue
+            if values:
+                capture(StrobeTrain(data=values))
+                values = []
@@ -1,7 +1,8 @@
 # SPDX-License-Identifier: MIT
 # Copyright (c) 2023-2024 Vypercore. All Rights Reserved
 
-from dataclasses import dataclass
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
 
 from forastero import BaseTransaction
 
@@ -10,3 +11,20 @@ from forastero import BaseTransaction
 class StrobeEvent(BaseTransaction):
     data: int = 0
     strobe: bool = True
+
+
+@dataclass(kw_only=True)
+class StrobeTrain(BaseTransaction):
+    """
+    Train of data values to be presented on consecutive cycles with the strobe
+    held high, also used by StrobeMonitor to capture batches of strobes. Data
+    values may be provided as a list, an array, or a generator. An optional gap
+    pattern gives the number of idle cycles (with strobe low) to insert after
+    each value, the pattern is repeated for as long as there is data.
+
+    :param data: Data values to present
+    :param gaps: Repeating pattern of idle cycles inserted after each value
+    """
+
+    data: Iterable[int] = field(default_factory=list)
+    gaps: Sequence[int] = field(default=(), compare=False)
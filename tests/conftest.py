@@ -0,0 +1,19 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+import sys
+from collections.abc import Iterator
+
+import pytest
+
+from forastero_io.benchmark.sim import MockSimulator
+
+
+@pytest.fixture
+def sim() -> Iterator[MockSimulator]:
+    """Mock simulator serving the triggers of every loaded forastero_io module"""
+    sim = MockSimulator()
+    modules = [x for x in sys.modules if x.startswith("forastero_io.")]
+    with sim.patch("forastero.transaction", *modules):
+        yield sim
+        sim.close()
@@ -0,0 +1,289 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+from forastero import IORole
+from forastero.driver import DriverEvent
+from forastero.monitor import MonitorEvent
+
+from forastero_io.apb import (
+    ApbAccess,
+    ApbInitiatorDriver,
+    ApbInitiatorMonitor,
+    ApbIO,
+    ApbRequest,
+    ApbResponse,
+)
+from forastero_io.axi4 import (
+    AXI4ReadAddress,
+    AXI4ReadAddressIO,
+    AXI4ReadAddressMonitor,
+    AXI4ReadResponseInitiator,
+    AXI4ReadResponseIO,
+    AXI4WriteAddress,
+    AXI4WriteAddressIO,
+    AXI4WriteAddressMonitor,
+    AXI4WriteData,
+    AXI4WriteDataIO,
+    AXI4WriteDataMonitor,
+    AXI4WriteResponseInitiator,
+    AXI4WriteResponseIO,
+)
+from forastero_io.axi4.common import Burst, Resp, Size
+from forastero_io.axi4lite import (
+    AXI4LiteMemoryModel,
+    AXI4LiteReadAddress,
+    AXI4LiteReadAddressInitiator,
+    AXI4LiteReadAddressIO,
+    AXI4LiteReadAddressMonitor,
+    AXI4LiteReadResponse,
+    AXI4LiteReadResponseInitiator,
+    AXI4LiteReadResponseIO,
+    AXI4LiteReadResponseMonitor,
+    AXI4LiteWriteAddress,
+    AXI4LiteWriteAddressInitiator,
+    AXI4LiteWriteAddressIO,
+    AXI4LiteWriteAddressMonitor,
+    AXI4LiteWriteData,
+    AXI4LiteWriteDataInitiator,
+    AXI4LiteWriteDataIO,
+    AXI4LiteWriteDataMonitor,
+    AXI4LiteWriteResponse,
+    AXI4LiteWriteResponseInitiator,
+    AXI4LiteWriteResponseIO,
+    AXI4LiteWriteResponseMonitor,
+)
+from forastero_io.benchmark.sim import MockBench, MockDUT
+from forastero_io.benchmark.suite import AXI4_WIDTHS
+from forastero_io.bridge import (
+    AXI4LiteToApbBridge,
+    AXI4ToAXI4LiteBridge,
+    MappedToAXI4LiteBridge,
+)
+from forastero_io.common.memory import SharedMemory
+from forastero_io.mapped import (
+    MappedAccess,
+    MappedMemoryModel,
+    MappedRequest,
+    MappedRequestIO,
+    MappedRequestMonitor,
+    MappedResponseInitiator,
+    MappedResponseIO,
+)
+
+MAPPED_WIDTHS = {
+    **dict.fromkeys(("id", "error", "write", "valid", "ready"), 1),
+    **dict.fromkeys(("addr", "data"), 32),
+    "strobe": 4,
+}
+AXI4LITE_WIDTHS = {
+    **dict.fromkeys(("awaddr", "araddr", "wdata", "rdata"), 32),
+    **dict.fromkeys(("awprot", "arprot"), 3),
+    **dict.fromkeys(("bresp", "rresp"), 2),
+    **dict.fromkeys(("awvalid", "wvalid", "bvalid", "arvalid", "rvalid"), 1),
+    **dict.fromkeys(("awready", "wready", "bready", "arready", "rready"), 1),
+    "wstrb": 4,
+}
+APB_WIDTHS = {
+    **dict.fromkeys(("paddr", "pwdata", "prdata"), 32),
+    **dict.fromkeys(("psel", "penable", "pwrite", "pready", "pslverr"), 1),
+    "pprot": 3,
+    "pstrb": 4,
+}
+
+
+def _components(sim, role: IORole, *pairs) -> list:
+    # AXI4 signals are narrowed to the data width of the AXI4-Lite signals
+    dut = MockDUT(AXI4_WIDTHS | MAPPED_WIDTHS | AXI4LITE_WIDTHS | APB_WIDTHS)
+    return [sim.component(cls, io(dut, "x", role)) for cls, io in pairs]
+
+
+def test_mapped_bridge_addresses_elements_of_shared_store(sim):
+    store = SharedMemory(MockBench(), 4, error_noninit=False, rand_noninit=False)
+    # Mapped side of the bridge, and a mapped model sharing the store
+    reqmon, rspdrv, model_reqmon, model_rspdrv = _components(
+        sim,
+        IORole.RESPONDER,
+        (MappedRequestMonitor, MappedRequestIO),
+        (MappedResponseInitiator, MappedResponseIO),
+        (MappedRequestMonitor, MappedRequestIO),
+        (MappedResponseInitiator, MappedResponseIO),
+    )
+    with sim.construct():
+        mapped = MappedMemoryModel(MockBench(), model_reqmon, model_rspdrv, store=store)
+    # AXI4-Lite side of the bridge
+    awdrv, wdrv, ardrv, bmon, rmon = _components(
+        sim,
+        IORole.INITIATOR,
+        (AXI4LiteWriteAddressInitiator, AXI4LiteWriteAddressIO),
+        (AXI4LiteWriteDataInitiator, AXI4LiteWriteDataIO),
+        (AXI4LiteReadAddressInitiator, AXI4LiteReadAddressIO),
+        (AXI4LiteWriteResponseMonitor, AXI4LiteWriteResponseIO),
+        (AXI4LiteReadResponseMonitor, AXI4LiteReadResponseIO),
+    )
+    MappedToAXI4LiteBridge(MockBench(), reqmon, rspdrv, awdrv, wdrv, ardrv, bmon, rmon)
+    # AXI4-Lite memory model sharing the store
+    awreq, wreq, arreq, brsp, rrsp = _components(
+        sim,
+        IORole.RESPONDER,
+        (AXI4LiteWriteAddressMonitor, AXI4LiteWriteAddressIO),
+        (AXI4LiteWriteDataMonitor, AXI4LiteWriteDataIO),
+        (AXI4LiteReadAddressMonitor, AXI4LiteReadAddressIO),
+        (AXI4LiteWriteResponseInitiator, AXI4LiteWriteResponseIO),
+        (AXI4LiteReadResponseInitiator, AXI4LiteReadResponseIO),
+    )
+    axi4lite = AXI4LiteMemoryModel(
+        MockBench(), awreq, wreq, arreq, brsp, rrsp, False, False, store=store
+    )
+
+    # Connect the bridge directly to the model, with each response driven as
+    # soon as it is enqueued
+    def _request(monitor):
+        return lambda obj: monitor.publish(MonitorEvent.CAPTURE, obj)
+
+    def _response(driver, monitor):
+        def _enqueue(obj):
+            driver.publish(DriverEvent.POST_DRIVE, obj)
+            monitor.publish(MonitorEvent.CAPTURE, obj)
+
+        return _enqueue
+
+    awdrv.enqueue, wdrv.enqueue, ardrv.enqueue = map(_request, (awreq, wreq, arreq))
+    brsp.enqueue = _response(brsp, bmon)
+    rrsp.enqueue = _response(rrsp, rmon)
+    responses = []
+    rspdrv.enqueue = responses.append
+
+    # Write element 3 through the bridge, then read it back through the bridge
+    for request in (
+        MappedRequest(
+            ident=1, address=3, mode=MappedAccess.WRITE, data=0xCAFE, strobe=0xF
+        ),
+        MappedRequest(ident=0, address=3, mode=MappedAccess.READ),
+    ):
+        reqmon.publish(MonitorEvent.CAPTURE, request)
+    assert [(x.ident, x.data, x.error) for x in responses] == [
+        (1, 0, 0),
+        (0, 0xCAFE, 0),
+    ]
+    # The element lands at byte address 12, and is seen by the mapped model
+    assert axi4lite.read(12) == 0xCAFE
+    assert mapped.read(3) == 0xCAFE
+    assert axi4lite.read(3) == 0
+
+
+def test_axi4_bridge_splits_bursts_into_accesses(sim):
+    awreq, wreq, arreq, brsp, rrsp = _components(
+        sim,
+        IORole.RESPONDER,
+        (AXI4WriteAddressMonitor, AXI4WriteAddressIO),
+        (AXI4WriteDataMonitor, AXI4WriteDataIO),
+        (AXI4ReadAddressMonitor, AXI4ReadAddressIO),
+        (AXI4WriteResponseInitiator, AXI4WriteResponseIO),
+        (AXI4ReadResponseInitiator, AXI4ReadResponseIO),
+    )
+    awdrv, wdrv, ardrv, bmon, rmon = _components(
+        sim,
+        IORole.INITIATOR,
+        (AXI4LiteWriteAddressInitiator, AXI4LiteWriteAddressIO),
+        (AXI4LiteWriteDataInitiator, AXI4LiteWriteDataIO),
+        (AXI4LiteReadAddressInitiator, AXI4LiteReadAddressIO),
+        (AXI4LiteWriteResponseMonitor, AXI4LiteWriteResponseIO),
+        (AXI4LiteReadResponseMonitor, AXI4LiteReadResponseIO),
+    )
+    AXI4ToAXI4LiteBridge(
+        MockBench(),
+        awreq,
+        wreq,
+        arreq,
+        brsp,
+        rrsp,
+        awdrv,
+        wdrv,
+        ardrv,
+        bmon,
+        rmon,
+        max_outstanding=1,
+    )
+    issued, responses = [], []
+    awdrv.enqueue = wdrv.enqueue = ardrv.enqueue = issued.append
+    brsp.enqueue = rrsp.enqueue = responses.append
+
+    # Write a burst of two beats, with the second beat returning an error
+    awreq.publish(
+        MonitorEvent.CAPTURE,
+        AXI4WriteAddress(
+            axid=2, address=0x100, length=1, size=Size.B4, burst=Burst.INCR
+        ),
+    )
+    for index, data in enumerate((0x11, 0x22)):
+        wreq.publish(
+            MonitorEvent.CAPTURE,
+            AXI4WriteData(index=index, data=data, strobe=0xF, last=index == 1),
+        )
+    # Only one access is issued while the limit of one is outstanding
+    assert issued == [
+        AXI4LiteWriteAddress(address=0x100),
+        AXI4LiteWriteData(data=0x11, strobe=0xF),
+    ]
+    bmon.publish(MonitorEvent.CAPTURE, AXI4LiteWriteResponse(response=Resp.OKAY))
+    assert issued[2:] == [
+        AXI4LiteWriteAddress(address=0x104),
+        AXI4LiteWriteData(data=0x22, strobe=0xF),
+    ]
+    assert not responses
+    bmon.publish(MonitorEvent.CAPTURE, AXI4LiteWriteResponse(response=Resp.SLVERR))
+    (write,) = responses
+    assert (write.axid, write.response) == (2, Resp.SLVERR)
+
+    # Read a wrapping burst back, returned as a single burst response
+    issued.clear()
+    arreq.publish(
+        MonitorEvent.CAPTURE,
+        AXI4ReadAddress(
+            axid=3, address=0x104, length=1, size=Size.B4, burst=Burst.WRAP
+        ),
+    )
+    for data in (0x22, 0x11):
+        rmon.publish(MonitorEvent.CAPTURE, AXI4LiteReadResponse(data=data))
+    assert [x.address for x in issued] == [0x104, 0x100]
+    read = responses[1]
+    assert (read.axid, read.data, read.response) == (3, [0x22, 0x11], [Resp.OKAY] * 2)
+
+
+def test_axi4lite_bridge_returns_apb_responses_in_order(sim):
+    awreq, wreq, arreq, brsp, rrsp = _components(
+        sim,
+        IORole.RESPONDER,
+        (AXI4LiteWriteAddressMonitor, AXI4LiteWriteAddressIO),
+        (AXI4LiteWriteDataMonitor, AXI4LiteWriteDataIO),
+        (AXI4LiteReadAddressMonitor, AXI4LiteReadAddressIO),
+        (AXI4LiteWriteResponseInitiator, AXI4LiteWriteResponseIO),
+        (AXI4LiteReadResponseInitiator, AXI4LiteReadResponseIO),
+    )
+    apbdrv, apbmon = _components(
+        sim,
+        IORole.INITIATOR,
+        (ApbInitiatorDriver, ApbIO),
+        (ApbInitiatorMonitor, ApbIO),
+    )
+    AXI4LiteToApbBridge(MockBench(), awreq, wreq, arreq, brsp, rrsp, apbdrv, apbmon)
+    issued, responses = [], []
+    apbdrv.enqueue = issued.append
+    brsp.enqueue = rrsp.enqueue = responses.append
+
+    # The write is only issued once both its address and data are captured, so
+    # the read captured in between is issued first
+    awreq.publish(MonitorEvent.CAPTURE, AXI4LiteWriteAddress(address=0x40))
+    arreq.publish(MonitorEvent.CAPTURE, AXI4LiteReadAddress(address=0x80))
+    wreq.publish(MonitorEvent.CAPTURE, AXI4LiteWriteData(data=0x55, strobe=0x3))
+    assert [(x.mode, x.address, x.data, x.strobe) for x in issued] == [
+        (ApbAccess.READ, 0x80, 0, 0),
+        (ApbAccess.WRITE, 0x40, 0x55, 0x3),
+    ]
+    assert all(isinstance(x, ApbRequest) for x in issued)
+    apbmon.publish(MonitorEvent.CAPTURE, ApbResponse(data=0x99))
+    apbmon.publish(MonitorEvent.CAPTURE, ApbResponse(slverr=1))
+    assert responses == [
+        AXI4LiteReadResponse(data=0x99, response=Resp.OKAY),
+        AXI4LiteWriteResponse(response=Resp.SLVERR),
+    ]
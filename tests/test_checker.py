@@ -0,0 +1,37 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+from forastero import IORole
+
+from forastero_io.axi4stream import (
+    AXI4StreamIO,
+    AXI4StreamMonitor,
+    AXI4StreamProtocolChecker,
+)
+from forastero_io.benchmark.sim import MockBench, MockDUT
+from forastero_io.benchmark.suite import AXI4STREAM_WIDTHS
+
+
+def _run(sim, valid: dict[int, int], resets: set[int], cycles: int):
+    checker = AXI4StreamProtocolChecker(MockBench())
+    io = AXI4StreamIO(MockDUT(AXI4STREAM_WIDTHS), "stream", IORole.RESPONDER)
+    mon = sim.component(AXI4StreamMonitor, io, checker=checker)
+
+    def _on_cycle(cycle: int) -> None:
+        io.set("tvalid", valid.get(cycle, io.get("tvalid")))
+        sim.rst.value = int(cycle in resets)
+
+    sim.start(mon.monitor(lambda obj: None))
+    sim.run(lambda: sim.cycle >= cycles, _on_cycle)
+    return checker
+
+
+def test_valid_dropped_while_stalled_is_a_violation(sim):
+    checker = _run(sim, {1: 1, 4: 0}, set(), 8)
+    assert checker.counts == {"t_valid_stable": 1}
+
+
+def test_reset_clears_stalled_channel(sim):
+    # VALID is dropped by reset while the channel is stalled
+    checker = _run(sim, {1: 1, 4: 0}, {4, 5}, 8)
+    assert not checker.counts
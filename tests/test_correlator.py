@@ -0,0 +1,109 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+from forastero import IORole
+from forastero.monitor import MonitorEvent
+
+from forastero_io.axi4 import (
+    AXI4Correlator,
+    AXI4ReadAddress,
+    AXI4ReadAddressIO,
+    AXI4ReadAddressMonitor,
+    AXI4ReadResponse,
+    AXI4ReadResponseIO,
+    AXI4ReadResponseMonitor,
+    AXI4ReadTransaction,
+    AXI4WriteAddress,
+    AXI4WriteAddressIO,
+    AXI4WriteAddressMonitor,
+    AXI4WriteData,
+    AXI4WriteDataIO,
+    AXI4WriteDataMonitor,
+    AXI4WriteResponse,
+    AXI4WriteResponseIO,
+    AXI4WriteResponseMonitor,
+    AXI4WriteTransaction,
+)
+from forastero_io.axi4.common import Resp
+from forastero_io.benchmark.sim import MockBench, MockDUT
+from forastero_io.benchmark.suite import AXI4_WIDTHS
+
+
+def _correlator(sim):
+    dut = MockDUT(AXI4_WIDTHS)
+    monitors = [
+        sim.component(cls, io(dut, "axi", IORole.INITIATOR))
+        for cls, io in (
+            (AXI4WriteAddressMonitor, AXI4WriteAddressIO),
+            (AXI4WriteDataMonitor, AXI4WriteDataIO),
+            (AXI4WriteResponseMonitor, AXI4WriteResponseIO),
+            (AXI4ReadAddressMonitor, AXI4ReadAddressIO),
+            (AXI4ReadResponseMonitor, AXI4ReadResponseIO),
+        )
+    ]
+    correlator = AXI4Correlator(MockBench(), "corr", *monitors)
+    captured = []
+    correlator.subscribe(MonitorEvent.CAPTURE, lambda _, e, o: captured.append(o))
+    return correlator, monitors, captured
+
+
+def test_writes_pair_data_in_order_and_responses_by_id(sim):
+    correlator, (awmon, wmon, bmon, _, _), captured = _correlator(sim)
+    # Data for the first burst arrives before either address
+    for index, data in enumerate((0x10, 0x11)):
+        wmon.publish(
+            MonitorEvent.CAPTURE,
+            AXI4WriteData(index=index, data=data, strobe=0xFF, last=index == 1),
+        )
+    for axid, address in ((1, 0x100), (2, 0x200)):
+        awmon.publish(
+            MonitorEvent.CAPTURE,
+            AXI4WriteAddress(axid=axid, address=address, length=2 - axid),
+        )
+    wmon.publish(MonitorEvent.CAPTURE, AXI4WriteData(data=0x20, strobe=0x0F, last=True))
+    assert correlator.outstanding_writes == 2
+    # Responses complete out of order across IDs
+    bmon.publish(MonitorEvent.CAPTURE, AXI4WriteResponse(axid=2, response=Resp.SLVERR))
+    bmon.publish(MonitorEvent.CAPTURE, AXI4WriteResponse(axid=1))
+    assert correlator.outstanding_writes == 0
+    assert captured == [
+        AXI4WriteTransaction(
+            axid=2,
+            address=0x200,
+            length=0,
+            data=[0x20],
+            strobe=[0x0F],
+            response=Resp.SLVERR,
+        ),
+        AXI4WriteTransaction(
+            axid=1, address=0x100, length=1, data=[0x10, 0x11], strobe=[0xFF, 0xFF]
+        ),
+    ]
+
+
+def test_reads_collect_interleaved_beats_by_id(sim):
+    correlator, (_, _, _, armon, rmon), captured = _correlator(sim)
+    for axid, address in ((1, 0x100), (2, 0x200), (1, 0x300)):
+        armon.publish(
+            MonitorEvent.CAPTURE, AXI4ReadAddress(axid=axid, address=address, length=1)
+        )
+    for axid, data, last in (
+        (1, 0xA0, False),
+        (2, 0xB0, False),
+        (1, 0xA1, True),
+        (2, 0xB1, True),
+        (1, 0xC0, False),
+    ):
+        rmon.publish(
+            MonitorEvent.CAPTURE, AXI4ReadResponse(axid=axid, data=data, last=last)
+        )
+    # The second read with ID 1 is still receiving beats
+    assert correlator.outstanding_reads == 1
+    assert captured == [
+        AXI4ReadTransaction(
+            axid=1, address=0x100, length=1, data=[0xA0, 0xA1], response=[Resp.OKAY] * 2
+        ),
+        AXI4ReadTransaction(
+            axid=2, address=0x200, length=1, data=[0xB0, 0xB1], response=[Resp.OKAY] * 2
+        ),
+    ]
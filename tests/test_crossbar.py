@@ -0,0 +1,110 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+from forastero import IORole
+from forastero.monitor import MonitorEvent
+
+from forastero_io.axi4 import (
+    AXI4Crossbar,
+    AXI4ReadAddress,
+    AXI4ReadAddressIO,
+    AXI4ReadAddressMonitor,
+    AXI4ReadResponseInitiator,
+    AXI4ReadResponseIO,
+    AXI4WriteAddress,
+    AXI4WriteAddressIO,
+    AXI4WriteAddressMonitor,
+    AXI4WriteData,
+    AXI4WriteDataIO,
+    AXI4WriteDataMonitor,
+    AXI4WriteResponseInitiator,
+    AXI4WriteResponseIO,
+)
+from forastero_io.axi4.common import Burst, Resp, Size
+from forastero_io.benchmark.sim import MockBench, MockDUT
+from forastero_io.benchmark.suite import AXI4_WIDTHS
+from forastero_io.common.memory import SharedMemory
+
+
+def _crossbar(sim):
+    dut = MockDUT(AXI4_WIDTHS)
+    ports = [
+        sim.component(cls, io(dut, "axi", IORole.RESPONDER))
+        for cls, io in (
+            (AXI4WriteAddressMonitor, AXI4WriteAddressIO),
+            (AXI4WriteDataMonitor, AXI4WriteDataIO),
+            (AXI4ReadAddressMonitor, AXI4ReadAddressIO),
+            (AXI4WriteResponseInitiator, AXI4WriteResponseIO),
+            (AXI4ReadResponseInitiator, AXI4ReadResponseIO),
+        )
+    ]
+    responses = []
+    ports[3].enqueue = ports[4].enqueue = responses.append
+    with sim.construct():
+        xbar = AXI4Crossbar(MockBench())
+        xbar.add_manager(*ports)
+    return xbar, ports, responses
+
+
+def test_burst_crossing_region_boundary_is_rejected(sim):
+    xbar, (_, _, armon, _, _), responses = _crossbar(sim)
+    accesses = []
+
+    def _subordinate(tran) -> None:
+        accesses.append((tran.axid, tran.address))
+        tran.data = [tran.address] * (tran.length + 1)
+
+    xbar.add_subordinate(0x000, 0x100, _subordinate)
+    xbar.add_subordinate(0x100, 0x100, _subordinate)
+    for axid, address, burst in (
+        (1, 0xF0, Burst.INCR),
+        (2, 0xE0, Burst.INCR),
+        (3, 0xF8, Burst.WRAP),
+        (4, 0x300, Burst.INCR),
+    ):
+        armon.publish(
+            MonitorEvent.CAPTURE,
+            AXI4ReadAddress(
+                axid=axid, address=address, length=3, size=Size.B8, burst=burst
+            ),
+        )
+    for _ in range(5):
+        xbar._step()
+    # Only the bursts lying within a single region reach a subordinate
+    assert accesses == [(2, 0xE0), (3, 0xF8)]
+    assert [(x.axid, x.response) for x in responses] == [
+        (1, [Resp.DECERR] * 4),
+        (2, Resp.OKAY),
+        (3, Resp.OKAY),
+        (4, [Resp.DECERR] * 4),
+    ]
+
+
+def test_write_is_read_back_from_shared_memory(sim):
+    xbar, (awmon, wmon, armon, _, _), responses = _crossbar(sim)
+    store = SharedMemory(MockBench(), 8, error_noninit=False, rand_noninit=False)
+    xbar.add_subordinate(0x1000, 0x1000, store)
+    awmon.publish(
+        MonitorEvent.CAPTURE,
+        AXI4WriteAddress(
+            axid=5, address=0x1010, length=1, size=Size.B8, burst=Burst.INCR
+        ),
+    )
+    for index, data in enumerate((0x1111, 0x2222)):
+        wmon.publish(
+            MonitorEvent.CAPTURE,
+            AXI4WriteData(index=index, data=data, strobe=0xFF, last=index == 1),
+        )
+    xbar._step()
+    armon.publish(
+        MonitorEvent.CAPTURE,
+        AXI4ReadAddress(
+            axid=6, address=0x1010, length=1, size=Size.B8, burst=Burst.INCR
+        ),
+    )
+    for _ in range(2):
+        xbar._step()
+    write, read = responses
+    assert (write.axid, write.response) == (5, Resp.OKAY)
+    assert (read.axid, read.data) == (6, [0x1111, 0x2222])
+    assert store.read(0x1018) == 0x2222
@@ -0,0 +1,38 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+from dataclasses import dataclass
+
+from forastero import BaseTransaction
+
+from forastero_io.benchmark.sim import MockSimulator
+from forastero_io.common.digest import PayloadDigest
+
+
+@dataclass(kw_only=True)
+class _Sample(BaseTransaction):
+    data: int = 0
+    label: object = None
+
+
+def test_flush_checkpoints_partial_interval():
+    digest = PayloadDigest(channel="out", interval=4)
+    with MockSimulator().patch("forastero.transaction"):
+        checkpoints = [digest.fold(_Sample(data=x)) for x in range(6)]
+        assert [x.count for x in checkpoints if x is not None] == [4]
+        final = digest.flush()
+        assert [(x.channel, x.count) for x in final] == [("out", 6)]
+        # Nothing further to flush until more transactions are folded
+        assert digest.flush() == []
+
+
+def test_fold_hashes_non_integer_fields():
+    with MockSimulator().patch("forastero.transaction"):
+        checkpoints = []
+        for label in (1.5, 1.5, "abc"):
+            digest = PayloadDigest(interval=2)
+            digest.fold(_Sample(data=1, label=None))
+            checkpoints.append(digest.fold(_Sample(data=2, label=label)))
+    # Equal values fold identically, differing values do not
+    assert checkpoints[0].digest == checkpoints[1].digest
+    assert checkpoints[0].digest != checkpoints[2].digest
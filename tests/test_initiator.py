@@ -0,0 +1,70 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+from forastero import IORole
+from forastero.driver import DriverEvent
+
+from forastero_io.axi4 import (
+    AXI4ReadBurstResponse,
+    AXI4ReadResponse,
+    AXI4ReadResponseInitiator,
+    AXI4ReadResponseIO,
+)
+from forastero_io.benchmark.sim import MockDUT
+from forastero_io.benchmark.suite import AXI4_WIDTHS
+
+
+async def _ready() -> None:
+    pass
+
+
+def test_interleaved_bursts_publish_in_order(sim):
+    io = AXI4ReadResponseIO(MockDUT(AXI4_WIDTHS), "axi", IORole.RESPONDER)
+    drv = sim.component(AXI4ReadResponseInitiator, io, interleave=1)
+    io.set("rready", 1)
+    first = AXI4ReadBurstResponse(axid=1, data=[0x10, 0x11, 0x12])
+    second = AXI4ReadBurstResponse(axid=2, data=[0x20, 0x21, 0x22, 0x23, 0x24])
+    beat = AXI4ReadResponse(axid=3, data=0x30, last=1)
+    # Keeps the driver loop busy once everything else has been driven
+    final = AXI4ReadResponse(axid=4, delay=1000)
+    for obj in (first, second, beat, final):
+        drv.enqueue(obj)
+    events = []
+    drv.subscribe(DriverEvent.PRE_DRIVE, lambda _, e, o: events.append((e, o.axid)))
+    drv.subscribe(DriverEvent.POST_DRIVE, lambda _, e, o: events.append((e, o.axid)))
+    rids = []
+
+    def _on_cycle(cycle: int) -> None:
+        del cycle
+        if io.get("rvalid"):
+            rids.append((io.get("rid"), io.get("rdata")))
+
+    # Run the real driver loop, which would otherwise wait on the testbench
+    drv.tb.ready = _ready
+    with sim.patch("forastero.driver"):
+        sim.start(drv._driver_loop())
+        sim.run(lambda: (DriverEvent.PRE_DRIVE, 4) in events, _on_cycle, 100)
+    # Beats alternate between the two bursts, then the single beat follows
+    assert rids == [
+        (1, 0x10),
+        (2, 0x20),
+        (1, 0x11),
+        (2, 0x21),
+        (1, 0x12),
+        (2, 0x22),
+        (2, 0x23),
+        (2, 0x24),
+        (3, 0x30),
+    ]
+    # The first burst completes before the second, and the single beat is only
+    # taken from the queue once both bursts have completed
+    pre, post = DriverEvent.PRE_DRIVE, DriverEvent.POST_DRIVE
+    assert events == [
+        (pre, 1),
+        (pre, 2),
+        (post, 1),
+        (post, 2),
+        (pre, 3),
+        (post, 3),
+        (pre, 4),
+    ]
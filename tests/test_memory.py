@@ -0,0 +1,67 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+from forastero_io.benchmark.sim import MockBench
+from forastero_io.common.memory import MemoryOrdering, SharedMemory
+
+
+def _store() -> SharedMemory:
+    return SharedMemory(
+        MockBench(),
+        byte_width=4,
+        error_noninit=False,
+        rand_noninit=False,
+        ordering=MemoryOrdering.RESPONSE,
+    )
+
+
+def test_retire_merges_into_current_word():
+    store = _store()
+    port_a, port_b = store.port(), store.port()
+    # Each port writes a different byte of the same word
+    port_a.write(0, 0x11, 0b0001)
+    port_a.commit()
+    port_b.write(0, 0x2200, 0b0010)
+    port_b.commit()
+    # Writes are only visible to the issuing port until retired
+    assert port_a.read(0) == 0x11
+    assert port_b.read(0) == 0x2200
+    assert store.read(0) == 0
+    # Retiring in the opposite order must preserve both bytes
+    port_b.retire()
+    assert port_a.read(0) == 0x2211
+    port_a.retire()
+    assert store.read(0) == 0x2211
+    assert port_b.read(0) == 0x2211
+
+
+def test_later_write_with_same_value_stays_held():
+    store = _store()
+    port_a, port_b = store.port(), store.port()
+    port_a.write(0, 0x11, 0b1111)
+    first = port_a.commit()
+    port_a.write(0, 0x11, 0b1111)
+    second = port_a.commit()
+    # Retiring the first write must not release the second
+    port_a.retire(first)
+    port_b.write(0, 0x44, 0b1111)
+    port_b.commit()
+    port_b.retire()
+    assert store.read(0) == 0x44
+    assert port_a.read(0) == 0x11
+    port_a.retire(second)
+    assert store.read(0) == 0x11
+
+
+def test_retire_specific_batch_out_of_order():
+    store = _store()
+    port = store.port()
+    port.write(0, 0xAA, 0b0001)
+    first = port.commit()
+    port.write(4, 0xBB, 0b0001)
+    second = port.commit()
+    port.retire(second)
+    assert store.read(4) == 0xBB
+    assert store.read(0) == 0
+    port.retire(first)
+    assert store.read(0) == 0xAA
@@ -0,0 +1,50 @@
+# SPDX-License-Identifier: MIT
+# Copyright (c) 2023-2024 Vypercore. All Rights Reserved
+
+from forastero import IORole
+from forastero.monitor import MonitorEvent
+
+from forastero_io.benchmark.sim import MockSignal, MockSimulator
+from forastero_io.signal import SignalIO, SignalMonitor
+
+
+async def _ready() -> None:
+    pass
+
+
+def _run(values: dict[int, int], resets: set[int], cycles: int) -> list:
+    sim = MockSimulator()
+    signal = MockSignal("signal", 8)
+    mon = sim.component(
+        SignalMonitor, SignalIO(signal, IORole.INITIATOR), run_length=True
+    )
+    captured = []
+    mon.subscribe(MonitorEvent.CAPTURE, lambda _c, _e, obj: captured.append(obj))
+
+    def _on_cycle(cycle: int) -> None:
+        signal.value = values.get(cycle, signal.value)
+        sim.rst.value = int(cycle in resets)
+
+    # Run the real monitor loop, which would otherwise wait on the testbench and
+    # starts the monitor one cycle in
+    mon.tb.ready = _ready
+    with sim.patch(
+        "forastero_io.signal.monitor", "forastero.monitor", "forastero.transaction"
+    ):
+        sim.start(mon._monitor_loop())
+        sim.run(lambda: sim.cycle >= cycles, _on_cycle)
+        sim.close()
+        # Stands in for the teardown registered with the testbench
+        sim.start(mon._teardown())
+    # Every hold is counted as captured, including the one flushed at teardown
+    assert mon.stats.captured == len(captured)
+    return [(x.value, x.start, x.cycles) for x in captured]
+
+
+def test_run_length_captures_hold_open_at_end():
+    # The final value is still held when the test ends
+    assert _run({4: 5, 7: 7}, set(), 11) == [(0, 0, 3), (5, 3, 3), (7, 6, 4)]
+
+
+def test_run_length_captures_hold_cut_short_by_reset():
+    assert _run({3: 5}, {7, 8}, 11) == [(0, 0, 2), (5, 2, 4), (5, 7, 3)]